@@ -1,18 +1,35 @@
 """The gogcli integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform, CONF_DEVICE_ID
+from homeassistant.components.webhook import async_generate_id
+from homeassistant.const import Platform, CONF_DEVICE_ID, CONF_WEBHOOK_ID
 from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
 from homeassistant.exceptions import ServiceValidationError
-from homeassistant.helpers import config_validation as cv
-
-from .const import DOMAIN, CONF_CONFIG_DIR
-from .coordinator import GogGmailCoordinator
-from .utils import sync_config, check_binary, install_binary, get_binary_path
+from homeassistant.helpers import config_validation as cv, issue_registry as ir
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    CONF_CONFIG_DIR,
+    CONF_MAX_PROCESSES,
+    DATA_BINARY,
+    DATA_CONFIG_SYNC,
+    DATA_SCHEDULER,
+    DEFAULT_MAX_PROCESSES,
+    DEFAULT_UPDATE_PARALLEL,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_KEY_THREADS,
+    STORAGE_VERSION,
+)
+from .coordinator import GogGmailCoordinator, count_labels, saved_searches
+from .scheduler import PRIORITY_INTERACTIVE, GogScheduler
+from .utils import get_binary_manager, get_config_sync
+from .webhook import async_register_webhook
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -23,51 +40,107 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up gogcli from a config entry."""
 
     hass.data.setdefault(DOMAIN, {})
+    hass.data[DOMAIN].setdefault(DATA_SCHEDULER, GogScheduler())
 
-    # Ensure binary exists
-    gog_path = get_binary_path(hass)
-    if not await check_binary(gog_path):
-        try:
-            await install_binary(hass)
-        except Exception as err:
-            _LOGGER.error("Failed to install gogcli during setup: %s", err)
-            return False
+    # Ensure binary exists, shared with entries loading at the same time
+    try:
+        await get_binary_manager(hass).async_ensure_binary()
+    except Exception as err:
+        _LOGGER.error("Failed to install gogcli during setup: %s", err)
+        return False
 
-    # Sync YAML config
+    # Sync YAML config, once per config dir
     if config_dir := entry.data.get(CONF_CONFIG_DIR):
-        await hass.async_add_executor_job(sync_config, hass, config_dir)
+        await get_config_sync(hass).async_add_config_dir(config_dir)
     
     coordinator = GogGmailCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        await coordinator.async_config_entry_first_refresh()
     
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    async_update_scheduler(hass)
+
+    if not (webhook_id := entry.data.get(CONF_WEBHOOK_ID)):
+        webhook_id = async_generate_id()
+        hass.config_entries.async_update_entry(
+            entry, data={**entry.data, CONF_WEBHOOK_ID: webhook_id}
+        )
+    async_register_webhook(hass, entry, coordinator, webhook_id)
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    if restored:
+        # Sensors start from the snapshot, so startup does not wait for gogcli
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {entry.entry_id}"
+        )
+    entry.async_create_background_task(
+        hass,
+        coordinator.label_coordinator.async_refresh(),
+        f"{DOMAIN} first label refresh {entry.entry_id}",
+    )
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     setup_services(hass)
 
     return True
 
+def async_update_scheduler(hass: HomeAssistant) -> None:
+    """Apply the lowest process limit configured on any loaded account."""
+    loaded = get_coordinators(hass)
+    limits = [
+        entry.options.get(CONF_MAX_PROCESSES, DEFAULT_MAX_PROCESSES)
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id in loaded
+    ]
+    hass.data[DOMAIN][DATA_SCHEDULER].set_max_concurrent(
+        min(limits, default=DEFAULT_MAX_PROCESSES)
+    )
+
+def get_coordinators(hass: HomeAssistant) -> dict[str, GogGmailCoordinator]:
+    """Return the loaded coordinators keyed by config entry ID."""
+    return {
+        entry_id: coordinator
+        for entry_id, coordinator in hass.data[DOMAIN].items()
+        if entry_id not in (DATA_SCHEDULER, DATA_BINARY, DATA_CONFIG_SYNC)
+    }
+
 def setup_services(hass: HomeAssistant) -> None:
     """Register services for the gogcli integration."""
     if hass.services.has_service(DOMAIN, "update_gmail"):
         return
 
-    async def handle_update_gmail(call: ServiceCall):
+    async def handle_update_gmail(call: ServiceCall) -> dict | None:
         """Handle the update_gmail service call."""
         entry_ids = call.data.get("config_entry_ids")
         
         if not entry_ids:
             # Update all
-            entry_ids = list(hass.data[DOMAIN].keys())
-        
-        for entry_id in entry_ids:
-            if coordinator := hass.data[DOMAIN].get(entry_id):
-                await coordinator.async_request_refresh()
-            else:
+            entry_ids = list(get_coordinators(hass))
+
+        semaphore = asyncio.Semaphore(call.data.get("max_parallel", DEFAULT_UPDATE_PARALLEL))
+        max_age = call.data.get("max_age")
+
+        async def _update(entry_id: str) -> dict:
+            if not (coordinator := get_coordinators(hass).get(entry_id)):
                 _LOGGER.warning("Config entry %s not found for update_gmail", entry_id)
+                return {
+                    "success": False,
+                    "skipped": False,
+                    "duration": 0,
+                    "new_messages": 0,
+                    "error": "not found",
+                }
+            async with semaphore:
+                return await coordinator.async_refresh_with_result(max_age)
+
+        results = await asyncio.gather(*[_update(entry_id) for entry_id in entry_ids])
+
+        if call.return_response:
+            return {"accounts": dict(zip(entry_ids, results))}
+        return None
 
     hass.services.async_register(
         DOMAIN, 
@@ -75,7 +148,12 @@ def setup_services(hass: HomeAssistant) -> None:
         handle_update_gmail,
         schema=vol.Schema({
             vol.Optional("config_entry_ids"): cv.ensure_list_csv,
-        })
+            vol.Optional("max_parallel", default=DEFAULT_UPDATE_PARALLEL): vol.All(
+                vol.Coerce(int), vol.Range(min=1, max=32)
+            ),
+            vol.Optional("max_age"): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        }),
+        supports_response=SupportsResponse.OPTIONAL
     )
 
     async def handle_get_thread(call: ServiceCall) -> dict:
@@ -83,12 +161,14 @@ def setup_services(hass: HomeAssistant) -> None:
         thread_id = call.data["thread_id"]
         entry_id = call.data["config_entry_id"]
 
-        target_coordinator = hass.data[DOMAIN].get(entry_id)
+        target_coordinator = get_coordinators(hass).get(entry_id)
         if not target_coordinator:
             raise ServiceValidationError(f"Config entry {entry_id} not found")
 
         try:
-            thread = await target_coordinator.wrapper.get_thread(thread_id)
+            thread = await target_coordinator.wrapper.get_thread(
+                thread_id, priority=PRIORITY_INTERACTIVE
+            )
             return thread
         except Exception as err:
             raise ServiceValidationError(f"Failed to get thread: {err}")
@@ -104,13 +184,62 @@ def setup_services(hass: HomeAssistant) -> None:
         supports_response=SupportsResponse.ONLY
     )
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await hass.config_entries.async_reload(entry.entry_id)
+    async def handle_get_message_body(call: ServiceCall) -> dict:
+        """Handle get_message_body service."""
+        message_id = call.data["message_id"]
+        entry_id = call.data["config_entry_id"]
+
+        target_coordinator = get_coordinators(hass).get(entry_id)
+        if not target_coordinator:
+            raise ServiceValidationError(f"Config entry {entry_id} not found")
+
+        message = target_coordinator.get_message(message_id)
+        if not message:
+            raise ServiceValidationError(f"Message {message_id} is not in the recent emails")
+
+        return {
+            "message_id": message.id,
+            "thread_id": message.thread_id,
+            "body_text": message.body_text,
+            "body_html": message.body_html,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        "get_message_body",
+        handle_get_message_body,
+        schema=vol.Schema({
+            vol.Required("config_entry_id"): cv.string,
+            vol.Required("message_id"): cv.string,
+        }),
+        supports_response=SupportsResponse.ONLY
+    )
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options to the running entry."""
+    coordinator = get_coordinators(hass)[entry.entry_id]
+    if (
+        count_labels(entry.options) != coordinator.label_coordinator.labels
+        or saved_searches(entry.options) != coordinator.saved_searches
+    ):
+        # Label and search sensors are added and removed on setup
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    coordinator.async_apply_options(entry.options)
+    async_update_scheduler(hass)
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_update_scheduler(hass)
+        if not get_coordinators(hass):
+            get_config_sync(hass).async_stop()
 
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove data stored for a deleted config entry."""
+    for key in (STORAGE_KEY_THREADS, STORAGE_KEY_SNAPSHOT):
+        await Store(hass, STORAGE_VERSION, key.format(entry_id=entry.entry_id)).async_remove()
+    ir.async_delete_issue(hass, DOMAIN, f"auth_failed_{entry.entry_id}")
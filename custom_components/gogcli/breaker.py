@@ -0,0 +1,117 @@
+"""Circuit breaker that stops calling gogcli while Gmail keeps failing."""
+from __future__ import annotations
+
+import re
+import time
+
+from .const import BREAKER_BASE_DELAY, BREAKER_MAX_DELAY
+
+ERROR_QUOTA = "quota"
+ERROR_AUTH = "auth"
+ERROR_NETWORK = "network"
+
+# Checked in order, the first match wins
+ERROR_PATTERNS = (
+    (ERROR_AUTH, re.compile(
+        r"invalid_grant|invalid_client|unauthorized|error 401|\b401\b|token (has been )?(expired|revoked)"
+        r"|cannot fetch token|no (refresh )?token|not authorized|invalid credentials",
+        re.IGNORECASE,
+    )),
+    (ERROR_QUOTA, re.compile(
+        r"rate ?limit|quota|error 429|\b429\b|too many requests|resource_?exhausted|backend ?error",
+        re.IGNORECASE,
+    )),
+    (ERROR_NETWORK, re.compile(
+        r"dial tcp|no such host|connection (refused|reset)|network is unreachable|i/o timeout"
+        r"|tls handshake|temporary failure in name resolution|server misbehaving|\bEOF\b",
+        re.IGNORECASE,
+    )),
+)
+
+def classify_error(stderr: str) -> str | None:
+    """Return the kind of failure gogcli reported, or None if unknown."""
+    for kind, pattern in ERROR_PATTERNS:
+        if pattern.search(stderr):
+            return kind
+    return None
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of starting gogcli while the circuit is open."""
+
+class GogCircuitBreaker:
+    """Back off exponentially after quota, auth and network failures.
+
+    Each failure in a row doubles the pause, up to max_delay. The first
+    call after the pause is let through; a success closes the circuit.
+    Auth failures keep the circuit open until the entry is reloaded.
+    """
+
+    def __init__(
+        self, base_delay: float = BREAKER_BASE_DELAY, max_delay: float = BREAKER_MAX_DELAY
+    ) -> None:
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failures = 0
+        self.kind: str | None = None
+        self.last_error: str | None = None
+        self.trips = 0
+        self.rejected = 0
+        self._open_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while calls are refused."""
+        if self.kind == ERROR_AUTH:
+            return True
+        return time.monotonic() < self._open_until
+
+    @property
+    def retry_in(self) -> float | None:
+        """Return the seconds until calls are let through again."""
+        if self.kind == ERROR_AUTH:
+            return None
+        return max(0.0, self._open_until - time.monotonic())
+
+    def check(self) -> None:
+        """Raise CircuitOpenError while the circuit is open."""
+        if not self.is_open:
+            return
+        self.rejected += 1
+        if self.kind == ERROR_AUTH:
+            raise CircuitOpenError(f"gogcli paused after an auth failure: {self.last_error}")
+        raise CircuitOpenError(
+            f"gogcli paused for {self.retry_in:.0f}s after a {self.kind} failure: {self.last_error}"
+        )
+
+    def record_failure(self, kind: str, error: str) -> None:
+        """Open the circuit, for longer on every failure in a row."""
+        if self.is_open and kind != ERROR_AUTH:
+            # Calls already running when the circuit opened, not a new failure
+            self.last_error = error.strip()[:200]
+            return
+        self.failures += 1
+        self.trips += 1
+        self.kind = kind
+        self.last_error = error.strip()[:200]
+        delay = min(self.base_delay * 2 ** (self.failures - 1), self.max_delay)
+        self._open_until = time.monotonic() + delay
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self.kind = None
+        self.last_error = None
+        self._open_until = 0.0
+
+    def as_dict(self) -> dict:
+        """Return the breaker state for diagnostics."""
+        retry_in = self.retry_in
+        return {
+            "open": self.is_open,
+            "kind": self.kind,
+            "failures": self.failures,
+            "retry_in": round(retry_in, 1) if retry_in is not None else None,
+            "last_error": self.last_error,
+            "trips": self.trips,
+            "rejected": self.rejected,
+        }
@@ -10,9 +10,12 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant import config_entries
+from homeassistant.components import webhook
+from homeassistant.const import CONF_WEBHOOK_ID
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv
 
 from homeassistant.util import slugify
 from .const import (
@@ -22,12 +25,36 @@ from .const import (
     CONF_CREDENTIALS_FILE, 
     CONF_AUTH_CODE,
     CONF_POLLING_INTERVAL, 
+    CONF_MAX_PROCESSES,
+    CONF_SEARCH_TIMEOUT,
+    CONF_FETCH_TIMEOUT,
+    CONF_BODY_MODE,
+    CONF_BODY_MAX_LENGTH,
+    CONF_COUNT_LABELS,
+    CONF_SEARCHES,
+    CONF_SEARCH_LIMIT,
+    CONF_SEARCH_NAME,
+    CONF_SEARCH_QUERY,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_POLLING_INTERVAL,
+    CONF_MAX_POLLING_INTERVAL,
+    BODY_MODES,
     DEFAULT_GOG_PATH, 
     DEFAULT_POLLING_INTERVAL, 
+    DEFAULT_MAX_PROCESSES,
+    DEFAULT_SEARCH_TIMEOUT,
+    DEFAULT_FETCH_TIMEOUT,
+    DEFAULT_BODY_MODE,
+    DEFAULT_BODY_MAX_LENGTH,
+    DEFAULT_COUNT_LABELS,
+    MAX_MESSAGES,
+    MAX_SEARCH_MESSAGES,
+    DEFAULT_MIN_POLLING_INTERVAL,
+    DEFAULT_MAX_POLLING_INTERVAL,
     DOMAIN,
     DASHBOARD_CARD_YAML
 )
-from .utils import check_binary, install_binary, get_binary_path, sync_config, GogWrapper
+from .utils import get_binary_manager, sync_config, GogWrapper
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -90,12 +117,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             try:
                 # Basic validation and setup
                 self.config_dir = self.hass.config.path(".storage/gogcli")
-                gog_path = get_binary_path(self.hass)
                 
                 # Check/Install binary
-                version = await check_binary(gog_path)
-                if not version:
-                    gog_path = await install_binary(self.hass)
+                gog_path = await get_binary_manager(self.hass).async_ensure_binary()
                 
                 # Sync config
                 await self.hass.async_add_executor_job(sync_config, self.hass, self.config_dir)
@@ -241,28 +265,209 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         """Manage the options."""
         return self.async_show_menu(
             step_id="init",
-            menu_options=["polling", "dashboard_yaml"],
+            menu_options=[
+                "polling", "body", "searches", "labels", "performance", "webhook", "dashboard_yaml"
+            ],
         )
 
     async def async_step_polling(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle polling interval settings."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if user_input.get(
+                CONF_MIN_POLLING_INTERVAL, DEFAULT_MIN_POLLING_INTERVAL
+            ) > user_input.get(CONF_MAX_POLLING_INTERVAL, DEFAULT_MAX_POLLING_INTERVAL):
+                errors["base"] = "min_above_max"
+            else:
+                return self.async_create_entry(
+                    title="", data={**self._config_entry.options, **user_input}
+                )
 
+        options = self._config_entry.options
         schema = vol.Schema(
             {
                 vol.Required(
                     CONF_POLLING_INTERVAL,
+                    default=options.get(CONF_POLLING_INTERVAL, DEFAULT_POLLING_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                vol.Required(
+                    CONF_ADAPTIVE_POLLING,
+                    default=options.get(CONF_ADAPTIVE_POLLING, False),
+                ): bool,
+                vol.Required(
+                    CONF_MIN_POLLING_INTERVAL,
+                    default=options.get(CONF_MIN_POLLING_INTERVAL, DEFAULT_MIN_POLLING_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                vol.Required(
+                    CONF_MAX_POLLING_INTERVAL,
+                    default=options.get(CONF_MAX_POLLING_INTERVAL, DEFAULT_MAX_POLLING_INTERVAL),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+            }
+        )
+
+        return self.async_show_form(step_id="polling", data_schema=schema, errors=errors)
+
+    async def async_step_body(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle email body attribute settings."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="", data={**self._config_entry.options, **user_input}
+            )
+
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_BODY_MODE,
                     default=self._config_entry.options.get(
-                        CONF_POLLING_INTERVAL, DEFAULT_POLLING_INTERVAL
+                        CONF_BODY_MODE, DEFAULT_BODY_MODE
                     ),
-                ): vol.All(vol.Coerce(int), vol.Range(min=5)),
+                ): vol.In(BODY_MODES),
+                vol.Required(
+                    CONF_BODY_MAX_LENGTH,
+                    default=self._config_entry.options.get(
+                        CONF_BODY_MAX_LENGTH, DEFAULT_BODY_MAX_LENGTH
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=100, max=100000)),
+            }
+        )
+
+        return self.async_show_form(step_id="body", data_schema=schema)
+
+    async def async_step_searches(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Show the saved search actions."""
+        return self.async_show_menu(
+            step_id="searches",
+            menu_options=["add_search", "remove_search"],
+            description_placeholders={
+                "searches": "\n".join(
+                    f"- {search[CONF_SEARCH_NAME]}: `{search[CONF_SEARCH_QUERY]}`"
+                    for search in self._config_entry.options.get(CONF_SEARCHES, [])
+                ) or "-"
+            },
+        )
+
+    async def async_step_add_search(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Add a saved search."""
+        errors: dict[str, str] = {}
+        searches = list(self._config_entry.options.get(CONF_SEARCHES, []))
+        if user_input is not None:
+            name = user_input[CONF_SEARCH_NAME].strip()
+            if any(slugify(search[CONF_SEARCH_NAME]) == slugify(name) for search in searches):
+                errors["base"] = "search_exists"
+            elif not slugify(name):
+                errors["base"] = "invalid_search_name"
+            else:
+                searches.append({**user_input, CONF_SEARCH_NAME: name})
+                return self.async_create_entry(
+                    title="", data={**self._config_entry.options, CONF_SEARCHES: searches}
+                )
+
+        schema = vol.Schema(
+            {
+                vol.Required(CONF_SEARCH_NAME): str,
+                vol.Required(CONF_SEARCH_QUERY): str,
+                vol.Required(CONF_SEARCH_LIMIT, default=MAX_MESSAGES): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_SEARCH_MESSAGES)
+                ),
             }
         )
 
-        return self.async_show_form(step_id="polling", data_schema=schema)
+        return self.async_show_form(step_id="add_search", data_schema=schema, errors=errors)
+
+    async def async_step_remove_search(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Remove saved searches."""
+        searches = list(self._config_entry.options.get(CONF_SEARCHES, []))
+        if user_input is not None:
+            removed = set(user_input[CONF_SEARCHES])
+            return self.async_create_entry(
+                title="",
+                data={
+                    **self._config_entry.options,
+                    CONF_SEARCHES: [
+                        search for search in searches if search[CONF_SEARCH_NAME] not in removed
+                    ],
+                },
+            )
+
+        schema = vol.Schema(
+            {
+                vol.Optional(CONF_SEARCHES, default=[]): cv.multi_select(
+                    [search[CONF_SEARCH_NAME] for search in searches]
+                ),
+            }
+        )
+
+        return self.async_show_form(step_id="remove_search", data_schema=schema)
+
+    async def async_step_labels(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle the labels whose message counts are tracked."""
+        if user_input is not None:
+            labels = [
+                label.strip() for label in user_input[CONF_COUNT_LABELS].split(",") if label.strip()
+            ]
+            return self.async_create_entry(
+                title="",
+                data={**self._config_entry.options, CONF_COUNT_LABELS: list(dict.fromkeys(labels))},
+            )
+
+        schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_COUNT_LABELS,
+                    default=", ".join(
+                        self._config_entry.options.get(CONF_COUNT_LABELS, DEFAULT_COUNT_LABELS)
+                    ),
+                ): str,
+            }
+        )
+
+        return self.async_show_form(step_id="labels", data_schema=schema)
+
+    async def async_step_performance(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle gogcli process settings."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="", data={**self._config_entry.options, **user_input}
+            )
+
+        schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_MAX_PROCESSES,
+                    default=self._config_entry.options.get(
+                        CONF_MAX_PROCESSES, DEFAULT_MAX_PROCESSES
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+                vol.Required(
+                    CONF_SEARCH_TIMEOUT,
+                    default=self._config_entry.options.get(
+                        CONF_SEARCH_TIMEOUT, DEFAULT_SEARCH_TIMEOUT
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=600)),
+                vol.Required(
+                    CONF_FETCH_TIMEOUT,
+                    default=self._config_entry.options.get(
+                        CONF_FETCH_TIMEOUT, DEFAULT_FETCH_TIMEOUT
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=5, max=600)),
+            }
+        )
+
+        return self.async_show_form(step_id="performance", data_schema=schema)
 
     async def async_step_dashboard_yaml(
         self, user_input: dict[str, Any] | None = None
@@ -280,6 +485,23 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             description_placeholders={"card_yaml": card_yaml}
         )
 
+    async def async_step_webhook(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Display the webhook URL that triggers a refresh."""
+        if user_input is not None:
+            return await self.async_step_init()
+
+        if webhook_id := self._config_entry.data.get(CONF_WEBHOOK_ID):
+            url = webhook.async_generate_url(self.hass, webhook_id)
+        else:
+            url = "-"
+
+        return self.async_show_form(
+            step_id="webhook",
+            description_placeholders={"webhook_url": url}
+        )
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
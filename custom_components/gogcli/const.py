@@ -8,10 +8,61 @@ CONF_CONFIG_DIR = "config_dir"
 CONF_CREDENTIALS_FILE = "credentials_file"
 CONF_AUTH_CODE = "auth_code"
 CONF_POLLING_INTERVAL = "polling_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_POLLING_INTERVAL = "min_polling_interval"
+CONF_MAX_POLLING_INTERVAL = "max_polling_interval"
+CONF_MAX_PROCESSES = "max_processes"
+CONF_SEARCH_TIMEOUT = "search_timeout"
+CONF_FETCH_TIMEOUT = "fetch_timeout"
+CONF_BODY_MODE = "body_mode"
+CONF_BODY_MAX_LENGTH = "body_max_length"
+CONF_COUNT_LABELS = "count_labels"
+CONF_SEARCHES = "searches"
+CONF_SEARCH_NAME = "name"
+CONF_SEARCH_QUERY = "query"
+CONF_SEARCH_LIMIT = "limit"
 
 DEFAULT_GOG_PATH = "gog"
 GOG_YAML_CONFIG = "gogcli.yaml"
+# Seconds between checks of gogcli.yaml for changes
+CONFIG_WATCH_INTERVAL = 30
 DEFAULT_POLLING_INTERVAL = 5
+DEFAULT_MIN_POLLING_INTERVAL = 1
+DEFAULT_MAX_POLLING_INTERVAL = 60
+# Adaptive intervals are spread by up to this fraction so accounts drift apart
+ADAPTIVE_POLLING_JITTER = 0.1
+INBOX_QUERY = "label:INBOX"
+DEFAULT_COUNT_LABELS = ["INBOX"]
+MAX_MESSAGES = 5
+MAX_SEARCH_MESSAGES = 10
+DEFAULT_MAX_PROCESSES = 4
+# Accounts refreshed at once by the update_gmail service
+DEFAULT_UPDATE_PARALLEL = 4
+DEFAULT_SEARCH_TIMEOUT = 60
+DEFAULT_FETCH_TIMEOUT = 30
+# Seconds gogcli is paused after a quota or network failure, doubling per failure
+BREAKER_BASE_DELAY = 60
+BREAKER_MAX_DELAY = 3600
+
+BODY_MODE_FULL = "full"
+BODY_MODE_TRUNCATED = "truncated"
+BODY_MODE_NONE = "none"
+BODY_MODES = [BODY_MODE_FULL, BODY_MODE_TRUNCATED, BODY_MODE_NONE]
+DEFAULT_BODY_MODE = BODY_MODE_FULL
+DEFAULT_BODY_MAX_LENGTH = 2000
+
+DATA_SCHEDULER = "scheduler"
+DATA_BINARY = "binary"
+DATA_CONFIG_SYNC = "config_sync"
+
+STORAGE_VERSION = 1
+STORAGE_KEY_THREADS = f"{DOMAIN}/{{entry_id}}.threads"
+THREAD_CACHE_SAVE_DELAY = 30
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}/{{entry_id}}.snapshot"
+SNAPSHOT_SAVE_DELAY = 30
+
+# Refreshes kept for the diagnostics download
+REFRESH_HISTORY_SIZE = 20
 
 DASHBOARD_CARD_YAML = """type: markdown
 content: >
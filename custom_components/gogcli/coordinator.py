@@ -3,58 +3,726 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, replace
 from datetime import timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util
 
-from .const import CONF_GOG_PATH, CONF_CONFIG_DIR, CONF_POLLING_INTERVAL, DEFAULT_POLLING_INTERVAL, DOMAIN
-from .utils import GogWrapper
+from .const import (
+    ADAPTIVE_POLLING_JITTER,
+    CONF_ADAPTIVE_POLLING,
+    CONF_BODY_MAX_LENGTH,
+    CONF_BODY_MODE,
+    CONF_COUNT_LABELS,
+    CONF_SEARCHES,
+    CONF_SEARCH_LIMIT,
+    CONF_SEARCH_NAME,
+    CONF_SEARCH_QUERY,
+    CONF_GOG_PATH,
+    CONF_CONFIG_DIR,
+    CONF_MAX_POLLING_INTERVAL,
+    CONF_MIN_POLLING_INTERVAL,
+    CONF_POLLING_INTERVAL,
+    CONF_SEARCH_TIMEOUT,
+    CONF_FETCH_TIMEOUT,
+    DATA_SCHEDULER,
+    DEFAULT_BODY_MAX_LENGTH,
+    DEFAULT_BODY_MODE,
+    DEFAULT_COUNT_LABELS,
+    DEFAULT_MAX_POLLING_INTERVAL,
+    DEFAULT_MIN_POLLING_INTERVAL,
+    DEFAULT_POLLING_INTERVAL,
+    DEFAULT_SEARCH_TIMEOUT,
+    DEFAULT_FETCH_TIMEOUT,
+    DOMAIN,
+    INBOX_QUERY,
+    MAX_MESSAGES,
+    REFRESH_HISTORY_SIZE,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_KEY_SNAPSHOT,
+    STORAGE_KEY_THREADS,
+    STORAGE_VERSION,
+    THREAD_CACHE_SAVE_DELAY,
+)
+from .breaker import ERROR_AUTH, CircuitOpenError
+from .models import GmailMessage, check_reply, has_body, parse_messages
+from .utils import GogWrapper, HistoryExpired
 
 _LOGGER = logging.getLogger(__name__)
 
+@dataclass(frozen=True)
+class FetchResult:
+    """Mailbox state fetched by a refresh, applied once a caller receives it."""
+
+    messages: list[GmailMessage]
+    history_id: str | None
+    searches: dict[str, list[GmailMessage]]
+
+def polling_interval(options: dict) -> timedelta:
+    """Return the polling interval configured in the entry options."""
+    minutes = options.get(CONF_POLLING_INTERVAL, DEFAULT_POLLING_INTERVAL)
+    return timedelta(minutes=max(minutes, 5))
+
+def command_timeouts(options: dict) -> dict[str, float]:
+    """Return the gogcli command timeouts configured in the entry options."""
+    search_timeout = options.get(CONF_SEARCH_TIMEOUT, DEFAULT_SEARCH_TIMEOUT)
+    fetch_timeout = options.get(CONF_FETCH_TIMEOUT, DEFAULT_FETCH_TIMEOUT)
+    return {
+        "gmail messages search": search_timeout,
+        "gmail thread get": fetch_timeout,
+        "gmail get": fetch_timeout,
+        "gmail history": fetch_timeout,
+        "gmail labels get": fetch_timeout,
+    }
+
+def saved_searches(options: dict) -> list[dict]:
+    """Return the saved searches configured in the entry options."""
+    return list(options.get(CONF_SEARCHES, []))
+
+def count_labels(options: dict) -> list[str]:
+    """Return the labels whose message counts are tracked."""
+    return list(options.get(CONF_COUNT_LABELS, DEFAULT_COUNT_LABELS))
+
+class GogLabelCoordinator(DataUpdateCoordinator):
+    """Fetch message counts per label, apart from the message pipeline.
+
+    One small gogcli call per label; no message is downloaded.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, wrapper: GogWrapper) -> None:
+        """Initialize."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN} labels",
+            update_interval=polling_interval(entry.options),
+        )
+        self.entry = entry
+        self.wrapper = wrapper
+        self.labels = count_labels(entry.options)
+
+    @callback
+    def async_apply_options(self, options: dict) -> None:
+        """Follow the polling interval of the entry."""
+        interval = polling_interval(options)
+        if interval != self.update_interval:
+            self.update_interval = interval
+            if self._listeners:
+                self._schedule_refresh()
+
+    async def _async_update_data(self) -> dict[str, dict[str, int]]:
+        """Return the total and unread counts keyed by label."""
+        results = await asyncio.gather(
+            *[self.wrapper.get_label(label) for label in self.labels], return_exceptions=True
+        )
+        counts: dict[str, dict[str, int]] = {}
+        errors = []
+        for label, result in zip(self.labels, results):
+            if isinstance(result, Exception):
+                _LOGGER.debug("Failed to count label %s: %s", label, result)
+                errors.append(result)
+                continue
+            counts[label] = {
+                "total": int(result.get("messagesTotal", 0)),
+                "unread": int(result.get("messagesUnread", 0)),
+            }
+        if errors and not counts:
+            raise UpdateFailed(f"Error counting labels: {errors[0]}")
+        return counts
+
 class GogGmailCoordinator(DataUpdateCoordinator):
     """Class to manage fetching Gmail data."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize."""
-        polling_interval = entry.options.get(CONF_POLLING_INTERVAL, DEFAULT_POLLING_INTERVAL)
-        if polling_interval < 5:
-            polling_interval = 5
-
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=entry,
             name=DOMAIN,
-            update_interval=timedelta(minutes=polling_interval),
+            update_interval=polling_interval(entry.options),
         )
         self.entry = entry
+        self.body_mode = entry.options.get(CONF_BODY_MODE, DEFAULT_BODY_MODE)
+        self.body_max_length = entry.options.get(CONF_BODY_MAX_LENGTH, DEFAULT_BODY_MAX_LENGTH)
         
         gog_path = entry.data[CONF_GOG_PATH]
         config_dir = entry.data[CONF_CONFIG_DIR]
-        self.wrapper = GogWrapper(gog_path, config_dir)
+        scheduler = hass.data.get(DOMAIN, {}).get(DATA_SCHEDULER)
+        self.wrapper = GogWrapper(gog_path, config_dir, scheduler, command_timeouts(entry.options))
+        self.label_coordinator = GogLabelCoordinator(hass, entry, self.wrapper)
+
+        self._thread_store = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_THREADS.format(entry_id=entry.entry_id)
+        )
+        self._thread_cache_loaded = False
+        self._snapshot_store = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_SNAPSHOT.format(entry_id=entry.entry_id)
+        )
+        self._history_id: str | None = None
+        self.saved_searches = saved_searches(entry.options)
+        self.searches: dict[str, list[GmailMessage]] = {}
+        self._mailbox_changed = True
+        self.last_refresh_duration: float | None = None
+        self.refresh_history: deque[dict] = deque(maxlen=REFRESH_HISTORY_SIZE)
+        self._update_task: asyncio.Task | None = None
+        self._update_waiters = 0
+        self._last_success: float | None = None
+        self._sync_mode: str | None = None
+        self.webhook_calls = 0
+        self.webhook_skipped = 0
+        self.update_interval = self._configure_polling(entry.options)
+
+    def _configure_polling(self, options: dict) -> timedelta:
+        """Read the polling options and return the interval to poll at."""
+        self.adaptive_polling = options.get(CONF_ADAPTIVE_POLLING, False)
+        self.min_interval = timedelta(
+            minutes=options.get(CONF_MIN_POLLING_INTERVAL, DEFAULT_MIN_POLLING_INTERVAL)
+        )
+        self.max_interval = timedelta(
+            minutes=options.get(CONF_MAX_POLLING_INTERVAL, DEFAULT_MAX_POLLING_INTERVAL)
+        )
+        interval = polling_interval(options)
+        if not self.adaptive_polling:
+            return interval
+        self._adaptive_interval = min(max(interval, self.min_interval), self.max_interval)
+        return self._jitter(self._adaptive_interval)
+
+    def _jitter(self, interval: timedelta) -> timedelta:
+        """Spread an interval so accounts do not poll on the same tick."""
+        spread = random.uniform(1 - ADAPTIVE_POLLING_JITTER, 1 + ADAPTIVE_POLLING_JITTER)
+        return min(max(interval * spread, self.min_interval), self.max_interval)
 
-    async def _async_update_data(self):
-        """Fetch data from API."""
+    def _adapt_interval(self, success: bool, new_messages: int) -> None:
+        """Poll sooner while mail arrives, back off while idle or failing."""
+        if not self.adaptive_polling:
+            return
+        if success and new_messages:
+            self._adaptive_interval = self.min_interval
+        else:
+            self._adaptive_interval = min(self._adaptive_interval * 2, self.max_interval)
+        # Applies to the poll the coordinator schedules after this refresh
+        self.update_interval = self._jitter(self._adaptive_interval)
+
+    @callback
+    def async_apply_options(self, options: dict) -> None:
+        """Apply changed entry options without reloading the entry."""
+        interval = self._configure_polling(options)
+        if interval != self.update_interval:
+            self.update_interval = interval
+            if self._listeners:
+                # Restart the pending poll timer with the new interval
+                self._schedule_refresh()
+
+        self.label_coordinator.async_apply_options(options)
+
+        self.body_mode = options.get(CONF_BODY_MODE, DEFAULT_BODY_MODE)
+        self.body_max_length = options.get(CONF_BODY_MAX_LENGTH, DEFAULT_BODY_MAX_LENGTH)
+        self.wrapper.timeouts.update(command_timeouts(options))
+
+        # Body settings change what the email sensors show
+        self.async_update_listeners()
+
+    async def async_refresh_with_result(self, max_age: float | None = None) -> dict:
+        """Refresh now and report the duration, outcome and new messages.
+
+        The refresh is skipped when the data is younger than max_age seconds.
+        """
+        if (
+            max_age is not None
+            and self.last_update_success
+            and self._last_success is not None
+            and time.monotonic() - self._last_success < max_age
+        ):
+            return {
+                "success": True,
+                "skipped": True,
+                "duration": 0,
+                "new_messages": 0,
+                "error": None,
+            }
+
+        held = {msg.id for msg in self.data or []}
+        start = time.monotonic()
+        # Label counts are cheap, so a forced refresh updates them as well
+        await asyncio.gather(self.async_refresh(), self.label_coordinator.async_request_refresh())
+        duration = round(time.monotonic() - start, 3)
+
+        if not self.last_update_success:
+            return {
+                "success": False,
+                "skipped": False,
+                "duration": duration,
+                "new_messages": 0,
+                "error": str(self.last_exception),
+            }
+        return {
+            "success": True,
+            "skipped": False,
+            "duration": duration,
+            "new_messages": sum(1 for msg in self.data or [] if msg.id not in held),
+            "error": None,
+        }
+
+    def get_message(self, message_id: str) -> GmailMessage | None:
+        """Return a held message by ID."""
+        for message in self._held_messages():
+            if message.id == message_id:
+                return message
+        return None
+
+    def _held_messages(self) -> list[GmailMessage]:
+        """Return the INBOX messages followed by the saved search results."""
+        messages = list(self.data or [])
+        for results in self.searches.values():
+            messages.extend(results)
+        return messages
+
+    def has_seen(self, history_id: str | None = None, message_id: str | None = None) -> bool:
+        """Return True when a push hint points at mail that is already held."""
+        if message_id:
+            return self.get_message(message_id) is not None
+        if history_id and self._history_id:
+            try:
+                return int(history_id) <= int(self._history_id)
+            except ValueError:
+                return False
+        return False
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the messages held at the last successful refresh.
+
+        The restored historyId lets the first live refresh be a delta sync.
+        Returns False when there is nothing usable to restore.
+        """
         try:
-            # Fetch 5 newest messages from INBOX
-            messages = await self.wrapper.search_messages("label:INBOX", limit=5, include_body=True)
-            
-            # Fetch threads in parallel
-            async def _fetch_thread(message):
+            snapshot = await self._snapshot_store.async_load()
+            if not snapshot:
+                return False
+            messages = [GmailMessage.from_dict(msg) for msg in snapshot["messages"]]
+        except Exception as err:
+            _LOGGER.warning("Failed to restore the last Gmail snapshot: %s", err)
+            return False
+
+        self.data = messages
+        self._history_id = snapshot.get("history_id")
+        names = {search[CONF_SEARCH_NAME] for search in self.saved_searches}
+        self.searches = {
+            name: [GmailMessage.from_dict(msg) for msg in results]
+            for name, results in snapshot.get("searches", {}).items()
+            if name in names
+        }
+        return True
+
+    def _snapshot_data(self) -> dict:
+        """Return the data to persist for a warm start."""
+        return {
+            "history_id": self._history_id,
+            "messages": [msg.as_dict() for msg in self.data or []],
+            "searches": {
+                name: [msg.as_dict() for msg in results]
+                for name, results in self.searches.items()
+            },
+        }
+
+    async def _async_load_thread_cache(self) -> None:
+        """Restore the persisted thread cache."""
+        self._thread_cache_loaded = True
+        try:
+            if data := await self._thread_store.async_load():
+                self.wrapper.thread_cache.load(data)
+        except Exception as err:
+            _LOGGER.warning("Failed to load thread cache: %s", err)
+
+    async def _async_update_data(self) -> list[GmailMessage]:
+        """Fetch data from API, joining a fetch that is already running.
+
+        Polls, service calls and webhooks that overlap share one fetch
+        instead of each spawning their own gogcli processes. The fetch is
+        cancelled, gogcli included, once every caller waiting on it is.
+        """
+        if self._update_task is None:
+            self._update_task = asyncio.get_running_loop().create_task(self._async_timed_update())
+            self._update_task.add_done_callback(self._async_update_done)
+            self._update_waiters = 0
+        task = self._update_task
+        self._update_waiters += 1
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            current = asyncio.current_task()
+            if task.cancelled() and not (current and current.cancelling()):
+                # The fetch was stopped under this caller, e.g. by a shutdown
+                raise UpdateFailed("Refresh was cancelled") from None
+            raise
+        finally:
+            if task is self._update_task:
+                self._update_waiters -= 1
+                if not self._update_waiters and not task.done():
+                    # Nobody is left to receive the result; the next caller
+                    # starts afresh instead of joining the cancelled fetch
+                    self._update_task = None
+                    task.cancel()
+
+        # Applied together with self.data, which the caller sets next
+        self._async_apply_result(result)
+        return result.messages
+
+    @callback
+    def _async_update_done(self, task: asyncio.Task) -> None:
+        if self._update_task is task:
+            self._update_task = None
+        if not task.cancelled():
+            # Retrieved here in case every caller was cancelled
+            task.exception()
+
+    @callback
+    def _async_apply_result(self, result: FetchResult) -> None:
+        """Keep the historyId and searches that match the delivered messages."""
+        self._history_id = result.history_id
+        self.searches = result.searches
+        if self.wrapper.thread_cache.dirty:
+            self._thread_store.async_delay_save(
+                self.wrapper.thread_cache.as_dict, THREAD_CACHE_SAVE_DELAY
+            )
+        # Written once self.data holds the new messages
+        self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+
+    async def async_shutdown(self) -> None:
+        """Cancel a running fetch so no gogcli process outlives the entry."""
+        await super().async_shutdown()
+        if self._update_task is not None:
+            self._update_task.cancel()
+            self._update_task = None
+
+    async def _async_timed_update(self) -> FetchResult:
+        """Run one fetch and record how it went."""
+        started = dt_util.utcnow()
+        start = time.monotonic()
+        held = {msg.id for msg in self.data or []}
+        self._sync_mode = None
+        success = False
+        new_messages = 0
+        try:
+            result = await self._async_refresh_messages()
+            success = True
+            self._last_success = time.monotonic()
+            # The first refresh has nothing to compare against
+            if self.data is not None:
+                new_messages = sum(1 for msg in result.messages if msg.id not in held)
+            return result
+        finally:
+            self._adapt_interval(success, new_messages)
+            self.last_refresh_duration = time.monotonic() - start
+            self.refresh_history.append({
+                "started": started.isoformat(),
+                "duration": round(self.last_refresh_duration, 3),
+                "sync": self._sync_mode,
+                "success": success,
+            })
+
+    async def _async_refresh_messages(self) -> FetchResult:
+        """Sync the held messages with the mailbox.
+
+        Nothing is stored on the coordinator; the result is applied by the
+        caller that receives it, so a cancelled fetch leaves no trace.
+        """
+        if not self._thread_cache_loaded:
+            await self._async_load_thread_cache()
+
+        try:
+            synced = None
+            if self._history_id and self.data is not None:
+                self._sync_mode = "delta"
                 try:
-                    thread = await self.wrapper.get_thread(message['threadId'])
-                    message['_thread'] = thread
-                except Exception as e:
-                    _LOGGER.warning("Failed to fetch thread %s: %s", message.get('threadId'), e)
-                    message['_thread'] = {}
+                    synced = await self._async_delta_sync()
+                except HistoryExpired as err:
+                    _LOGGER.debug("Falling back to full sync: %s", err)
 
-            await asyncio.gather(*[_fetch_thread(msg) for msg in messages])
+            if synced is None:
+                self._sync_mode = "full"
+                synced = await self._async_full_sync()
+            messages, history_id = synced
 
-            return messages
+            messages = await self._async_attach_threads(messages)
+
+            searches = self.searches
+            if self.saved_searches:
+                searches = await self._async_refresh_searches(messages)
+
+            ir.async_delete_issue(self.hass, DOMAIN, self._auth_issue_id)
+            return FetchResult(messages, history_id, searches)
         except Exception as err:
+            if self.wrapper.breaker.kind == ERROR_AUTH:
+                self._async_create_auth_issue()
             raise UpdateFailed(f"Error communicating with API: {err}")
+
+    @property
+    def _auth_issue_id(self) -> str:
+        return f"auth_failed_{self.entry.entry_id}"
+
+    @callback
+    def _async_create_auth_issue(self) -> None:
+        """Ask the user to re-authorize instead of retrying forever."""
+        ir.async_create_issue(
+            self.hass,
+            DOMAIN,
+            self._auth_issue_id,
+            is_fixable=False,
+            severity=ir.IssueSeverity.ERROR,
+            translation_key="auth_failed",
+            translation_placeholders={
+                "account": self.entry.title,
+                "error": self.wrapper.breaker.last_error or "",
+            },
+        )
+
+    async def _async_full_sync(self) -> tuple[list[GmailMessage], str | None]:
+        """Fetch the newest INBOX messages, reusing bodies already held.
+
+        The search returns IDs only; messages not in the current data are
+        fetched through their threads. Without history deltas there is no
+        way to tell which threads gained a reply, so the thread cache is
+        cleared first. Returns the messages and the newest historyId.
+        """
+        self.wrapper.thread_cache.clear()
+        self._mailbox_changed = True
+        held = {msg.id: msg for msg in self.data or []}
+
+        results = await self.wrapper.search_messages(INBOX_QUERY, limit=MAX_MESSAGES)
+        fetched = await self._async_fetch_messages(
+            {result["id"]: result.get("threadId") for result in results if result["id"] not in held},
+            strict=True,
+        )
+        bodies = {}
+        if fetched:
+            parsed = await self.hass.async_add_executor_job(parse_messages, fetched)
+            bodies = {msg.id: msg for msg in parsed}
+
+        messages = []
+        for result in results:
+            if message := held.get(result["id"]):
+                if "labelIds" in result:
+                    message = message.with_labels(result["labelIds"])
+                if "historyId" in result:
+                    message = replace(message, history_id=result["historyId"])
+                messages.append(message)
+            elif result["id"] in bodies:
+                messages.append(bodies[result["id"]])
+
+        history_ids = [int(msg.history_id) for msg in messages if msg.history_id]
+        return messages, str(max(history_ids)) if history_ids else None
+
+    async def _async_delta_sync(self) -> tuple[list[GmailMessage], str | None] | None:
+        """Apply mailbox changes since the last seen historyId.
+
+        Only messages newly added to the INBOX are fetched. Returns the
+        messages and the new historyId, or None when a held message left the
+        INBOX and a full sync is needed to backfill.
+        """
+        history = await self.wrapper.list_history(self._history_id)
+
+        held = {msg.id: msg for msg in self.data}
+        held_threads = {msg.thread_id for msg in self._held_messages()}
+        added: list[str] = []
+        threads: dict[str, str] = {}
+        # Any change can move messages in or out of a saved search
+        self._mailbox_changed = bool(history.get("history"))
+
+        for record in history.get("history", []):
+            for item in record.get("messagesAdded", []):
+                message = item.get("message", {})
+                if message.get("threadId") in held_threads:
+                    # A new message in a held thread may be our reply
+                    self.wrapper.thread_cache.invalidate(message["threadId"])
+                if "threadId" in message:
+                    threads[message["id"]] = message["threadId"]
+                if "INBOX" in message.get("labelIds", []):
+                    added.append(message["id"])
+
+            for item in record.get("messagesDeleted", []):
+                deleted_id = item.get("message", {}).get("id")
+                if deleted_id in held:
+                    return None
+                # Added and deleted inside the same window, e.g. spam
+                added = [msg_id for msg_id in added if msg_id != deleted_id]
+
+            for item in record.get("labelsAdded", []) + record.get("labelsRemoved", []):
+                message = item.get("message", {})
+                if message.get("id") not in held:
+                    if "INBOX" in item.get("labelIds", []) and "INBOX" in message.get("labelIds", []):
+                        added.append(message["id"])
+                        if "threadId" in message:
+                            threads[message["id"]] = message["threadId"]
+                    continue
+                if "INBOX" not in message.get("labelIds", []):
+                    return None
+                held[message["id"]] = held[message["id"]].with_labels(message.get("labelIds", []))
+
+        new_messages = await self._async_fetch_messages(
+            {msg_id: threads.get(msg_id) for msg_id in dict.fromkeys(added) if msg_id not in held}
+        )
+
+        messages = list(held.values())
+        if inbox_messages := [msg for msg in new_messages if "INBOX" in msg.get("labelIds", [])]:
+            messages += await self.hass.async_add_executor_job(parse_messages, inbox_messages)
+        messages.sort(key=lambda msg: msg.internal_date, reverse=True)
+
+        history_id = str(history["historyId"]) if history.get("historyId") else self._history_id
+        return messages[:MAX_MESSAGES], history_id
+
+    async def _async_refresh_searches(
+        self, inbox: list[GmailMessage]
+    ) -> dict[str, list[GmailMessage]]:
+        """Run the saved searches as one batch.
+
+        Every search asks for IDs only. A message found by several searches,
+        or already held, is fetched and parsed at most once. Searches are
+        skipped while the mailbox history shows no change at all.
+        """
+        names = [search[CONF_SEARCH_NAME] for search in self.saved_searches]
+        if not self._mailbox_changed and all(name in self.searches for name in names):
+            return self.searches
+        if self.wrapper.breaker.is_open:
+            return self.searches
+
+        results = await asyncio.gather(
+            *[
+                self.wrapper.search_messages(
+                    search[CONF_SEARCH_QUERY], limit=search.get(CONF_SEARCH_LIMIT, MAX_MESSAGES)
+                )
+                for search in self.saved_searches
+            ],
+            return_exceptions=True,
+        )
+
+        held = {msg.id: msg for msg in self._held_messages()}
+        held.update((msg.id, msg) for msg in inbox)
+        wanted: dict[str, dict] = {}
+        for result in results:
+            if not isinstance(result, Exception):
+                for item in result:
+                    wanted.setdefault(item["id"], item)
+
+        fetched = await self._async_fetch_messages(
+            {msg_id: item.get("threadId") for msg_id, item in wanted.items() if msg_id not in held}
+        )
+        if fetched:
+            for message in await self.hass.async_add_executor_job(parse_messages, fetched):
+                held[message.id] = message
+
+        inbox_ids = {msg.id for msg in inbox}
+        found: dict[str, GmailMessage] = {}
+        for msg_id, item in wanted.items():
+            if not (message := held.get(msg_id)):
+                continue
+            if "labelIds" in item:
+                message = message.with_labels(item["labelIds"])
+            if "historyId" in item:
+                message = replace(message, history_id=item["historyId"])
+            found[msg_id] = message
+
+        # INBOX messages already have their reply state from this refresh
+        others = [msg for msg_id, msg in found.items() if msg_id not in inbox_ids]
+        for message in await self._async_attach_threads(others):
+            found[message.id] = message
+
+        searches = {}
+        for search, result in zip(self.saved_searches, results):
+            name = search[CONF_SEARCH_NAME]
+            if isinstance(result, Exception):
+                _LOGGER.warning("Saved search %s failed: %s", name, result)
+                searches[name] = self.searches.get(name, [])
+                continue
+            searches[name] = [found[item["id"]] for item in result if item["id"] in found]
+        return searches
+
+    async def _async_fetch_messages(
+        self, wanted: dict[str, str | None], strict: bool = False
+    ) -> list[dict]:
+        """Fetch messages through their threads, one download per thread.
+
+        One call gives both the body and the reply state when the thread
+        payload holds its messages in full. Its summary is cached under the
+        message's historyId, which _async_attach_threads then hits. Messages
+        with no known thread, or that come with a snippet only, are fetched
+        on their own. Unless strict, messages that cannot be fetched are
+        skipped.
+        """
+        by_thread: dict[str, set[str]] = {}
+        lone_ids = []
+        for msg_id, thread_id in wanted.items():
+            if thread_id:
+                by_thread.setdefault(thread_id, set()).add(msg_id)
+            else:
+                lone_ids.append(msg_id)
+
+        async def _fetch_thread(thread_id: str, message_ids: set[str]) -> list[dict]:
+            try:
+                thread = await self.wrapper.get_thread(thread_id)
+            except Exception as err:
+                if strict:
+                    raise
+                _LOGGER.debug("Skipping thread %s: %s", thread_id, err)
+                return []
+            found = [msg for msg in thread.get("messages", []) if msg.get("id") in message_ids]
+            for message in found:
+                self.wrapper.thread_cache.set(thread_id, message.get("historyId") or '', thread)
+            # A thread that carries snippets only leaves the body to gmail get
+            bodies = await asyncio.gather(
+                *[_fetch_message(msg["id"]) for msg in found if not has_body(msg)]
+            )
+            return [msg for msg in found if has_body(msg)] + [msg for body in bodies for msg in body]
+
+        async def _fetch_message(message_id: str) -> list[dict]:
+            if strict:
+                return [await self.wrapper.get_message(message_id)]
+            return [await self._async_get_new_message(message_id)]
+
+        results = await asyncio.gather(
+            *[_fetch_thread(thread_id, ids) for thread_id, ids in by_thread.items()],
+            *[_fetch_message(msg_id) for msg_id in lone_ids],
+        )
+        return [message for found in results for message in found if message]
+
+    async def _async_get_new_message(self, message_id: str) -> dict:
+        """Fetch a message reported by history, skipping it if it is gone."""
+        try:
+            return await self.wrapper.get_message(message_id)
+        except Exception as err:
+            _LOGGER.debug("Skipping message %s: %s", message_id, err)
+            return {}
+
+    async def _async_attach_threads(self, messages: list[GmailMessage]) -> list[GmailMessage]:
+        """Update the reply state of each message from its thread.
+
+        While the circuit breaker is open the held reply state is kept.
+        """
+        if self.wrapper.breaker.is_open:
+            return messages
+
+        async def _fetch_thread(message: GmailMessage) -> GmailMessage:
+            try:
+                # Unchanged messages are served from the thread cache
+                thread = await self.wrapper.get_thread(
+                    message.thread_id, cache_key=message.history_id or ''
+                )
+            except CircuitOpenError:
+                return message
+            except Exception as e:
+                _LOGGER.warning("Failed to fetch thread %s: %s", message.thread_id, e)
+                thread = {}
+            return message.with_reply(check_reply(message.id, thread))
+
+        return list(await asyncio.gather(*[_fetch_thread(msg) for msg in messages]))
@@ -0,0 +1,75 @@
+"""Diagnostics support for gogcli."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_ACCOUNT,
+    CONF_AUTH_CODE,
+    CONF_CREDENTIALS_FILE,
+    CONF_SEARCH_QUERY,
+    DOMAIN,
+)
+from .coordinator import GogGmailCoordinator
+
+# Saved search queries can hold addresses such as from:boss@example.com
+TO_REDACT = {CONF_ACCOUNT, CONF_AUTH_CODE, CONF_CREDENTIALS_FILE, CONF_WEBHOOK_ID, CONF_SEARCH_QUERY}
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: GogGmailCoordinator = hass.data[DOMAIN][entry.entry_id]
+    wrapper = coordinator.wrapper
+    scheduler = wrapper.scheduler
+    messages = coordinator.data or []
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "polling": {
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "adaptive_polling": coordinator.adaptive_polling,
+            "min_interval": coordinator.min_interval.total_seconds(),
+            "max_interval": coordinator.max_interval.total_seconds(),
+            "body_mode": coordinator.body_mode,
+            "body_max_length": coordinator.body_max_length,
+            "timeouts": dict(wrapper.timeouts),
+            "max_processes": scheduler.max_concurrent if scheduler else None,
+        },
+        "refreshes": {
+            "last_update_success": coordinator.last_update_success,
+            "history": list(coordinator.refresh_history),
+        },
+        "webhook": {
+            "calls": coordinator.webhook_calls,
+            "skipped": coordinator.webhook_skipped,
+        },
+        "breaker": wrapper.breaker.as_dict(),
+        "scheduler": scheduler.as_dict() if scheduler else None,
+        "commands": wrapper.metrics.as_dict(),
+        "timeouts": dict(wrapper.timed_out),
+        "traces": list(wrapper.metrics.traces),
+        "data": {
+            "messages": len(messages),
+            "searches": {name: len(results) for name, results in coordinator.searches.items()},
+            "label_counts": coordinator.label_coordinator.data,
+            "body_characters": sum(
+                len(msg.body_text) + len(msg.body_html or "") for msg in messages
+            ),
+            "thread_cache": {
+                "entries": len(wrapper.thread_cache),
+                "hits": wrapper.thread_cache.hits,
+                "misses": wrapper.thread_cache.misses,
+            },
+        },
+    }
@@ -0,0 +1,116 @@
+"""Per-command metrics for gogcli processes."""
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+
+# Recent wall times kept per subcommand for the rolling percentiles
+METRICS_WINDOW = 100
+SPAWN_RATE_WINDOW = 3600
+TRACE_HISTORY_SIZE = 50
+REDACTED = "**REDACTED**"
+
+def percentile(samples: list[float], fraction: float) -> float | None:
+    """Return the nearest-rank percentile of samples."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = min(len(ordered), max(1, math.ceil(fraction * len(ordered)))) - 1
+    return ordered[rank]
+
+def redact_args(name: str, args: tuple[str, ...] | list[str]) -> list[str]:
+    """Keep the subcommand and flags of a command line, hiding its values.
+
+    Values include search queries, which can hold addresses, and message
+    and thread IDs.
+    """
+    skip = len(name.split()) if name else 0
+    return [*args[:skip], *(arg if arg.startswith("-") else REDACTED for arg in args[skip:])]
+
+class CommandMetrics:
+    """Counters and recent wall times for one gogcli subcommand."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.last_exit_code: int | None = None
+        self.stdout_bytes = 0
+        self.parse_time = 0.0
+        self.wall_times: deque[float] = deque(maxlen=METRICS_WINDOW)
+
+    def as_dict(self) -> dict:
+        """Return the metrics as a dictionary."""
+        samples = list(self.wall_times)
+        p50 = percentile(samples, 0.5)
+        p95 = percentile(samples, 0.95)
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "last_exit_code": self.last_exit_code,
+            "p50": round(p50, 3) if p50 is not None else None,
+            "p95": round(p95, 3) if p95 is not None else None,
+            "stdout_bytes": self.stdout_bytes,
+            "parse_time": round(self.parse_time, 3),
+        }
+
+class GogMetrics:
+    """Record wall time, exit code and output size of every gogcli call."""
+
+    def __init__(self) -> None:
+        self.commands: dict[str, CommandMetrics] = {}
+        self.bytes_parsed = 0
+        self.traces: deque[dict] = deque(maxlen=TRACE_HISTORY_SIZE)
+        self._spawn_times: deque[float] = deque()
+
+    def _command(self, name: str) -> CommandMetrics:
+        if name not in self.commands:
+            self.commands[name] = CommandMetrics()
+        return self.commands[name]
+
+    def record_run(
+        self,
+        name: str,
+        duration: float,
+        exit_code: int | None,
+        stdout_bytes: int,
+        args: tuple[str, ...] = (),
+    ) -> None:
+        """Record a finished process; exit_code is None when it was killed."""
+        command = self._command(name)
+        command.calls += 1
+        command.last_exit_code = exit_code
+        command.stdout_bytes += stdout_bytes
+        command.wall_times.append(duration)
+        if exit_code != 0:
+            command.failures += 1
+        self._spawn_times.append(time.monotonic())
+        self.traces.append({
+            "finished": round(time.time(), 3),
+            "args": redact_args(name, args),
+            "duration": round(duration, 3),
+            "exit_code": exit_code,
+            "stdout_bytes": stdout_bytes,
+        })
+
+    def record_parse(self, name: str, duration: float, size: int) -> None:
+        """Record the JSON decoding of a command's output."""
+        self._command(name).parse_time += duration
+        self.bytes_parsed += size
+
+    @property
+    def failed_calls(self) -> int:
+        """Return the number of calls that failed or were killed."""
+        return sum(command.failures for command in self.commands.values())
+
+    @property
+    def spawns_per_hour(self) -> int:
+        """Return the number of processes started in the last hour."""
+        cutoff = time.monotonic() - SPAWN_RATE_WINDOW
+        while self._spawn_times and self._spawn_times[0] < cutoff:
+            self._spawn_times.popleft()
+        return len(self._spawn_times)
+
+    def as_dict(self) -> dict[str, dict]:
+        """Return the metrics of every subcommand."""
+        return {name: command.as_dict() for name, command in self.commands.items()}
@@ -0,0 +1,170 @@
+"""Parsed Gmail data for gogcli."""
+from __future__ import annotations
+
+import base64
+import re
+from dataclasses import asdict, dataclass, fields, replace
+from typing import Any
+
+CHARSET_RE = re.compile(r'charset="?([^";\s]+)', re.IGNORECASE)
+
+@dataclass(frozen=True, slots=True)
+class GmailMessage:
+    """A Gmail message reduced to what the sensors show."""
+
+    id: str
+    thread_id: str | None
+    history_id: str | None
+    internal_date: int
+    headers: dict[str, str]
+    snippet: str
+    labels: tuple[str, ...]
+    body_text: str
+    body_html: str | None
+    has_attachment: bool
+    have_replied: bool
+    priority: bool
+    starred: bool
+    is_unread: bool
+
+    def with_labels(self, labels: list[str] | tuple[str, ...]) -> GmailMessage:
+        """Return a copy with new labels and label flags."""
+        return replace(self, labels=tuple(labels), **_label_flags(labels))
+
+    def with_reply(self, have_replied: bool) -> GmailMessage:
+        """Return a copy with a new reply state."""
+        if have_replied == self.have_replied:
+            return self
+        return replace(self, have_replied=have_replied)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the message as JSON-serializable data."""
+        data = asdict(self)
+        data["labels"] = list(self.labels)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> GmailMessage:
+        """Rebuild a message saved with as_dict."""
+        values = {field.name: data[field.name] for field in fields(cls)}
+        values["labels"] = tuple(values["labels"])
+        return cls(**values)
+
+def parse_message(message: dict[str, Any], thread: dict[str, Any] | None = None) -> GmailMessage:
+    """Parse a gogcli message payload."""
+    payload = message.get("payload", {})
+    labels = message.get("labelIds", [])
+
+    headers: dict[str, str] = {}
+    for header in payload.get("headers", []):
+        # Keep the first value, as a linear scan would
+        headers.setdefault(header.get("name"), header.get("value"))
+
+    body_text, body_html = extract_body(payload)
+
+    return GmailMessage(
+        id=message.get("id"),
+        thread_id=message.get("threadId"),
+        history_id=message.get("historyId"),
+        internal_date=int(message.get("internalDate", 0)),
+        headers=headers,
+        snippet=message.get("snippet", ""),
+        labels=tuple(labels),
+        body_text=body_text or message.get("snippet", ""),
+        body_html=body_html,
+        has_attachment=check_attachment(payload),
+        have_replied=check_reply(message.get("id"), thread or {}),
+        **_label_flags(labels),
+    )
+
+def parse_messages(messages: list[dict[str, Any]]) -> list[GmailMessage]:
+    """Parse a batch of gogcli message payloads.
+
+    This does the base64 decoding and MIME walk, so run it in the executor.
+    """
+    return [parse_message(message) for message in messages]
+
+def _label_flags(labels: list[str] | tuple[str, ...]) -> dict[str, bool]:
+    return {
+        "priority": "IMPORTANT" in labels,
+        "starred": "STARRED" in labels,
+        "is_unread": "UNREAD" in labels,
+    }
+
+def check_attachment(payload: dict[str, Any]) -> bool:
+    """Check if the email has attachments."""
+    if payload.get("filename"):
+        return True
+
+    parts = payload.get("parts", [])
+    for part in parts:
+        if check_attachment(part):
+            return True
+
+    return False
+
+def has_body(message: dict[str, Any]) -> bool:
+    """Check if a message payload carries body data, not just a snippet."""
+    payload = message.get("payload") or {}
+    return bool(payload.get("body", {}).get("data") or payload.get("parts"))
+
+def check_reply(message_id: str | None, thread: dict[str, Any]) -> bool:
+    """Check if we have replied to this email."""
+    messages = thread.get("messages", [])
+
+    found_current = False
+    for msg in messages:
+        if msg.get("id") == message_id:
+            found_current = True
+            continue
+
+        if found_current:
+            # Check if this subsequent message is from us (SENT label)
+            if "SENT" in msg.get("labelIds", []):
+                return True
+
+    return False
+
+def extract_body(payload: dict[str, Any]) -> tuple[str | None, str | None]:
+    """Extract text and html body from payload."""
+    text_body = None
+    html_body = None
+
+    mime_type = payload.get("mimeType")
+    body_data = payload.get("body", {}).get("data")
+
+    if body_data:
+        decoded = decode_data(body_data, _part_charset(payload))
+        if mime_type == "text/plain":
+            text_body = decoded
+        elif mime_type == "text/html":
+            html_body = decoded
+
+    parts = payload.get("parts", [])
+    for part in parts:
+        part_text, part_html = extract_body(part)
+        if part_text and not text_body:
+            text_body = part_text
+        if part_html and not html_body:
+            html_body = part_html
+
+    return text_body, html_body
+
+def _part_charset(payload: dict[str, Any]) -> str:
+    """Return the charset declared in a MIME part's Content-Type header."""
+    for header in payload.get("headers", []):
+        if header.get("name", "").lower() == "content-type":
+            if match := CHARSET_RE.search(header.get("value", "")):
+                return match.group(1)
+    return "utf-8"
+
+def decode_data(data: str, charset: str = "utf-8") -> str:
+    """Decode base64url encoded data."""
+    try:
+        raw = base64.urlsafe_b64decode(data + "===")
+    except Exception:
+        return ""
+    try:
+        return raw.decode(charset, errors="replace")
+    except LookupError:
+        return raw.decode("utf-8", errors="replace")
@@ -0,0 +1,106 @@
+"""Shared scheduler for gogcli processes."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from .const import DEFAULT_MAX_PROCESSES
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+class GogScheduler:
+    """Limit the number of gogcli processes running across all accounts.
+
+    Waiting callers are started in priority order, so interactive service
+    calls run ahead of background polls.
+    """
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_PROCESSES) -> None:
+        self.max_concurrent = max(1, max_concurrent)
+        self.active = 0
+        self.total_runs = 0
+        self.total_queued = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.max_queue_depth = 0
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of callers waiting for a slot."""
+        return len(self._queue)
+
+    def set_max_concurrent(self, max_concurrent: int) -> None:
+        """Change the process limit and start waiters if it grew."""
+        self.max_concurrent = max(1, max_concurrent)
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_BACKGROUND) -> AsyncIterator[None]:
+        """Hold a process slot for the duration of the block."""
+        await self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int) -> None:
+        self.total_runs += 1
+        if self.active < self.max_concurrent and not self._queue:
+            self.active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._sequence), future)
+        heapq.heappush(self._queue, entry)
+        self.total_queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+
+        start = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before cancellation
+                self._release()
+            elif entry in self._queue:
+                # _wake drops cancelled waiters it reaches first
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+            raise
+
+        waited = time.monotonic() - start
+        self.total_wait_time += waited
+        self.max_wait_time = max(self.max_wait_time, waited)
+
+    def _release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._queue and self.active < self.max_concurrent:
+            _, _, future = heapq.heappop(self._queue)
+            if future.done():
+                continue
+            self.active += 1
+            future.set_result(None)
+
+    def as_dict(self) -> dict:
+        """Return scheduler counters."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "total_runs": self.total_runs,
+            "total_queued": self.total_queued,
+            "total_wait_time": round(self.total_wait_time, 3),
+            "max_wait_time": round(self.max_wait_time, 3),
+            "average_wait_time": round(self.total_wait_time / self.total_runs, 3) if self.total_runs else 0.0,
+        }
@@ -2,22 +2,81 @@
 from __future__ import annotations
 
 import logging
-import base64
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorDeviceClass,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util, slugify
 
-from .const import DOMAIN, CONF_ACCOUNT
-from .coordinator import GogGmailCoordinator
+from .const import (
+    DOMAIN,
+    CONF_ACCOUNT,
+    CONF_SEARCH_LIMIT,
+    CONF_SEARCH_NAME,
+    MAX_MESSAGES,
+    BODY_MODE_NONE,
+    BODY_MODE_TRUNCATED,
+)
+from .coordinator import GogGmailCoordinator, GogLabelCoordinator
+from .models import GmailMessage
 
 _LOGGER = logging.getLogger(__name__)
 
+@dataclass(frozen=True, kw_only=True)
+class GogMetricSensorEntityDescription(SensorEntityDescription):
+    """Describes a gogcli metric sensor."""
+
+    value_fn: Callable[[GogGmailCoordinator], Any]
+
+METRIC_SENSORS: tuple[GogMetricSensorEntityDescription, ...] = (
+    GogMetricSensorEntityDescription(
+        key="last_refresh_duration",
+        translation_key="last_refresh_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        icon="mdi:timer-outline",
+        value_fn=lambda coordinator: coordinator.last_refresh_duration,
+    ),
+    GogMetricSensorEntityDescription(
+        key="gogcli_spawns_per_hour",
+        translation_key="gogcli_spawns_per_hour",
+        native_unit_of_measurement="processes/h",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:rocket-launch",
+        value_fn=lambda coordinator: coordinator.wrapper.metrics.spawns_per_hour,
+    ),
+    GogMetricSensorEntityDescription(
+        key="gogcli_failed_calls",
+        translation_key="gogcli_failed_calls",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:alert-circle-outline",
+        value_fn=lambda coordinator: coordinator.wrapper.metrics.failed_calls,
+    ),
+    GogMetricSensorEntityDescription(
+        key="gogcli_bytes_parsed",
+        translation_key="gogcli_bytes_parsed",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:code-json",
+        value_fn=lambda coordinator: coordinator.wrapper.metrics.bytes_parsed,
+    ),
+)
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -26,8 +85,20 @@ async def async_setup_entry(
     """Set up the sensor platform."""
     coordinator: GogGmailCoordinator = hass.data[DOMAIN][entry.entry_id]
     
-    sensors = [GogGmailSensor(coordinator, i) for i in range(5)]
+    sensors = [GogGmailSensor(coordinator, i) for i in range(MAX_MESSAGES)]
     sensors.append(GogGmailLastUpdateSensor(coordinator))
+    sensors.append(GogProcessQueueSensor(coordinator))
+    sensors.extend(GogMetricSensor(coordinator, description) for description in METRIC_SENSORS)
+    sensors.extend(
+        GogLabelCountSensor(coordinator.label_coordinator, label, count)
+        for label in coordinator.label_coordinator.labels
+        for count in ("total", "unread")
+    )
+    for search in coordinator.saved_searches:
+        sensors.extend(
+            GogSearchSensor(coordinator, search[CONF_SEARCH_NAME], i)
+            for i in range(search.get(CONF_SEARCH_LIMIT, MAX_MESSAGES))
+        )
     async_add_entities(sensors)
 
 class GogGmailLastUpdateSensor(CoordinatorEntity, SensorEntity):
@@ -61,12 +132,146 @@ class GogGmailLastUpdateSensor(CoordinatorEntity, SensorEntity):
         """Return the state of the sensor."""
         return self.coordinator.last_update_success_time
 
+class GogProcessQueueSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor showing the shared gogcli process queue."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_icon = "mdi:tray-full"
+    _attr_has_entity_name = True
+    _attr_translation_key = "gogcli_queue"
+
+    def __init__(self, coordinator: GogGmailCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_gogcli_queue"
+        account = coordinator.entry.data[CONF_ACCOUNT]
+        self.entity_id = f"sensor.{slugify(account)}_gogcli_queue"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information."""
+        account = self.coordinator.entry.data[CONF_ACCOUNT]
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.entry.entry_id)},
+            name=f"Gmail Account ({account})",
+            manufacturer="Google",
+            model="Gmail via gogcli",
+        )
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the number of gogcli calls waiting for a slot."""
+        if not (scheduler := self.coordinator.wrapper.scheduler):
+            return None
+        return scheduler.queue_depth
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the scheduler counters and this account's timeouts."""
+        attributes = {}
+        if scheduler := self.coordinator.wrapper.scheduler:
+            attributes.update(scheduler.as_dict())
+        attributes["timeouts"] = dict(self.coordinator.wrapper.timed_out)
+        return attributes
+
+class GogMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor showing a gogcli metric."""
+
+    entity_description: GogMetricSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    # The per-command breakdown changes on every refresh
+    _unrecorded_attributes = frozenset({"commands"})
+
+    def __init__(
+        self,
+        coordinator: GogGmailCoordinator,
+        description: GogMetricSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_{description.key}"
+        account = coordinator.entry.data[CONF_ACCOUNT]
+        self.entity_id = f"sensor.{slugify(account)}_{description.key}"
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information."""
+        account = self.coordinator.entry.data[CONF_ACCOUNT]
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.entry.entry_id)},
+            name=f"Gmail Account ({account})",
+            manufacturer="Google",
+            model="Gmail via gogcli",
+        )
+
+    @property
+    def native_value(self) -> Any:
+        """Return the metric."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the per-command metrics on the refresh duration sensor."""
+        if self.entity_description.key != "last_refresh_duration":
+            return None
+        return {"commands": self.coordinator.wrapper.metrics.as_dict()}
+
+class GogLabelCountSensor(CoordinatorEntity, SensorEntity):
+    """Sensor counting the total or unread messages with a label."""
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "messages"
+
+    def __init__(self, coordinator: GogLabelCoordinator, label: str, count: str) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.label = label
+        self.count = count
+        self._attr_translation_key = f"label_{count}"
+        self._attr_icon = "mdi:email-mark-as-unread" if count == "unread" else "mdi:email-multiple"
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_label_{slugify(label)}_{count}"
+        account = coordinator.entry.data[CONF_ACCOUNT]
+        self.entity_id = f"sensor.{slugify(account)}_{slugify(label)}_{count}"
+
+    @property
+    def translation_placeholders(self) -> dict[str, str]:
+        """Return translation placeholders."""
+        return {"label": self.label}
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information."""
+        account = self.coordinator.entry.data[CONF_ACCOUNT]
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.entry.entry_id)},
+            name=f"Gmail Account ({account})",
+            manufacturer="Google",
+            model="Gmail via gogcli",
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return False when this label could not be counted."""
+        return super().available and self.label in (self.coordinator.data or {})
+
+    @property
+    def native_value(self) -> int | None:
+        """Return the message count."""
+        return (self.coordinator.data or {}).get(self.label, {}).get(self.count)
+
 class GogGmailSensor(CoordinatorEntity, SensorEntity):
     """Representation of a Gmail sensor."""
 
     _attr_has_entity_name = True
     _attr_translation_key = "gmail_email"
     _attr_icon = "mdi:email"
+    # Bodies can be hundreds of KB; keep them out of the recorder
+    _unrecorded_attributes = frozenset({"body_text", "body_html", "body_truncated"})
 
     def __init__(self, coordinator: GogGmailCoordinator, index: int) -> None:
         """Initialize the sensor."""
@@ -75,6 +280,7 @@ class GogGmailSensor(CoordinatorEntity, SensorEntity):
         self._attr_unique_id = f"{coordinator.entry.entry_id}_email_{index}"
         account = coordinator.entry.data[CONF_ACCOUNT]
         self.entity_id = f"sensor.{slugify(account)}_gmail_email_{index + 1}"
+        self._fingerprint: tuple | None = None
 
     @property
     def translation_placeholders(self) -> dict[str, str]:
@@ -99,8 +305,8 @@ class GogGmailSensor(CoordinatorEntity, SensorEntity):
         if not email:
             return "Empty"
         
-        sender = self._get_header(email, "From") or "Unknown"
-        subject = self._get_header(email, "Subject") or "No Subject"
+        sender = email.headers.get("From") or "Unknown"
+        subject = email.headers.get("Subject") or "No Subject"
         
         state = f"{sender} - {subject}"
         return state[:255]
@@ -112,101 +318,91 @@ class GogGmailSensor(CoordinatorEntity, SensorEntity):
         if not email:
             return {}
 
-        headers = email.get("payload", {}).get("headers", [])
-        labels = email.get("labelIds", [])
-        
-        body_text, body_html = self._extract_body(email.get("payload", {}))
-        
+        body_text, body_html, body_truncated = self._get_body(email)
+
         return {
-            "date_received": self._get_header(email, "Date"),
-            "from": self._get_header(email, "From"),
-            "to": self._get_header(email, "To"),
-            "subject": self._get_header(email, "Subject"),
-            "message_id": email.get("id"),
-            "thread_id": email.get("threadId"),
-            "body_text": body_text or email.get("snippet", ""),
+            "date_received": email.headers.get("Date"),
+            "from": email.headers.get("From"),
+            "to": email.headers.get("To"),
+            "subject": email.headers.get("Subject"),
+            "message_id": email.id,
+            "thread_id": email.thread_id,
+            "body_text": body_text,
             "body_html": body_html,
-            "labels": labels,
-            "has_attachment": self._check_attachment(email.get("payload", {})),
-            "have_replied": self._check_reply(email),
-            "priority": "IMPORTANT" in labels,
-            "starred": "STARRED" in labels,
-            "is_unread": "UNREAD" in labels,
+            "body_truncated": body_truncated,
+            "labels": list(email.labels),
+            "has_attachment": email.has_attachment,
+            "have_replied": email.have_replied,
+            "priority": email.priority,
+            "starred": email.starred,
+            "is_unread": email.is_unread,
         }
 
-    def _check_attachment(self, payload: dict[str, Any]) -> bool:
-        """Check if the email has attachments."""
-        if payload.get("filename"):
-            return True
-        
-        parts = payload.get("parts", [])
-        for part in parts:
-            if self._check_attachment(part):
-                return True
-        
-        return False
+    async def async_added_to_hass(self) -> None:
+        """Remember what the initial state was built from."""
+        await super().async_added_to_hass()
+        self._fingerprint = self._get_fingerprint()
 
-    def _check_reply(self, email: dict[str, Any]) -> bool:
-        """Check if we have replied to this email."""
-        thread = email.get("_thread", {})
-        messages = thread.get("messages", [])
-        current_id = email.get("id")
-        
-        found_current = False
-        for msg in messages:
-            if msg.get("id") == current_id:
-                found_current = True
-                continue
-            
-            if found_current:
-                # Check if this subsequent message is from us (SENT label)
-                if "SENT" in msg.get("labelIds", []):
-                    return True
-        
-        return False
-
-    def _extract_body(self, payload: dict[str, Any]) -> tuple[str | None, str | None]:
-        """Extract text and html body from payload."""
-        text_body = None
-        html_body = None
-
-        mime_type = payload.get("mimeType")
-        body_data = payload.get("body", {}).get("data")
-
-        if body_data:
-            decoded = self._decode_data(body_data)
-            if mime_type == "text/plain":
-                text_body = decoded
-            elif mime_type == "text/html":
-                html_body = decoded
-
-        parts = payload.get("parts", [])
-        for part in parts:
-            part_text, part_html = self._extract_body(part)
-            if part_text and not text_body:
-                text_body = part_text
-            if part_html and not html_body:
-                html_body = part_html
-        
-        return text_body, html_body
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this sensor's message changed."""
+        fingerprint = self._get_fingerprint()
+        if fingerprint == self._fingerprint:
+            return
+        self._fingerprint = fingerprint
+        super()._handle_coordinator_update()
 
-    def _decode_data(self, data: str) -> str:
-        """Decode base64url encoded data."""
-        try:
-            return base64.urlsafe_b64decode(data + "===").decode("utf-8")
-        except Exception:
-            return ""
+    def _get_fingerprint(self) -> tuple:
+        """Return what the state and attributes are derived from."""
+        email = self._get_email_data()
+        return (
+            self.available,
+            self.coordinator.body_mode,
+            self.coordinator.body_max_length,
+            email and (email.id, email.labels, email.have_replied),
+        )
+
+    def _get_body(self, email: GmailMessage) -> tuple[str | None, str | None, bool]:
+        """Return the body attributes for the configured body mode."""
+        mode = self.coordinator.body_mode
+        if mode == BODY_MODE_NONE:
+            return None, None, bool(email.body_text or email.body_html)
+        if mode == BODY_MODE_TRUNCATED:
+            # Cut HTML would be broken markup, so only text is kept
+            limit = self.coordinator.body_max_length
+            if len(email.body_text) > limit:
+                return email.body_text[:limit] + "…", None, True
+            return email.body_text, None, email.body_html is not None
+        return email.body_text, email.body_html, False
 
-    def _get_email_data(self) -> dict[str, Any] | None:
+    def _get_email_data(self) -> GmailMessage | None:
         """Get the email data for this sensor index."""
         if not self.coordinator.data or len(self.coordinator.data) <= self.index:
             return None
         return self.coordinator.data[self.index]
 
-    def _get_header(self, email: dict[str, Any], header_name: str) -> str | None:
-        """Get a specific header value."""
-        headers = email.get("payload", {}).get("headers", [])
-        for header in headers:
-            if header.get("name") == header_name:
-                return header.get("value")
-        return None
\ No newline at end of file
+class GogSearchSensor(GogGmailSensor):
+    """A message found by one of the account's saved searches."""
+
+    _attr_translation_key = "search_email"
+    _attr_icon = "mdi:email-search"
+
+    def __init__(self, coordinator: GogGmailCoordinator, search: str, index: int) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, index)
+        self.search = search
+        self._attr_unique_id = f"{coordinator.entry.entry_id}_search_{slugify(search)}_{index}"
+        account = coordinator.entry.data[CONF_ACCOUNT]
+        self.entity_id = f"sensor.{slugify(account)}_search_{slugify(search)}_{index + 1}"
+
+    @property
+    def translation_placeholders(self) -> dict[str, str]:
+        """Return translation placeholders."""
+        return {"search": self.search, "index": str(self.index + 1)}
+
+    def _get_email_data(self) -> GmailMessage | None:
+        """Get the message at this sensor's index in the search results."""
+        results = self.coordinator.searches.get(self.search, [])
+        if len(results) <= self.index:
+            return None
+        return results[self.index]
@@ -2,30 +2,98 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
 import platform
+import shutil
+import signal
 import stat
 import tarfile
+import time
 import zipfile
-from io import BytesIO
+from collections import Counter, OrderedDict
+from datetime import datetime, timedelta
 
 import aiohttp
 import yaml
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
 
-from .const import GOG_YAML_CONFIG
+from .const import (
+    CONFIG_WATCH_INTERVAL,
+    DATA_BINARY,
+    DATA_CONFIG_SYNC,
+    DEFAULT_FETCH_TIMEOUT,
+    DEFAULT_SEARCH_TIMEOUT,
+    DOMAIN,
+    GOG_YAML_CONFIG,
+)
+from .breaker import ERROR_NETWORK, GogCircuitBreaker, classify_error
+from .metrics import GogMetrics
+from .scheduler import PRIORITY_BACKGROUND, GogScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 GOGCLI_VERSION = "0.9.0"
-GITHUB_RELEASE_URL = "https://github.com/steipete/gogcli/releases/download/v{version}/gogcli_{version}_{os}_{arch}.{ext}"
+ARCHIVE_NAME = "gogcli_{version}_{os}_{arch}.{ext}"
+# goreleaser's default name, stored under the same name it is published as
+CHECKSUMS_NAME = "gogcli_{version}_checksums.txt"
+GITHUB_RELEASE_URL = "https://github.com/steipete/gogcli/releases/download/v{version}/" + ARCHIVE_NAME
+GITHUB_CHECKSUMS_URL = "https://github.com/steipete/gogcli/releases/download/v{version}/" + CHECKSUMS_NAME
+# Created by the user next to an offline archive to install it without checksums
+ALLOW_UNVERIFIED_NAME = "ALLOW_UNVERIFIED"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+THREAD_CACHE_SIZE = 50
+THREAD_CACHE_TTL = 3600
+
+# Seconds before a gogcli command is killed, keyed by subcommand
+COMMAND_TIMEOUTS = {
+    "gmail messages search": DEFAULT_SEARCH_TIMEOUT,
+    "gmail thread get": DEFAULT_FETCH_TIMEOUT,
+    "gmail get": DEFAULT_FETCH_TIMEOUT,
+    "gmail history": DEFAULT_FETCH_TIMEOUT,
+    "gmail labels get": DEFAULT_FETCH_TIMEOUT,
+    "auth list": 20,
+    "auth credentials": 20,
+    "version": 10,
+}
+DEFAULT_COMMAND_TIMEOUT = 60
+
+# Output larger than this is decoded in the executor instead of the event loop
+JSON_EXECUTOR_THRESHOLD = 64 * 1024
 
 def get_binary_path(hass: HomeAssistant) -> str:
     """Return the path to the gogcli binary."""
     return hass.config.path("custom_components/gogcli/bin/gog")
 
+def get_archive_dir(hass: HomeAssistant) -> str:
+    """Return the directory holding gogcli release archives."""
+    return hass.config.path(".storage/gogcli/archives")
+
+def command_name(args: tuple[str, ...] | list[str]) -> str:
+    """Return the gogcli subcommand, without its arguments, for a command line."""
+    for length in (3, 2, 1):
+        name = " ".join(args[:length])
+        if name in COMMAND_TIMEOUTS:
+            return name
+    return args[0] if args else ""
+
+async def kill_process(proc: asyncio.subprocess.Process) -> None:
+    """Kill a gogcli process and its process group, then reap it."""
+    if proc.returncode is None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            # No process groups (Windows) or the group is already gone
+            try:
+                proc.kill()
+            except ProcessLookupError:
+                pass
+    await proc.wait()
+
 async def check_binary(path: str) -> str | None:
     """Check if the binary exists and return its version."""
     if not os.path.exists(path):
@@ -37,14 +105,72 @@ async def check_binary(path: str) -> str | None:
             "version",
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
         )
-        stdout, _ = await proc.communicate()
+        try:
+            stdout, _ = await asyncio.wait_for(proc.communicate(), COMMAND_TIMEOUTS["version"])
+        except asyncio.TimeoutError:
+            await kill_process(proc)
+            _LOGGER.warning("Timed out checking gogcli version at %s", path)
+            return None
         if proc.returncode == 0:
             return stdout.decode().strip()
     except OSError:
         pass
     return None
 
+class GogBinaryManager:
+    """Check and install the gogcli binary once for all config entries.
+
+    Version checks are cached by file path, mtime and size, so entries that
+    load together share one `gog version` run and at most one install.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._versions: dict[str, tuple[tuple[int, int], str]] = {}
+        self._check_lock = asyncio.Lock()
+        self._install_lock = asyncio.Lock()
+
+    def _file_key(self, path: str) -> tuple[int, int] | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    async def async_get_version(self, path: str) -> str | None:
+        """Return the version of the binary at path, or None if it does not run."""
+        async with self._check_lock:
+            if (key := self._file_key(path)) is None:
+                return None
+            if (cached := self._versions.get(path)) and cached[0] == key:
+                return cached[1]
+
+            # Failures are not cached so a hung check is retried next time
+            if version := await check_binary(path):
+                self._versions[path] = (key, version)
+            return version
+
+    async def async_ensure_binary(self) -> str:
+        """Return the path to a working binary, installing it if needed."""
+        path = get_binary_path(self.hass)
+        if await self.async_get_version(path):
+            return path
+
+        async with self._install_lock:
+            # Another entry may have installed it while we waited
+            if not await self.async_get_version(path):
+                await install_binary(self.hass)
+        return path
+
+def get_binary_manager(hass: HomeAssistant) -> GogBinaryManager:
+    """Return the binary manager shared by all config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_BINARY not in domain_data:
+        domain_data[DATA_BINARY] = GogBinaryManager(hass)
+    return domain_data[DATA_BINARY]
+
 def _get_system_info() -> tuple[str, str, str]:
     """Get OS and architecture info mapped to gogcli release names."""
     system = platform.system().lower()
@@ -69,61 +195,140 @@ def _get_system_info() -> tuple[str, str, str]:
     ext = "zip" if os_name == "windows" else "tar.gz"
     return os_name, arch, ext
 
-def _install_binary_sync(content: bytes, ext: str, target_path: str) -> None:
-    """Synchronous helper to extract and write binary."""
-    if ext == "tar.gz":
-        with tarfile.open(fileobj=BytesIO(content), mode="r:gz") as tar:
-            binary_member = None
-            for member in tar.getmembers():
-                if member.name.endswith("gogcli") or member.name.endswith("gogcli.exe") or member.name.endswith("gog") or member.name.endswith("gog.exe"):
-                    binary_member = member
-                    break
-            
-            if not binary_member:
-                raise RuntimeError("Could not find gogcli binary in archive")
-            
-            f = tar.extractfile(binary_member)
-            with open(target_path, "wb") as out:
-                out.write(f.read())
-
-    elif ext == "zip":
-        with zipfile.ZipFile(BytesIO(content)) as zip_ref:
-            binary_name = None
-            for name in zip_ref.namelist():
-                if name.endswith("gogcli.exe") or name.endswith("gogcli") or name.endswith("gog.exe") or name.endswith("gog"):
-                    binary_name = name
-                    break
-            
-            if not binary_name:
-                raise RuntimeError("Could not find gogcli binary in archive")
-            
-            with zip_ref.open(binary_name) as source, open(target_path, "wb") as target:
-                target.write(source.read())
+def _is_binary_name(name: str) -> bool:
+    return name.endswith(("gogcli", "gogcli.exe", "gog", "gog.exe"))
+
+def _extract_binary_sync(archive_path: str, ext: str, target_path: str) -> None:
+    """Stream the binary out of an archive and swap it in atomically."""
+    tmp_path = f"{target_path}.new"
+    try:
+        if ext == "tar.gz":
+            with tarfile.open(archive_path, mode="r:gz") as tar:
+                member = next(
+                    (m for m in tar if m.isfile() and _is_binary_name(m.name)), None
+                )
+                if not member:
+                    raise RuntimeError("Could not find gogcli binary in archive")
+                with tar.extractfile(member) as source, open(tmp_path, "wb") as target:
+                    shutil.copyfileobj(source, target, DOWNLOAD_CHUNK_SIZE)
+
+        elif ext == "zip":
+            with zipfile.ZipFile(archive_path) as zip_ref:
+                name = next((n for n in zip_ref.namelist() if _is_binary_name(n)), None)
+                if not name:
+                    raise RuntimeError("Could not find gogcli binary in archive")
+                with zip_ref.open(name) as source, open(tmp_path, "wb") as target:
+                    shutil.copyfileobj(source, target, DOWNLOAD_CHUNK_SIZE)
+
+        # Make executable
+        st = os.stat(tmp_path)
+        os.chmod(tmp_path, st.st_mode | stat.S_IEXEC)
+        os.replace(tmp_path, target_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def _file_sha256_sync(path: str) -> str:
+    """Hash a file without reading it into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(DOWNLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _read_checksum_sync(checksums_path: str, archive_name: str) -> str | None:
+    """Return the SHA-256 listed for archive_name in a checksums.txt file."""
+    if not os.path.exists(checksums_path):
+        return None
+    with open(checksums_path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2 and parts[1].lstrip("*") == archive_name:
+                return parts[0].lower()
+    return None
 
-    # Make executable
-    st = os.stat(target_path)
-    os.chmod(target_path, st.st_mode | stat.S_IEXEC)
+def _prune_archives_sync(archive_dir: str, keep: set[str]) -> None:
+    """Remove cached archives of other gogcli versions."""
+    for name in os.listdir(archive_dir):
+        if name not in keep and name.startswith("gogcli_"):
+            os.remove(os.path.join(archive_dir, name))
+
+async def _download(session: aiohttp.ClientSession, hass: HomeAssistant, url: str, path: str) -> None:
+    """Stream url to path through a temporary file."""
+    tmp_path = f"{path}.part"
+    try:
+        async with session.get(url) as response:
+            if response.status != 200:
+                raise RuntimeError(f"Failed to download gogcli: {response.status}")
+            f = await hass.async_add_executor_job(open, tmp_path, "wb")
+            try:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    await hass.async_add_executor_job(f.write, chunk)
+            finally:
+                await hass.async_add_executor_job(f.close)
+        await hass.async_add_executor_job(os.replace, tmp_path, path)
+    finally:
+        if await hass.async_add_executor_job(os.path.exists, tmp_path):
+            await hass.async_add_executor_job(os.remove, tmp_path)
 
 async def install_binary(hass: HomeAssistant, version: str = GOGCLI_VERSION) -> str:
-    """Download and install the gogcli binary."""
+    """Install the gogcli binary from the archive cache, downloading it if needed.
+
+    A release archive placed in the archive directory is used without any
+    network access. Downloads are verified against the release checksums and
+    kept there, so a reinstall does not download again. Without a checksum
+    the install fails, unless the archive was placed by the user and an
+    ALLOW_UNVERIFIED file next to it allows that.
+    """
     os_name, arch, ext = _get_system_info()
-    url = GITHUB_RELEASE_URL.format(version=version, os=os_name, arch=arch, ext=ext)
-    
+    archive_name = ARCHIVE_NAME.format(version=version, os=os_name, arch=arch, ext=ext)
+    archive_dir = get_archive_dir(hass)
+    archive_path = os.path.join(archive_dir, archive_name)
+    checksums_path = os.path.join(archive_dir, CHECKSUMS_NAME.format(version=version))
+
     target_path = get_binary_path(hass)
     target_dir = os.path.dirname(target_path)
-    os.makedirs(target_dir, exist_ok=True)
+    await hass.async_add_executor_job(os.makedirs, target_dir, 0o777, True)
+    await hass.async_add_executor_job(os.makedirs, archive_dir, 0o777, True)
 
-    _LOGGER.info("Downloading gogcli from %s", url)
+    downloaded = False
+    if await hass.async_add_executor_job(os.path.exists, archive_path):
+        _LOGGER.info("Installing gogcli from cached archive %s", archive_path)
+    else:
+        url = GITHUB_RELEASE_URL.format(version=version, os=os_name, arch=arch, ext=ext)
+        _LOGGER.info("Downloading gogcli from %s", url)
+        async with aiohttp.ClientSession() as session:
+            # Nothing is downloaded that cannot be verified
+            await _download(
+                session, hass, GITHUB_CHECKSUMS_URL.format(version=version), checksums_path
+            )
+            await _download(session, hass, url, archive_path)
+        downloaded = True
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                raise RuntimeError(f"Failed to download gogcli: {response.status}")
-            content = await response.read()
+    expected = await hass.async_add_executor_job(_read_checksum_sync, checksums_path, archive_name)
+    if expected:
+        actual = await hass.async_add_executor_job(_file_sha256_sync, archive_path)
+        if actual != expected:
+            await hass.async_add_executor_job(os.remove, archive_path)
+            raise RuntimeError(
+                f"Checksum mismatch for {archive_name}: expected {expected}, got {actual}"
+            )
+    elif not downloaded and await hass.async_add_executor_job(
+        os.path.exists, os.path.join(archive_dir, ALLOW_UNVERIFIED_NAME)
+    ):
+        _LOGGER.warning("No checksum found for %s, installing it unverified as allowed", archive_name)
+    else:
+        if downloaded:
+            await hass.async_add_executor_job(os.remove, archive_path)
+        raise RuntimeError(
+            f"No checksum found for {archive_name} in {os.path.basename(checksums_path)}"
+        )
 
     _LOGGER.info("Extracting gogcli to %s", target_path)
-    
-    await hass.async_add_executor_job(_install_binary_sync, content, ext, target_path)
+    await hass.async_add_executor_job(_extract_binary_sync, archive_path, ext, target_path)
+    await hass.async_add_executor_job(
+        _prune_archives_sync, archive_dir, {archive_name, os.path.basename(checksums_path)}
+    )
 
     return target_path
 
@@ -138,8 +343,13 @@ def _get_config_path(config_dir: str) -> str:
         # Linux/Unix
         return os.path.join(config_dir, ".config", "gogcli", "config.json")
 
-def sync_config(hass: HomeAssistant, config_dir: str):
-    """Sync gogcli.yaml to config.json."""
+def sync_config(hass: HomeAssistant, config_dir: str) -> bool:
+    """Sync gogcli.yaml to config.json.
+
+    The file is only rewritten when its content changes, and is replaced
+    atomically so running gogcli processes never read a partial file.
+    Returns True when config.json was written.
+    """
     yaml_path = hass.config.path(GOG_YAML_CONFIG)
     
     config_data = {}
@@ -149,45 +359,271 @@ def sync_config(hass: HomeAssistant, config_dir: str):
                 config_data = yaml.safe_load(f) or {}
         except Exception as e:
             _LOGGER.error("Error reading %s: %s", yaml_path, e)
-            return
+            return False
 
     # Ensure config data is a dict
     if not isinstance(config_data, dict):
         _LOGGER.error("%s must be a dictionary", GOG_YAML_CONFIG)
-        return
+        return False
 
+    content = json.dumps(config_data, indent=2).encode()
     target_json = _get_config_path(config_dir)
+
+    try:
+        with open(target_json, "rb") as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(content).digest():
+                return False
+    except OSError:
+        pass
+
     os.makedirs(os.path.dirname(target_json), exist_ok=True)
-    
+    tmp_path = f"{target_json}.tmp"
     try:
-        with open(target_json, "w") as f:
-            json.dump(config_data, f, indent=2)
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, target_json)
     except Exception as e:
         _LOGGER.error("Error writing config.json: %s", e)
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+class GogConfigSync:
+    """Keep the config.json of every gogcli config dir in line with gogcli.yaml.
+
+    Each config dir is synced once when its first entry loads. After that
+    gogcli.yaml is polled for changes, which apply without a reload since
+    gogcli reads config.json on every run.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._config_dirs: set[str] = set()
+        self._yaml_key: tuple[int, int] | None = None
+        self._lock = asyncio.Lock()
+        self._unsub: CALLBACK_TYPE | None = None
+
+    def _get_yaml_key(self) -> tuple[int, int] | None:
+        try:
+            st = os.stat(self.hass.config.path(GOG_YAML_CONFIG))
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    async def async_add_config_dir(self, config_dir: str) -> None:
+        """Sync a config dir unless it is already being kept in sync."""
+        async with self._lock:
+            if config_dir in self._config_dirs:
+                return
+            self._config_dirs.add(config_dir)
+            await self._async_sync({config_dir})
+
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(
+                self.hass, self._async_check, timedelta(seconds=CONFIG_WATCH_INTERVAL)
+            )
+
+    async def _async_check(self, now: datetime | None = None) -> None:
+        """Sync every config dir if gogcli.yaml changed."""
+        async with self._lock:
+            await self._async_sync(set())
+
+    async def _async_sync(self, config_dirs: set[str]) -> None:
+        key = await self.hass.async_add_executor_job(self._get_yaml_key)
+        if key != self._yaml_key:
+            if self._yaml_key is not None:
+                _LOGGER.info("%s changed, syncing gogcli config", GOG_YAML_CONFIG)
+            self._yaml_key = key
+            config_dirs = self._config_dirs
+        for config_dir in config_dirs:
+            await self.hass.async_add_executor_job(sync_config, self.hass, config_dir)
+
+    def async_stop(self) -> None:
+        """Stop watching gogcli.yaml once no entry is loaded."""
+        if self._unsub:
+            self._unsub()
+            self._unsub = None
+        self._config_dirs.clear()
+        self._yaml_key = None
+
+def get_config_sync(hass: HomeAssistant) -> GogConfigSync:
+    """Return the config sync shared by all config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_CONFIG_SYNC not in domain_data:
+        domain_data[DATA_CONFIG_SYNC] = GogConfigSync(hass)
+    return domain_data[DATA_CONFIG_SYNC]
+
+class GogTimeoutError(RuntimeError):
+    """Error to indicate a gogcli command did not finish in time."""
+
+class HistoryExpired(RuntimeError):
+    """Error to indicate the start historyId is too old to sync from."""
+
+class ThreadCache:
+    """LRU cache of thread summaries keyed by thread ID and a change key.
+
+    The change key is the historyId of the message that referenced the
+    thread. A reply added to a thread does not change that message, so the
+    coordinator evicts threads that history shows gained a message and
+    clears the cache on every full sync. Entries also expire after
+    THREAD_CACHE_TTL seconds as a safety net.
+    Only message IDs and labels are kept; that is all the reply check needs.
+    """
+
+    def __init__(self, max_size: int = THREAD_CACHE_SIZE, ttl: float = THREAD_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.dirty = False
+        self._entries: OrderedDict[str, tuple[str, float, dict]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, thread_id: str, key: str) -> dict | None:
+        """Return the cached thread if its key matches and it has not expired."""
+        entry = self._entries.get(thread_id)
+        if entry is None or entry[0] != key or time.time() - entry[1] > self.ttl:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(thread_id)
+        self.hits += 1
+        return entry[2]
+
+    def set(self, thread_id: str, key: str, thread: dict) -> dict:
+        """Store a summary of the thread and return it."""
+        summary = {
+            "id": thread.get("id", thread_id),
+            "historyId": thread.get("historyId"),
+            "messages": [
+                {"id": msg.get("id"), "labelIds": msg.get("labelIds", [])}
+                for msg in thread.get("messages", [])
+            ],
+        }
+        self._entries[thread_id] = (key, time.time(), summary)
+        self._entries.move_to_end(thread_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        self.dirty = True
+        return summary
+
+    def invalidate(self, thread_id: str) -> None:
+        """Drop a thread from the cache."""
+        if self._entries.pop(thread_id, None) is not None:
+            self.dirty = True
+
+    def clear(self) -> None:
+        """Drop every thread from the cache."""
+        if self._entries:
+            self._entries.clear()
+            self.dirty = True
+
+    def as_dict(self) -> dict:
+        """Return the cache contents in a JSON serializable form."""
+        self.dirty = False
+        return {
+            "threads": [
+                [thread_id, key, stored_at, summary]
+                for thread_id, (key, stored_at, summary) in self._entries.items()
+            ]
+        }
+
+    def load(self, data: dict) -> None:
+        """Restore cache contents saved by as_dict."""
+        for thread_id, key, stored_at, summary in data.get("threads", []):
+            self._entries[thread_id] = (key, stored_at, summary)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
 
 class GogWrapper:
     """Wrapper for gogcli commands."""
     
-    def __init__(self, executable_path: str, config_dir: str | None = None):
+    def __init__(
+        self,
+        executable_path: str,
+        config_dir: str | None = None,
+        scheduler: GogScheduler | None = None,
+        timeouts: dict[str, float] | None = None,
+    ):
         self.executable_path = executable_path
         self.config_dir = config_dir
+        self.scheduler = scheduler
+        self.timeouts = {**COMMAND_TIMEOUTS, **(timeouts or {})}
+        self.timed_out: Counter[str] = Counter()
+        self.metrics = GogMetrics()
+        self.breaker = GogCircuitBreaker()
+        self.thread_cache = ThreadCache()
+
+    async def _run(self, *args, priority: int = PRIORITY_BACKGROUND) -> tuple[int, bytes, bytes]:
+        if self.scheduler is None:
+            return await self._spawn(*args)
+
+        async with self.scheduler.slot(priority):
+            return await self._spawn(*args)
+
+    async def _spawn(self, *args) -> tuple[int, bytes, bytes]:
+        name = command_name(args)
+        # Only Gmail API calls trip the breaker; checked once a slot is free,
+        # so queued calls see a circuit opened while they waited
+        guarded = name.startswith("gmail")
+        if guarded:
+            self.breaker.check()
 
-    async def _run(self, *args) -> tuple[int, bytes, bytes]:
         env = os.environ.copy()
         if self.config_dir:
             env["HOME"] = self.config_dir
             env["XDG_CONFIG_HOME"] = os.path.join(self.config_dir, ".config")
         
+        timeout = self.timeouts.get(name, DEFAULT_COMMAND_TIMEOUT)
+
+        start = time.monotonic()
+        # A new session puts gogcli and anything it starts in its own process group
         proc = await asyncio.create_subprocess_exec(
             self.executable_path,
             *args,
             env=env,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
         )
-        stdout, stderr = await proc.communicate()
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            await kill_process(proc)
+            self.timed_out[name] += 1
+            self.metrics.record_run(name, time.monotonic() - start, None, 0, args)
+            if guarded:
+                self.breaker.record_failure(ERROR_NETWORK, f"{name} timed out")
+            raise GogTimeoutError(f"gogcli {name} timed out after {timeout}s") from None
+        except asyncio.CancelledError:
+            await kill_process(proc)
+            raise
+        self.metrics.record_run(name, time.monotonic() - start, proc.returncode, len(stdout), args)
+        if guarded:
+            self._record_outcome(proc.returncode, stderr)
         return proc.returncode, stdout, stderr
 
+    def _record_outcome(self, code: int, stderr: bytes) -> None:
+        """Close the breaker on success, open it on a recognised failure."""
+        if code == 0:
+            self.breaker.record_success()
+            return
+        error = stderr.decode(errors="replace")
+        if kind := classify_error(error):
+            self.breaker.record_failure(kind, error)
+
+    async def _loads(self, name: str, stdout: bytes):
+        """Decode JSON output, off the event loop when it is large."""
+        start = time.monotonic()
+        try:
+            if len(stdout) > JSON_EXECUTOR_THRESHOLD:
+                return await asyncio.get_running_loop().run_in_executor(None, json.loads, stdout)
+            return json.loads(stdout)
+        finally:
+            self.metrics.record_parse(name, time.monotonic() - start, len(stdout))
+
     async def version(self) -> str:
         code, stdout, _ = await self._run("version")
         if code != 0:
@@ -215,20 +651,78 @@ class GogWrapper:
             raise RuntimeError(f"Failed to search messages: {stderr.decode()}")
         
         try:
-            return json.loads(stdout)
+            return await self._loads("gmail messages search", stdout)
         except json.JSONDecodeError:
             return []
 
-    async def get_thread(self, thread_id: str) -> dict:
-        code, stdout, stderr = await self._run("gmail", "thread", "get", thread_id, "--json")
+    async def get_message(self, message_id: str) -> dict:
+        code, stdout, stderr = await self._run("gmail", "get", message_id, "--json")
+        if code != 0:
+            raise RuntimeError(f"Failed to get message {message_id}: {stderr.decode()}")
+
+        try:
+            return await self._loads("gmail get", stdout)
+        except json.JSONDecodeError:
+            return {}
+
+    async def list_history(self, start_history_id: str) -> dict:
+        """List mailbox changes since start_history_id."""
+        code, stdout, stderr = await self._run(
+            "gmail", "history", f"--since={start_history_id}", "--json"
+        )
+        if code != 0:
+            error = stderr.decode()
+            # Gmail answers 404 once the start historyId has been purged
+            if "404" in error or "not found" in error.lower():
+                raise HistoryExpired(f"History {start_history_id} expired: {error}")
+            raise RuntimeError(f"Failed to list history: {error}")
+
+        try:
+            return await self._loads("gmail history", stdout)
+        except json.JSONDecodeError:
+            return {}
+
+    async def get_label(self, label: str) -> dict:
+        """Get a label with its message and unread counts."""
+        code, stdout, stderr = await self._run("gmail", "labels", "get", label, "--json")
+        if code != 0:
+            raise RuntimeError(f"Failed to get label {label}: {stderr.decode()}")
+
+        try:
+            return await self._loads("gmail labels get", stdout)
+        except json.JSONDecodeError:
+            return {}
+
+    async def get_thread(
+        self,
+        thread_id: str,
+        cache_key: str | None = None,
+        priority: int = PRIORITY_BACKGROUND,
+    ) -> dict:
+        """Get a thread.
+
+        When cache_key is given the thread summary is served from, and stored
+        in, the thread cache instead of returning the full payload.
+        """
+        if cache_key is not None:
+            if (cached := self.thread_cache.get(thread_id, cache_key)) is not None:
+                return cached
+
+        code, stdout, stderr = await self._run(
+            "gmail", "thread", "get", thread_id, "--json", priority=priority
+        )
         if code != 0:
             raise RuntimeError(f"Failed to get thread {thread_id}: {stderr.decode()}")
         
         try:
-            return json.loads(stdout)
+            thread = await self._loads("gmail thread get", stdout)
         except json.JSONDecodeError:
             return {}
 
+        if cache_key is not None:
+            return self.thread_cache.set(thread_id, cache_key, thread)
+        return thread
+
     async def start_auth(self, account: str) -> asyncio.subprocess.Process:
         """Start the interactive auth process."""
         env = os.environ.copy()
@@ -0,0 +1,87 @@
+"""Webhook that lets an external notifier trigger a refresh."""
+from __future__ import annotations
+
+import base64
+import json
+import logging
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import GogGmailCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+def parse_hint(payload: Any) -> tuple[str | None, str | None]:
+    """Return the history ID and message ID hinted at by a payload.
+
+    Accepts {"history_id": ..., "message_id": ...} as well as a Gmail
+    Pub/Sub push, whose base64 data holds {"emailAddress", "historyId"}.
+    """
+    if not isinstance(payload, dict):
+        return None, None
+    if isinstance(message := payload.get("message"), dict) and "data" in message:
+        try:
+            payload = json.loads(base64.b64decode(message["data"]))
+        except (ValueError, TypeError):
+            return None, None
+        if not isinstance(payload, dict):
+            return None, None
+    history_id = payload.get("history_id", payload.get("historyId"))
+    message_id = payload.get("message_id", payload.get("messageId"))
+    return (
+        str(history_id) if history_id is not None else None,
+        str(message_id) if message_id is not None else None,
+    )
+
+@callback
+def async_register_webhook(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: GogGmailCoordinator,
+    webhook_id: str,
+) -> None:
+    """Register the webhook of a config entry until it is unloaded."""
+
+    async def handle_webhook(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> None:
+        """Refresh the account unless the hint names mail it already holds."""
+        body = await request.read()
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            payload = None
+        history_id, message_id = parse_hint(payload)
+
+        coordinator.webhook_calls += 1
+        if coordinator.has_seen(history_id, message_id):
+            coordinator.webhook_skipped += 1
+            return
+
+        # Answer the notifier straight away; bursts share one debounced refresh
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_request_refresh(),
+            f"{DOMAIN} webhook refresh {entry.entry_id}",
+        )
+        entry.async_create_background_task(
+            hass,
+            coordinator.label_coordinator.async_request_refresh(),
+            f"{DOMAIN} webhook label refresh {entry.entry_id}",
+        )
+
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        f"gogcli {entry.title}",
+        webhook_id,
+        handle_webhook,
+        allowed_methods=[webhook.METH_POST],
+    )
+    entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
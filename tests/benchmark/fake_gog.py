@@ -0,0 +1,130 @@
+"""A fake gog executable serving a synthetic mailbox.
+
+The mailbox is shaped by environment variables, so it can be changed
+between refreshes without restarting anything:
+
+FAKE_GOG_INBOX_SIZE   messages in the INBOX (default 50)
+FAKE_GOG_ARRIVED      messages delivered since the start (default 0)
+FAKE_GOG_BODY_SIZE    characters in each text and HTML body (default 2000)
+FAKE_GOG_THREAD_DEPTH messages in each thread (default 3)
+FAKE_GOG_LATENCY      seconds to sleep before answering (default 0)
+FAKE_GOG_FAILURE_RATE chance of failing a gmail command (default 0)
+"""
+from __future__ import annotations
+
+import base64
+import json
+import os
+import random
+import sys
+import time
+
+BASE_HISTORY_ID = 1000
+BASE_DATE = 1_700_000_000_000
+
+def _env(name: str, default: float) -> float:
+    return float(os.environ.get(f"FAKE_GOG_{name}", default))
+
+def _encode(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+def mailbox_size() -> int:
+    """Return how many messages have ever been delivered."""
+    return int(_env("INBOX_SIZE", 50)) + int(_env("ARRIVED", 0))
+
+def newest_first() -> range:
+    """Return the indices of the INBOX messages, newest first."""
+    total = mailbox_size()
+    return range(total - 1, total - 1 - int(_env("INBOX_SIZE", 50)), -1)
+
+def message(index: int, include_body: bool = True) -> dict:
+    """Build message number index."""
+    result = {
+        "id": f"m{index}",
+        "threadId": f"t{index}",
+        "historyId": str(BASE_HISTORY_ID + index),
+        "internalDate": str(BASE_DATE + index * 60_000),
+        "labelIds": ["INBOX", "UNREAD"] if index % 2 else ["INBOX"],
+        "snippet": f"Snippet of message {index}",
+    }
+    if not include_body:
+        return result
+
+    body_size = int(_env("BODY_SIZE", 2000))
+    text = (f"Body of message {index}. " * (body_size // 20 + 1))[:body_size]
+    result["payload"] = {
+        "mimeType": "multipart/alternative",
+        "headers": [
+            {"name": "From", "value": f"Sender {index} <sender{index}@example.com>"},
+            {"name": "To", "value": "Me <me@example.com>"},
+            {"name": "Subject", "value": f"Subject {index}"},
+            {"name": "Date", "value": "Mon, 02 Feb 2026 12:00:00 +0000"},
+        ],
+        "parts": [
+            {"mimeType": "text/plain", "body": {"data": _encode(text)}},
+            {"mimeType": "text/html", "body": {"data": _encode(f"<p>{text}</p>")}},
+        ],
+    }
+    return result
+
+def thread(thread_id: str) -> dict:
+    """Build a thread; every other thread ends with our reply."""
+    index = int(thread_id.lstrip("t"))
+    messages = [message(index)]
+    for depth in range(1, int(_env("THREAD_DEPTH", 3))):
+        reply = message(index)
+        reply["id"] = f"m{index}r{depth}"
+        reply["labelIds"] = ["SENT"] if index % 2 == 0 else ["INBOX"]
+        messages.append(reply)
+    return {"id": thread_id, "historyId": str(BASE_HISTORY_ID + index), "messages": messages}
+
+def history(since: int) -> dict:
+    """List the messages delivered after since."""
+    records = [
+        {"messagesAdded": [{"message": message(index, include_body=False)}]}
+        for index in range(mailbox_size())
+        if BASE_HISTORY_ID + index > since
+    ]
+    return {"history": records, "historyId": str(BASE_HISTORY_ID + mailbox_size() - 1)}
+
+def _option(args: list[str], name: str) -> str | None:
+    for arg in args:
+        if arg.startswith(f"--{name}="):
+            return arg.split("=", 1)[1]
+    return None
+
+def main(args: list[str]) -> int:
+    """Answer one gog command line."""
+    if latency := _env("LATENCY", 0):
+        time.sleep(latency)
+
+    if args[:1] == ["version"]:
+        print("v0.9.0 (fake)")
+        return 0
+    if args[:2] == ["auth", "list"]:
+        print(json.dumps([{"email": "me@example.com"}]))
+        return 0
+
+    if random.random() < _env("FAILURE_RATE", 0):
+        print("simulated gogcli failure", file=sys.stderr)
+        return 1
+
+    if args[:3] == ["gmail", "messages", "search"]:
+        limit = int(_option(args, "max") or 10)
+        include_body = "--include-body" in args
+        result = [message(index, include_body) for index in newest_first()[:limit]]
+    elif args[:2] == ["gmail", "get"]:
+        result = message(int(args[2].lstrip("m")))
+    elif args[:3] == ["gmail", "thread", "get"]:
+        result = thread(args[3])
+    elif args[:2] == ["gmail", "history"]:
+        result = history(int(_option(args, "since")))
+    else:
+        print(f"unknown command: {' '.join(args)}", file=sys.stderr)
+        return 2
+
+    json.dump(result, sys.stdout)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,208 @@
+"""Offline benchmark harness for the gogcli integration.
+
+Drives GogWrapper and GogGmailCoordinator against the fake gog executable
+and reports refresh latency, process spawns, peak RSS, event loop blocking
+and sensor state writes.
+
+    python -m tests.benchmark --inbox-size 200 --body-size 50000 --refreshes 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from custom_components.gogcli.const import (
+    CONF_ACCOUNT,
+    CONF_CONFIG_DIR,
+    CONF_GOG_PATH,
+    DATA_SCHEDULER,
+    DOMAIN,
+    MAX_MESSAGES,
+)
+from custom_components.gogcli.coordinator import GogGmailCoordinator
+from custom_components.gogcli.scheduler import GogScheduler
+from custom_components.gogcli.sensor import GogGmailLastUpdateSensor, GogGmailSensor
+from custom_components.gogcli.utils import command_name
+
+FAKE_GOG = Path(__file__).with_name("fake_gog.py")
+
+# Event loop stalls shorter than this are scheduling noise
+BLOCKING_THRESHOLD = 0.01
+LOOP_PROBE_INTERVAL = 0.005
+
+@dataclass
+class BenchmarkConfig:
+    """Shape of the synthetic mailbox and of the run."""
+
+    inbox_size: int = 50
+    body_size: int = 2000
+    thread_depth: int = 3
+    latency: float = 0.0
+    failure_rate: float = 0.0
+    arrivals_per_refresh: int = 0
+    refreshes: int = 5
+    max_processes: int = 4
+
+@dataclass
+class BenchmarkResult:
+    """Measurements of one run."""
+
+    refresh_seconds: list[float] = field(default_factory=list)
+    failed_refreshes: int = 0
+    spawns: Counter[str] = field(default_factory=Counter)
+    spawns_per_refresh: list[int] = field(default_factory=list)
+    state_writes: int = 0
+    state_writes_per_refresh: list[int] = field(default_factory=list)
+    max_loop_block: float = 0.0
+    total_loop_block: float = 0.0
+    peak_rss_kib: int = 0
+    peak_child_rss_kib: int = 0
+
+    def report(self, config: BenchmarkConfig) -> str:
+        """Format the result as plain text."""
+        steady = self.refresh_seconds[1:] or self.refresh_seconds
+        lines = [f"config: {asdict(config)}"]
+        lines.append(f"first refresh: {self.refresh_seconds[0] * 1000:.1f} ms")
+        lines.append(
+            f"later refreshes: mean {statistics.mean(steady) * 1000:.1f} ms, "
+            f"max {max(steady) * 1000:.1f} ms"
+        )
+        lines.append(f"failed refreshes: {self.failed_refreshes}")
+        lines.append(f"process spawns: {sum(self.spawns.values())} {dict(self.spawns)}")
+        lines.append(f"spawns per refresh: {self.spawns_per_refresh}")
+        lines.append(f"state writes: {self.state_writes} {self.state_writes_per_refresh}")
+        lines.append(
+            f"event loop blocking: max {self.max_loop_block * 1000:.1f} ms, "
+            f"total {self.total_loop_block * 1000:.1f} ms"
+        )
+        lines.append(f"peak RSS: {self.peak_rss_kib} KiB (gog processes {self.peak_child_rss_kib} KiB)")
+        return "\n".join(lines)
+
+def make_fake_gog(directory: str) -> str:
+    """Write a gog launcher that runs the fake with this interpreter."""
+    path = os.path.join(directory, "gog")
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_GOG}" "$@"\n')
+    os.chmod(path, 0o755)
+    return path
+
+def fake_gog_env(config: BenchmarkConfig, arrived: int = 0) -> dict[str, str]:
+    """Return the environment that shapes the fake mailbox."""
+    return {
+        "FAKE_GOG_INBOX_SIZE": str(config.inbox_size),
+        "FAKE_GOG_ARRIVED": str(arrived),
+        "FAKE_GOG_BODY_SIZE": str(config.body_size),
+        "FAKE_GOG_THREAD_DEPTH": str(config.thread_depth),
+        "FAKE_GOG_LATENCY": str(config.latency),
+        "FAKE_GOG_FAILURE_RATE": str(config.failure_rate),
+    }
+
+def make_coordinator(gog_path: str, config_dir: str, config: BenchmarkConfig) -> GogGmailCoordinator:
+    """Build a coordinator on a minimal Home Assistant stand-in."""
+    loop = asyncio.get_running_loop()
+    hass = MagicMock()
+    hass.data = {DOMAIN: {DATA_SCHEDULER: GogScheduler(config.max_processes)}}
+    hass.async_add_executor_job = lambda func, *args: loop.run_in_executor(None, func, *args)
+
+    entry = MagicMock()
+    entry.entry_id = "benchmark"
+    entry.data = {CONF_GOG_PATH: gog_path, CONF_CONFIG_DIR: config_dir, CONF_ACCOUNT: "me@example.com"}
+    entry.options = {}
+
+    coordinator = GogGmailCoordinator(hass, entry)
+    coordinator._thread_store = MagicMock(async_load=AsyncMock(return_value=None))
+    coordinator._snapshot_store = MagicMock(async_load=AsyncMock(return_value=None))
+    return coordinator
+
+async def _watch_loop(result: BenchmarkResult) -> None:
+    """Measure how late the event loop wakes a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(LOOP_PROBE_INTERVAL)
+        lag = loop.time() - start - LOOP_PROBE_INTERVAL
+        result.max_loop_block = max(result.max_loop_block, lag)
+        if lag > BLOCKING_THRESHOLD:
+            result.total_loop_block += lag
+
+async def run_benchmark(config: BenchmarkConfig) -> BenchmarkResult:
+    """Run config.refreshes refreshes against the fake gog."""
+    result = BenchmarkResult()
+    saved_env = {name: os.environ.get(name) for name in fake_gog_env(config)}
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        coordinator = make_coordinator(make_fake_gog(config_dir), config_dir, config)
+
+        spawn = coordinator.wrapper._spawn
+        async def counting_spawn(*args):
+            result.spawns[command_name(args)] += 1
+            return await spawn(*args)
+        coordinator.wrapper._spawn = counting_spawn
+
+        sensors = [GogGmailSensor(coordinator, index) for index in range(MAX_MESSAGES)]
+        sensors.append(GogGmailLastUpdateSensor(coordinator))
+        writes = Counter()
+        for sensor in sensors:
+            sensor.async_write_ha_state = lambda sensor=sensor: writes.update([sensor])
+
+        watcher = asyncio.create_task(_watch_loop(result))
+        try:
+            for refresh in range(config.refreshes):
+                os.environ.update(fake_gog_env(config, refresh * config.arrivals_per_refresh))
+                spawns_before = sum(result.spawns.values())
+                writes_before = sum(writes.values())
+
+                start = time.perf_counter()
+                try:
+                    coordinator.data = await coordinator._async_update_data()
+                    coordinator.last_update_success = True
+                except UpdateFailed:
+                    result.failed_refreshes += 1
+                    coordinator.last_update_success = False
+                for sensor in sensors:
+                    sensor._handle_coordinator_update()
+                result.refresh_seconds.append(time.perf_counter() - start)
+
+                result.spawns_per_refresh.append(sum(result.spawns.values()) - spawns_before)
+                result.state_writes_per_refresh.append(sum(writes.values()) - writes_before)
+        finally:
+            watcher.cancel()
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+    result.state_writes = sum(writes.values())
+    result.peak_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result.peak_child_rss_kib = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return result
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    defaults = BenchmarkConfig()
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value)
+    parser.add_argument("--output", help="also write the report to this file")
+    args = vars(parser.parse_args(argv))
+    output = args.pop("output")
+
+    config = BenchmarkConfig(**args)
+    report = asyncio.run(run_benchmark(config)).report(config)
+    print(report)
+    if output:
+        Path(output).write_text(report + "\n", encoding="utf-8")
+    return 0
@@ -0,0 +1,39 @@
+import os
+import pytest
+from custom_components.gogcli.const import MAX_MESSAGES
+from .harness import BenchmarkConfig, run_benchmark
+
+pytestmark = pytest.mark.skipif(os.name != "posix", reason="fake gog is a shell launcher")
+
+@pytest.mark.asyncio
+async def test_idle_refreshes_spawn_one_process():
+    config = BenchmarkConfig(inbox_size=10, body_size=200, refreshes=3)
+
+    result = await run_benchmark(config)
+
+    assert result.failed_refreshes == 0
+    # One IDs-only search and a thread per message, then history only
+    assert result.spawns_per_refresh == [1 + MAX_MESSAGES, 1, 1]
+    # Only the last update sensor writes on an idle refresh
+    assert result.state_writes_per_refresh == [MAX_MESSAGES + 1, 1, 1]
+
+@pytest.mark.asyncio
+async def test_new_message_fetches_only_itself():
+    config = BenchmarkConfig(inbox_size=10, body_size=200, refreshes=2, arrivals_per_refresh=1)
+
+    result = await run_benchmark(config)
+
+    # The new message comes with its thread, which also gives its reply state
+    assert result.spawns["gmail get"] == 0
+    assert result.spawns["gmail thread get"] == MAX_MESSAGES + 1
+    # History and the thread of the new message
+    assert result.spawns_per_refresh[1] == 2
+
+@pytest.mark.asyncio
+async def test_failures_are_counted():
+    config = BenchmarkConfig(inbox_size=10, body_size=200, refreshes=2, failure_rate=1.0)
+
+    result = await run_benchmark(config)
+
+    assert result.failed_refreshes == 2
+    assert "failed refreshes: 2" in result.report(config)
@@ -0,0 +1,101 @@
+import pytest
+from unittest.mock import patch
+from custom_components.gogcli.breaker import (
+    ERROR_AUTH,
+    ERROR_NETWORK,
+    ERROR_QUOTA,
+    CircuitOpenError,
+    GogCircuitBreaker,
+    classify_error,
+)
+from custom_components.gogcli.utils import GogWrapper
+
+FAILING_SCRIPT = """#!/bin/sh
+echo "{stderr}" >&2
+exit 1
+"""
+
+def make_failing_gog(tmp_path, stderr):
+    script = tmp_path / "gog"
+    script.write_text(FAILING_SCRIPT.format(stderr=stderr))
+    script.chmod(0o755)
+    return str(script)
+
+def test_classify_error():
+    assert classify_error("googleapi: Error 429: Too many requests, rateLimitExceeded") == ERROR_QUOTA
+    assert classify_error("Quota exceeded for quota metric 'Queries'") == ERROR_QUOTA
+    assert classify_error('oauth2: cannot fetch token: 400 Bad Request "invalid_grant"') == ERROR_AUTH
+    assert classify_error("googleapi: Error 401: Request had invalid authentication credentials") == ERROR_AUTH
+    assert classify_error("dial tcp: lookup gmail.googleapis.com: no such host") == ERROR_NETWORK
+    assert classify_error("googleapi: Error 404: Requested entity was not found.") is None
+    assert classify_error("") is None
+
+def test_backoff_doubles_up_to_max():
+    breaker = GogCircuitBreaker(base_delay=60, max_delay=200)
+
+    with patch("custom_components.gogcli.breaker.time.monotonic", return_value=1000):
+        breaker.record_failure(ERROR_QUOTA, "rate limit")
+        assert breaker.is_open
+        assert breaker.retry_in == 60
+        with pytest.raises(CircuitOpenError):
+            breaker.check()
+
+    with patch("custom_components.gogcli.breaker.time.monotonic", return_value=1061):
+        assert not breaker.is_open
+        breaker.record_failure(ERROR_QUOTA, "rate limit")
+        assert breaker.retry_in == 120
+
+    with patch("custom_components.gogcli.breaker.time.monotonic", return_value=1200):
+        breaker.record_failure(ERROR_NETWORK, "no such host")
+        assert breaker.retry_in == 200
+        assert breaker.kind == ERROR_NETWORK
+
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.failures == 0
+    assert breaker.as_dict()["trips"] == 3
+    assert breaker.rejected == 1
+
+def test_failures_while_open_do_not_escalate():
+    breaker = GogCircuitBreaker(base_delay=60)
+
+    for _ in range(5):
+        breaker.record_failure(ERROR_QUOTA, "rate limit")
+
+    assert breaker.failures == 1
+    assert breaker.retry_in <= 60
+
+def test_auth_failure_stays_open():
+    breaker = GogCircuitBreaker(base_delay=1)
+    breaker.record_failure(ERROR_AUTH, "invalid_grant")
+
+    with patch("custom_components.gogcli.breaker.time.monotonic", return_value=10**9):
+        assert breaker.is_open
+        assert breaker.retry_in is None
+        with pytest.raises(CircuitOpenError, match="auth"):
+            breaker.check()
+
+@pytest.mark.asyncio
+async def test_wrapper_stops_spawning_after_quota_failure(tmp_path):
+    wrapper = GogWrapper(make_failing_gog(tmp_path, "googleapi: Error 429: rateLimitExceeded"), str(tmp_path))
+
+    with pytest.raises(RuntimeError, match="429"):
+        await wrapper.get_thread("t1")
+    with pytest.raises(CircuitOpenError):
+        await wrapper.get_thread("t2")
+
+    assert wrapper.metrics.commands["gmail thread get"].calls == 1
+    assert wrapper.breaker.kind == ERROR_QUOTA
+
+@pytest.mark.asyncio
+async def test_wrapper_ignores_unknown_and_non_gmail_failures(tmp_path):
+    wrapper = GogWrapper(make_failing_gog(tmp_path, "invalid_grant"), str(tmp_path))
+
+    with pytest.raises(RuntimeError):
+        await wrapper.list_auth()
+    assert not wrapper.breaker.is_open
+
+    wrapper.executable_path = make_failing_gog(tmp_path, "Requested entity was not found")
+    with pytest.raises(RuntimeError):
+        await wrapper.get_message("m1")
+    assert not wrapper.breaker.is_open
@@ -6,6 +6,7 @@ from custom_components.gogcli.config_flow import ConfigFlow, CONF_GOG_PATH, CONF
 @pytest.mark.asyncio
 async def test_step_user_already_authorized():
     hass = MagicMock()
+    hass.data = {}
     hass.async_add_executor_job = AsyncMock()
     hass.config.path.side_effect = lambda p: f"/mock/config/{p}"
     
@@ -14,8 +15,7 @@ async def test_step_user_already_authorized():
     
     data = {CONF_ACCOUNT: "test@gmail.com"}
 
-    with patch("custom_components.gogcli.config_flow.get_binary_path", return_value="/mock/gog"), \
-         patch("custom_components.gogcli.config_flow.check_binary", return_value="1.0.0"), \
+    with patch("custom_components.gogcli.utils.GogBinaryManager.async_ensure_binary", return_value="/mock/gog"), \
          patch("custom_components.gogcli.config_flow.sync_config"), \
          patch("custom_components.gogcli.config_flow.GogWrapper") as MockWrapper:
         
@@ -33,6 +33,7 @@ async def test_step_user_already_authorized():
 @pytest.mark.asyncio
 async def test_step_user_needs_auth():
     hass = MagicMock()
+    hass.data = {}
     hass.async_add_executor_job = AsyncMock()
     hass.config.path.return_value = "/mock/config/.storage/gogcli"
     
@@ -40,8 +41,7 @@ async def test_step_user_needs_auth():
     flow.hass = hass
     data = {CONF_ACCOUNT: "test@gmail.com"}
 
-    with patch("custom_components.gogcli.config_flow.get_binary_path", return_value="/mock/gog"), \
-         patch("custom_components.gogcli.config_flow.check_binary", return_value="1.0.0"), \
+    with patch("custom_components.gogcli.utils.GogBinaryManager.async_ensure_binary", return_value="/mock/gog"), \
          patch("custom_components.gogcli.config_flow.sync_config"), \
          patch("custom_components.gogcli.config_flow.GogWrapper") as MockWrapper:
         
@@ -0,0 +1,589 @@
+import asyncio
+import json
+import time
+import pytest
+from datetime import timedelta
+from unittest.mock import MagicMock, AsyncMock, call, patch
+from custom_components.gogcli.breaker import ERROR_AUTH, ERROR_QUOTA, CircuitOpenError, GogCircuitBreaker
+from custom_components.gogcli.coordinator import GogGmailCoordinator
+from custom_components.gogcli.const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_BODY_MODE,
+    CONF_CONFIG_DIR,
+    CONF_FETCH_TIMEOUT,
+    CONF_GOG_PATH,
+    CONF_MAX_POLLING_INTERVAL,
+    CONF_MIN_POLLING_INTERVAL,
+    CONF_POLLING_INTERVAL,
+)
+from custom_components.gogcli.utils import HistoryExpired
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+def make_message(msg_id, history_id, internal_date, labels=None, thread_id=None):
+    return {
+        "id": msg_id,
+        "threadId": thread_id or f"thread-{msg_id}",
+        "historyId": history_id,
+        "internalDate": internal_date,
+        "labelIds": labels if labels is not None else ["INBOX"],
+        "snippet": f"Snippet {msg_id}",
+        "payload": {"headers": [], "mimeType": "text/plain", "body": {"data": "Qm9keQ=="}},
+    }
+
+@pytest.fixture
+def mailbox():
+    """Messages the fake gogcli serves, newest first."""
+    return {
+        "2": make_message("2", "200", "2000"),
+        "1": make_message("1", "100", "1000"),
+    }
+
+@pytest.fixture
+def coordinator(mailbox):
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {CONF_GOG_PATH: "gog", CONF_CONFIG_DIR: "/tmp"}
+    entry.options = {}
+
+    coordinator = GogGmailCoordinator(hass, entry)
+    coordinator._thread_store = MagicMock()
+    coordinator._snapshot_store = MagicMock()
+    coordinator._thread_cache_loaded = True
+    coordinator.label_coordinator = MagicMock(async_request_refresh=AsyncMock())
+
+    wrapper = MagicMock()
+    wrapper.thread_cache = MagicMock(dirty=False)
+    wrapper.breaker = GogCircuitBreaker()
+
+    async def search_messages(query, limit=10):
+        inbox = [msg for msg in mailbox.values() if "INBOX" in msg["labelIds"]]
+        return [{"id": msg["id"], "threadId": msg["threadId"]} for msg in inbox][:limit]
+
+    async def get_thread(thread_id, cache_key=None):
+        messages = [msg for msg in mailbox.values() if msg["threadId"] == thread_id]
+        return {"id": thread_id, "messages": messages}
+
+    wrapper.search_messages = AsyncMock(side_effect=search_messages)
+    wrapper.list_history = AsyncMock(return_value={"history": [], "historyId": "300"})
+    wrapper.get_message = AsyncMock()
+    wrapper.get_thread = AsyncMock(side_effect=get_thread)
+    wrapper.mailbox = mailbox
+    coordinator.wrapper = wrapper
+    return coordinator
+
+async def refresh(coordinator):
+    coordinator.data = await coordinator._async_update_data()
+    return coordinator.data
+
+@pytest.mark.asyncio
+async def test_first_refresh_is_full_sync(coordinator):
+    data = await refresh(coordinator)
+
+    assert [msg.id for msg in data] == ["2", "1"]
+    assert coordinator._history_id == "200"
+    # Parsing runs in the executor, not on the event loop
+    coordinator.hass.async_add_executor_job.assert_called_once()
+    coordinator.wrapper.list_history.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_idle_inbox_uses_history_only(coordinator):
+    await refresh(coordinator)
+    coordinator.wrapper.search_messages.reset_mock()
+
+    data = await refresh(coordinator)
+
+    coordinator.wrapper.list_history.assert_called_once_with("200")
+    coordinator.wrapper.search_messages.assert_not_called()
+    coordinator.wrapper.get_message.assert_not_called()
+    assert [msg.id for msg in data] == ["2", "1"]
+    assert coordinator._history_id == "300"
+
+@pytest.mark.asyncio
+async def test_delta_fetches_only_new_messages(coordinator):
+    await refresh(coordinator)
+    coordinator.wrapper.search_messages.reset_mock()
+    coordinator.wrapper.list_history.return_value = {
+        "historyId": "400",
+        "history": [
+            {"messagesAdded": [{"message": {"id": "3", "threadId": "thread-1", "labelIds": ["INBOX", "UNREAD"]}}]},
+            {"labelsRemoved": [{"message": {"id": "1", "labelIds": ["INBOX"]}, "labelIds": ["UNREAD"]}]},
+        ],
+    }
+    coordinator.wrapper.mailbox["3"] = make_message("3", "350", "3000", thread_id="thread-1")
+    coordinator.wrapper.get_thread.reset_mock()
+
+    data = await refresh(coordinator)
+
+    coordinator.wrapper.search_messages.assert_not_called()
+    # The new message comes with its thread, in a single download
+    coordinator.wrapper.get_thread.assert_any_call("thread-1")
+    coordinator.wrapper.get_message.assert_not_called()
+    coordinator.wrapper.thread_cache.invalidate.assert_called_once_with("thread-1")
+    assert [msg.id for msg in data] == ["3", "2", "1"]
+    assert data[2].labels == ("INBOX",)
+    assert coordinator._history_id == "400"
+
+@pytest.mark.asyncio
+async def test_message_leaving_inbox_triggers_full_sync(coordinator):
+    await refresh(coordinator)
+    coordinator.wrapper.search_messages.reset_mock()
+    coordinator.wrapper.list_history.return_value = {
+        "history": [
+            {"labelsRemoved": [{"message": {"id": "2", "labelIds": ["ARCHIVE"]}, "labelIds": ["INBOX"]}]},
+        ],
+    }
+
+    await refresh(coordinator)
+
+    coordinator.wrapper.search_messages.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_expired_history_triggers_full_sync(coordinator):
+    await refresh(coordinator)
+    coordinator.wrapper.search_messages.reset_mock()
+    coordinator.wrapper.list_history.side_effect = HistoryExpired("gone")
+
+    await refresh(coordinator)
+
+    coordinator.wrapper.search_messages.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_full_resync_reuses_held_bodies(coordinator):
+    await refresh(coordinator)
+    held = coordinator.data[1]
+    coordinator.wrapper.search_messages.reset_mock()
+    coordinator.wrapper.list_history.side_effect = HistoryExpired("gone")
+    coordinator.wrapper.search_messages.side_effect = None
+    coordinator.wrapper.search_messages.return_value = [
+        {"id": "3", "threadId": "thread-3"},
+        {"id": "1", "threadId": "thread-1", "labelIds": ["INBOX", "STARRED"]},
+    ]
+    coordinator.wrapper.mailbox["3"] = make_message("3", "300", "3000")
+    coordinator.wrapper.get_thread.reset_mock()
+
+    data = await refresh(coordinator)
+
+    # The search returns IDs only, the unseen message is fetched with its thread
+    coordinator.wrapper.search_messages.assert_called_once_with("label:INBOX", limit=5)
+    coordinator.wrapper.get_thread.assert_any_call("thread-3")
+    assert call("thread-1") not in coordinator.wrapper.get_thread.call_args_list
+    coordinator.wrapper.get_message.assert_not_called()
+    assert [msg.id for msg in data] == ["3", "1"]
+    assert data[1].body_text == held.body_text
+    assert data[1].labels == ("INBOX", "STARRED")
+    assert data[1].starred is True
+    assert coordinator._history_id == "300"
+
+@pytest.mark.asyncio
+async def test_full_resync_with_no_overlap_fetches_threads(coordinator, mailbox):
+    await refresh(coordinator)
+    coordinator.wrapper.search_messages.reset_mock()
+    coordinator.wrapper.list_history.side_effect = HistoryExpired("gone")
+    mailbox.clear()
+    mailbox["4"] = make_message("4", "400", "4000")
+
+    data = await refresh(coordinator)
+
+    # Bodies are never downloaded by the search
+    coordinator.wrapper.search_messages.assert_called_once_with("label:INBOX", limit=5)
+    coordinator.wrapper.get_thread.assert_any_call("thread-4")
+    coordinator.wrapper.get_message.assert_not_called()
+    assert [msg.id for msg in data] == ["4"]
+
+@pytest.mark.asyncio
+async def test_snippet_only_thread_falls_back_to_message(coordinator, mailbox):
+    await refresh(coordinator)
+    coordinator.wrapper.list_history.return_value = {
+        "historyId": "400",
+        "history": [{"messagesAdded": [{"message": {"id": "3", "threadId": "thread-3", "labelIds": ["INBOX"]}}]}],
+    }
+    full = make_message("3", "350", "3000")
+    mailbox["3"] = {**full, "payload": {"headers": []}}
+    coordinator.wrapper.get_message.return_value = full
+
+    data = await refresh(coordinator)
+
+    coordinator.wrapper.get_message.assert_called_once_with("3")
+    assert data[0].id == "3"
+    assert data[0].body_text == "Body"
+
+@pytest.mark.asyncio
+async def test_reply_state_comes_from_thread(coordinator, mailbox):
+    mailbox["2b"] = make_message("2b", "210", "2100", labels=["SENT"], thread_id="thread-2")
+
+    data = await refresh(coordinator)
+
+    assert data[0].have_replied is True
+    coordinator.wrapper.get_thread.assert_any_call("thread-2", cache_key="200")
+
+@pytest.mark.asyncio
+async def test_idle_poll_skips_executor(coordinator):
+    await refresh(coordinator)
+    coordinator.hass.async_add_executor_job.reset_mock()
+
+    await refresh(coordinator)
+
+    coordinator.hass.async_add_executor_job.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_message_added_and_deleted_in_window_is_ignored(coordinator):
+    await refresh(coordinator)
+    coordinator.wrapper.list_history.return_value = {
+        "historyId": "400",
+        "history": [
+            {"messagesAdded": [{"message": {"id": "3", "threadId": "thread-3", "labelIds": ["INBOX"]}}]},
+            {"messagesDeleted": [{"message": {"id": "3", "threadId": "thread-3"}}]},
+        ],
+    }
+
+    data = await refresh(coordinator)
+
+    coordinator.wrapper.get_message.assert_not_called()
+    assert [msg.id for msg in data] == ["2", "1"]
+    assert coordinator._history_id == "400"
+
+@pytest.mark.asyncio
+async def test_failed_new_message_fetch_is_skipped(coordinator):
+    await refresh(coordinator)
+    coordinator.wrapper.list_history.return_value = {
+        "historyId": "400",
+        "history": [
+            {"messagesAdded": [{"message": {"id": "3", "threadId": "thread-3", "labelIds": ["INBOX"]}}]},
+        ],
+    }
+    coordinator.wrapper.get_message.side_effect = RuntimeError("Requested entity was not found")
+
+    data = await refresh(coordinator)
+
+    assert [msg.id for msg in data] == ["2", "1"]
+    assert coordinator._history_id == "400"
+
+@pytest.mark.asyncio
+async def test_full_sync_clears_thread_cache(coordinator):
+    await refresh(coordinator)
+
+    coordinator.wrapper.thread_cache.clear.assert_called_once()
+
+    # Delta syncs evict precisely instead
+    await refresh(coordinator)
+    coordinator.wrapper.thread_cache.clear.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip_warm_starts_with_delta(coordinator):
+    await refresh(coordinator)
+    save_func = coordinator._snapshot_store.async_delay_save.call_args[0][0]
+    snapshot = json.loads(json.dumps(save_func()))
+
+    coordinator.data = None
+    coordinator._history_id = None
+    coordinator._snapshot_store.async_load = AsyncMock(return_value=snapshot)
+    coordinator.wrapper.search_messages.reset_mock()
+
+    assert await coordinator.async_restore_snapshot() is True
+    assert [msg.id for msg in coordinator.data] == ["2", "1"]
+
+    await refresh(coordinator)
+    coordinator.wrapper.list_history.assert_called_once_with("200")
+    coordinator.wrapper.search_messages.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_unusable_snapshot_is_ignored(coordinator):
+    coordinator._snapshot_store.async_load = AsyncMock(return_value={"messages": [{"id": "1"}]})
+
+    assert await coordinator.async_restore_snapshot() is False
+    assert coordinator.data is None
+
+    coordinator._snapshot_store.async_load = AsyncMock(return_value=None)
+    assert await coordinator.async_restore_snapshot() is False
+
+@pytest.mark.asyncio
+async def test_failed_refresh_does_not_save_snapshot(coordinator):
+    coordinator.wrapper.search_messages.side_effect = RuntimeError("boom")
+
+    with pytest.raises(Exception):
+        await refresh(coordinator)
+
+    coordinator._snapshot_store.async_delay_save.assert_not_called()
+
+def test_apply_options_in_place(coordinator):
+    coordinator._schedule_refresh = MagicMock()
+    coordinator.async_update_listeners = MagicMock()
+    coordinator._listeners = {object(): (MagicMock(), None)}
+    wrapper = coordinator.wrapper
+    wrapper.timeouts = {}
+
+    coordinator.async_apply_options({
+        CONF_POLLING_INTERVAL: 15,
+        CONF_BODY_MODE: "none",
+        CONF_FETCH_TIMEOUT: 45,
+    })
+
+    assert coordinator.update_interval == timedelta(minutes=15)
+    coordinator._schedule_refresh.assert_called_once()
+    assert coordinator.body_mode == "none"
+    assert wrapper.timeouts["gmail thread get"] == 45
+    assert coordinator.wrapper is wrapper
+    coordinator.async_update_listeners.assert_called_once()
+
+    # Same interval, the pending poll is left alone
+    coordinator.async_apply_options({CONF_POLLING_INTERVAL: 15})
+    coordinator._schedule_refresh.assert_called_once()
+    assert coordinator.body_mode == "full"
+
+@pytest.mark.asyncio
+async def test_refresh_with_result(coordinator):
+    await refresh(coordinator)
+    coordinator.wrapper.list_history.return_value = {
+        "historyId": "400",
+        "history": [{"messagesAdded": [{"message": {"id": "3", "threadId": "thread-3", "labelIds": ["INBOX"]}}]}],
+    }
+    coordinator.wrapper.mailbox["3"] = make_message("3", "350", "3000")
+
+    async def async_refresh():
+        coordinator.data = await coordinator._async_update_data()
+        coordinator.last_update_success = True
+    coordinator.async_refresh = async_refresh
+
+    result = await coordinator.async_refresh_with_result()
+
+    assert result["success"] is True
+    assert result["new_messages"] == 1
+    assert result["error"] is None
+    assert result["duration"] >= 0
+
+@pytest.mark.asyncio
+async def test_refresh_with_result_reports_failure(coordinator):
+    async def async_refresh():
+        coordinator.last_update_success = False
+        coordinator.last_exception = RuntimeError("quota")
+    coordinator.async_refresh = async_refresh
+
+    result = await coordinator.async_refresh_with_result()
+
+    assert result == {
+        "success": False,
+        "skipped": False,
+        "duration": result["duration"],
+        "new_messages": 0,
+        "error": "quota",
+    }
+
+@pytest.mark.asyncio
+async def test_concurrent_refreshes_share_one_fetch(coordinator):
+    release = asyncio.Event()
+    results = [make_message("2", "200", "2000"), make_message("1", "100", "1000")]
+
+    async def slow_search(*args, **kwargs):
+        await release.wait()
+        return results
+    coordinator.wrapper.search_messages = AsyncMock(side_effect=slow_search)
+
+    first = asyncio.create_task(coordinator._async_update_data())
+    second = asyncio.create_task(coordinator._async_update_data())
+    await asyncio.sleep(0)
+    release.set()
+    data = await asyncio.gather(first, second)
+
+    coordinator.wrapper.search_messages.assert_called_once()
+    assert data[0] == data[1]
+    assert len(coordinator.refresh_history) == 1
+
+    # The next refresh starts a new fetch
+    await coordinator._async_update_data()
+    assert coordinator.wrapper.search_messages.call_count == 2
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_fetch(coordinator):
+    release = asyncio.Event()
+
+    async def slow_search(*args, **kwargs):
+        await release.wait()
+        return [make_message("1", "100", "1000")]
+    coordinator.wrapper.search_messages = AsyncMock(side_effect=slow_search)
+
+    cancelled = asyncio.create_task(coordinator._async_update_data())
+    waiting = asyncio.create_task(coordinator._async_update_data())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    release.set()
+
+    assert [msg.id for msg in await waiting] == ["1"]
+
+@pytest.mark.asyncio
+async def test_cancelled_delta_refresh_loses_no_mail(coordinator):
+    await refresh(coordinator)
+    release = asyncio.Event()
+    fetch_cancelled = asyncio.Event()
+
+    async def slow_thread(thread_id, cache_key=None):
+        try:
+            await release.wait()
+        except asyncio.CancelledError:
+            fetch_cancelled.set()
+            raise
+        return {"id": thread_id, "messages": [make_message("3", "350", "3000")]}
+    coordinator.wrapper.get_thread.side_effect = slow_thread
+    coordinator.wrapper.list_history.return_value = {
+        "historyId": "400",
+        "history": [{"messagesAdded": [{"message": {"id": "3", "threadId": "thread-3", "labelIds": ["INBOX"]}}]}],
+    }
+    coordinator._snapshot_store.async_delay_save.reset_mock()
+
+    task = asyncio.create_task(refresh(coordinator))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    await asyncio.sleep(0)
+
+    # The last caller left, so the fetch and its gogcli calls were stopped
+    assert fetch_cancelled.is_set()
+    assert [msg.id for msg in coordinator.data] == ["2", "1"]
+    assert coordinator._history_id == "200"
+    coordinator._snapshot_store.async_delay_save.assert_not_called()
+
+    release.set()
+    data = await refresh(coordinator)
+
+    coordinator.wrapper.list_history.assert_called_with("200")
+    assert [msg.id for msg in data] == ["3", "2", "1"]
+    assert coordinator._history_id == "400"
+
+@pytest.mark.asyncio
+async def test_shutdown_cancels_running_fetch(coordinator):
+    started = asyncio.Event()
+
+    async def hung_search(*args, **kwargs):
+        started.set()
+        await asyncio.Event().wait()
+    coordinator.wrapper.search_messages.side_effect = hung_search
+
+    waiting = asyncio.create_task(coordinator._async_update_data())
+    await started.wait()
+    await coordinator.async_shutdown()
+
+    with pytest.raises(UpdateFailed):
+        await waiting
+    assert coordinator._update_task is None
+
+@pytest.mark.asyncio
+async def test_refresh_skipped_when_data_is_fresh(coordinator):
+    coordinator.async_refresh = AsyncMock()
+    coordinator.last_update_success = True
+    await coordinator._async_update_data()
+
+    result = await coordinator.async_refresh_with_result(max_age=60)
+
+    assert result["skipped"] is True
+    coordinator.async_refresh.assert_not_called()
+
+    with patch("custom_components.gogcli.coordinator.time.monotonic", return_value=time.monotonic() + 61):
+        result = await coordinator.async_refresh_with_result(max_age=60)
+    assert result["skipped"] is False
+    coordinator.async_refresh.assert_called_once()
+
+@pytest.fixture
+def adaptive(coordinator):
+    coordinator.async_apply_options({
+        CONF_ADAPTIVE_POLLING: True,
+        CONF_MIN_POLLING_INTERVAL: 2,
+        CONF_MAX_POLLING_INTERVAL: 30,
+    })
+    return coordinator
+
+def new_mail(coordinator, msg_id, history_id):
+    coordinator.wrapper.list_history.return_value = {
+        "historyId": history_id,
+        "history": [{"messagesAdded": [{"message": {"id": msg_id, "threadId": f"thread-{msg_id}", "labelIds": ["INBOX"]}}]}],
+    }
+    coordinator.wrapper.mailbox[msg_id] = make_message(msg_id, history_id, history_id)
+
+def test_fixed_polling_ignores_activity(coordinator):
+    coordinator._adapt_interval(True, 3)
+    coordinator._adapt_interval(False, 0)
+
+    assert coordinator.update_interval == timedelta(minutes=5)
+
+@pytest.mark.asyncio
+async def test_adaptive_polling_backs_off_while_idle(adaptive):
+    with patch("custom_components.gogcli.coordinator.random.uniform", return_value=1.0):
+        await refresh(adaptive)
+        assert adaptive.update_interval == timedelta(minutes=10)
+        await refresh(adaptive)
+        assert adaptive.update_interval == timedelta(minutes=20)
+        await refresh(adaptive)
+        await refresh(adaptive)
+        assert adaptive.update_interval == timedelta(minutes=30)
+
+@pytest.mark.asyncio
+async def test_adaptive_polling_speeds_up_on_new_mail(adaptive):
+    with patch("custom_components.gogcli.coordinator.random.uniform", return_value=1.0):
+        await refresh(adaptive)
+        new_mail(adaptive, "3", "350")
+        await refresh(adaptive)
+
+    assert adaptive.update_interval == timedelta(minutes=2)
+
+@pytest.mark.asyncio
+async def test_adaptive_polling_backs_off_on_failure(adaptive):
+    adaptive.wrapper.search_messages.side_effect = RuntimeError("quota")
+
+    with patch("custom_components.gogcli.coordinator.random.uniform", return_value=1.0):
+        with pytest.raises(Exception):
+            await refresh(adaptive)
+
+    assert adaptive.update_interval == timedelta(minutes=10)
+
+def test_adaptive_jitter_stays_within_bounds(adaptive):
+    for _ in range(50):
+        adaptive._adapt_interval(True, 1)
+        assert timedelta(minutes=2) <= adaptive.update_interval <= timedelta(minutes=2.2)
+    for _ in range(5):
+        adaptive._adapt_interval(False, 0)
+    for _ in range(50):
+        adaptive._adapt_interval(False, 0)
+        assert timedelta(minutes=27) <= adaptive.update_interval <= timedelta(minutes=30)
+
+@pytest.mark.asyncio
+async def test_has_seen_push_hints(coordinator):
+    await refresh(coordinator)
+
+    assert coordinator.has_seen(message_id="2") is True
+    assert coordinator.has_seen(message_id="9") is False
+    assert coordinator.has_seen(history_id="150") is True
+    assert coordinator.has_seen(history_id="201") is False
+    assert coordinator.has_seen(history_id="bogus") is False
+    assert coordinator.has_seen() is False
+
+@pytest.mark.asyncio
+async def test_open_breaker_keeps_reply_state(coordinator):
+    coordinator.wrapper.get_thread.return_value = {
+        "messages": [{"id": "1"}, {"id": "r1", "labelIds": ["SENT"]}],
+    }
+    await refresh(coordinator)
+    replied = {msg.id: msg.have_replied for msg in coordinator.data}
+    coordinator.wrapper.get_thread.reset_mock()
+    coordinator.wrapper.breaker.record_failure(ERROR_QUOTA, "rate limit")
+
+    data = await coordinator._async_attach_threads(coordinator.data)
+
+    coordinator.wrapper.get_thread.assert_not_called()
+    assert {msg.id: msg.have_replied for msg in data} == replied
+
+@pytest.mark.asyncio
+async def test_auth_failure_raises_repair_issue(coordinator):
+    coordinator.wrapper.breaker.record_failure(ERROR_AUTH, "invalid_grant")
+    coordinator.wrapper.search_messages.side_effect = CircuitOpenError("paused")
+
+    with patch("custom_components.gogcli.coordinator.ir") as ir:
+        with pytest.raises(Exception):
+            await refresh(coordinator)
+        ir.async_create_issue.assert_called_once()
+        assert ir.async_create_issue.call_args.kwargs["translation_key"] == "auth_failed"
+
+        coordinator.wrapper.breaker.record_success()
+        coordinator.wrapper.search_messages.side_effect = None
+        await refresh(coordinator)
+        ir.async_delete_issue.assert_called_with(coordinator.hass, "gogcli", "auth_failed_test_entry")
@@ -0,0 +1,59 @@
+from collections import Counter
+from unittest.mock import MagicMock
+from homeassistant.const import EntityCategory
+from custom_components.gogcli.metrics import GogMetrics
+from custom_components.gogcli.sensor import GogProcessQueueSensor, GogMetricSensor, METRIC_SENSORS
+from custom_components.gogcli.scheduler import GogScheduler
+from custom_components.gogcli.const import CONF_ACCOUNT
+
+def make_coordinator():
+    coordinator = MagicMock()
+    coordinator.entry.entry_id = "test_entry"
+    coordinator.entry.data = {CONF_ACCOUNT: "test@gmail.com"}
+    coordinator.wrapper.scheduler = GogScheduler(max_concurrent=3)
+    coordinator.wrapper.timed_out = Counter()
+    return coordinator
+
+def test_process_queue_sensor():
+    coordinator = make_coordinator()
+    sensor = GogProcessQueueSensor(coordinator)
+
+    assert sensor.entity_category == EntityCategory.DIAGNOSTIC
+    assert sensor.unique_id == "test_entry_gogcli_queue"
+    assert sensor.native_value == 0
+    attrs = sensor.extra_state_attributes
+    assert attrs["max_concurrent"] == 3
+    assert attrs["max_wait_time"] == 0.0
+    assert attrs["queue_depth"] == 0
+
+def test_process_queue_sensor_reports_timeouts():
+    coordinator = make_coordinator()
+    coordinator.wrapper.timed_out["gmail thread get"] += 2
+    sensor = GogProcessQueueSensor(coordinator)
+
+    assert sensor.extra_state_attributes["timeouts"] == {"gmail thread get": 2}
+
+def test_metric_sensors():
+    coordinator = make_coordinator()
+    coordinator.last_refresh_duration = 1.5
+    coordinator.wrapper.metrics = GogMetrics()
+    coordinator.wrapper.metrics.record_run("gmail messages search", 1.2, 0, 2048)
+    coordinator.wrapper.metrics.record_run("gmail thread get", 0.3, 1, 0)
+    coordinator.wrapper.metrics.record_parse("gmail messages search", 0.01, 2048)
+    sensors = {
+        description.key: GogMetricSensor(coordinator, description)
+        for description in METRIC_SENSORS
+    }
+
+    duration = sensors["last_refresh_duration"]
+    assert duration.entity_category == EntityCategory.DIAGNOSTIC
+    assert duration.unique_id == "test_entry_last_refresh_duration"
+    assert duration.entity_id == "sensor.test_gmail_com_last_refresh_duration"
+    assert duration.native_value == 1.5
+    assert duration.extra_state_attributes["commands"]["gmail messages search"]["p50"] == 1.2
+    assert "commands" in duration._unrecorded_attributes
+
+    assert sensors["gogcli_spawns_per_hour"].native_value == 2
+    assert sensors["gogcli_failed_calls"].native_value == 1
+    assert sensors["gogcli_bytes_parsed"].native_value == 2048
+    assert sensors["gogcli_bytes_parsed"].extra_state_attributes is None
@@ -0,0 +1,97 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from custom_components.gogcli.const import CONF_ACCOUNT, CONF_CONFIG_DIR, CONF_GOG_PATH, DOMAIN
+from custom_components.gogcli.coordinator import GogGmailCoordinator
+from custom_components.gogcli.diagnostics import async_get_config_entry_diagnostics
+from custom_components.gogcli.scheduler import GogScheduler
+
+MESSAGE = {
+    "id": "m1",
+    "threadId": "t1",
+    "historyId": "100",
+    "internalDate": "1000",
+    "labelIds": ["INBOX"],
+    "snippet": "Hello",
+    "payload": {
+        "headers": [{"name": "Subject", "value": "Secret subject"}],
+        "mimeType": "text/plain",
+        "body": {"data": "U2VjcmV0IGJvZHk="},
+    },
+}
+
+@pytest.fixture
+def hass():
+    hass = MagicMock()
+    hass.data = {DOMAIN: {"scheduler": GogScheduler(2)}}
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+    return hass
+
+@pytest.mark.asyncio
+async def test_diagnostics_snapshot(hass):
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {
+        CONF_ACCOUNT: "me@example.com",
+        CONF_GOG_PATH: "gog",
+        CONF_CONFIG_DIR: "/tmp",
+        "webhook_id": "secret-hook",
+    }
+    entry.options = {"polling_interval": 10}
+    coordinator = GogGmailCoordinator(hass, entry)
+    coordinator._thread_store = MagicMock()
+    coordinator._snapshot_store = MagicMock()
+    coordinator._thread_cache_loaded = True
+    coordinator.wrapper._run = AsyncMock(side_effect=[
+        (0, json.dumps([MESSAGE]).encode(), b""),
+        (0, json.dumps({"id": "t1", "messages": [MESSAGE]}).encode(), b""),
+    ])
+    coordinator.wrapper.metrics.record_run(
+        "gmail messages search", 0.5, 0, 321, ("gmail", "messages", "search", "from:boss@corp.com", "--json")
+    )
+    hass.data[DOMAIN][entry.entry_id] = coordinator
+
+    coordinator.data = await coordinator._async_update_data()
+    entry.options = {
+        "polling_interval": 10,
+        "searches": [{"name": "Boss", "query": "from:boss@corp.com", "limit": 3}],
+    }
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert result["entry"]["data"][CONF_ACCOUNT] == "**REDACTED**"
+    assert result["entry"]["data"]["webhook_id"] == "**REDACTED**"
+    assert result["webhook"] == {"calls": 0, "skipped": 0}
+    assert result["breaker"]["open"] is False
+    assert result["polling"]["update_interval"] == 600
+    assert result["polling"]["max_processes"] == 2
+    assert result["polling"]["timeouts"]["gmail thread get"] == 30
+    assert result["refreshes"]["history"][0]["sync"] == "full"
+    assert result["refreshes"]["history"][0]["success"] is True
+    assert result["traces"][0]["args"] == ["gmail", "messages", "search", "**REDACTED**", "--json"]
+    assert result["entry"]["options"]["searches"][0]["query"] == "**REDACTED**"
+    assert result["traces"][0]["stdout_bytes"] == 321
+    assert result["commands"]["gmail messages search"]["calls"] == 1
+    assert result["data"]["messages"] == 1
+    assert result["data"]["thread_cache"]["entries"] == 1
+    # Message content stays out of the download
+    assert "Secret subject" not in json.dumps(result)
+    assert "Secret body" not in json.dumps(result)
+    assert "boss@corp.com" not in json.dumps(result)
+
+@pytest.mark.asyncio
+async def test_failed_refresh_is_in_history(hass):
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {CONF_GOG_PATH: "gog", CONF_CONFIG_DIR: "/tmp"}
+    entry.options = {}
+    coordinator = GogGmailCoordinator(hass, entry)
+    coordinator._thread_store = MagicMock()
+    coordinator._snapshot_store = MagicMock()
+    coordinator._thread_cache_loaded = True
+    coordinator.wrapper._run = AsyncMock(return_value=(1, b"", b"boom"))
+
+    with pytest.raises(Exception):
+        await coordinator._async_update_data()
+
+    assert coordinator.refresh_history[-1]["success"] is False
+    assert coordinator.refresh_history[-1]["sync"] == "full"
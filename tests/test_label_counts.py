@@ -0,0 +1,72 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from homeassistant.components.sensor import SensorStateClass
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from custom_components.gogcli.const import CONF_ACCOUNT, CONF_COUNT_LABELS
+from custom_components.gogcli.coordinator import GogLabelCoordinator, count_labels
+from custom_components.gogcli.sensor import GogLabelCountSensor
+from custom_components.gogcli.utils import GogWrapper
+
+@pytest.fixture
+def coordinator():
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {CONF_ACCOUNT: "me@example.com"}
+    entry.options = {CONF_COUNT_LABELS: ["INBOX", "Bills"]}
+    wrapper = MagicMock()
+    wrapper.get_label = AsyncMock(side_effect=lambda label: {
+        "INBOX": {"id": "INBOX", "messagesTotal": 120, "messagesUnread": 3},
+        "Bills": {"id": "Label_7", "messagesTotal": 40, "messagesUnread": 0},
+    }[label])
+    return GogLabelCoordinator(MagicMock(), entry, wrapper)
+
+def test_count_labels_default():
+    assert count_labels({}) == ["INBOX"]
+
+@pytest.mark.asyncio
+async def test_label_counts(coordinator):
+    data = await coordinator._async_update_data()
+
+    assert data == {"INBOX": {"total": 120, "unread": 3}, "Bills": {"total": 40, "unread": 0}}
+    assert coordinator.wrapper.get_label.call_count == 2
+
+@pytest.mark.asyncio
+async def test_failed_label_is_left_out(coordinator):
+    async def get_label(label):
+        if label == "Bills":
+            raise RuntimeError("no such label")
+        return {"messagesTotal": 5, "messagesUnread": 1}
+    coordinator.wrapper.get_label = get_label
+
+    assert await coordinator._async_update_data() == {"INBOX": {"total": 5, "unread": 1}}
+
+@pytest.mark.asyncio
+async def test_all_labels_failing_fails_update(coordinator):
+    coordinator.wrapper.get_label = AsyncMock(side_effect=RuntimeError("quota"))
+
+    with pytest.raises(UpdateFailed):
+        await coordinator._async_update_data()
+
+def test_label_count_sensor(coordinator):
+    coordinator.data = {"INBOX": {"total": 120, "unread": 3}}
+    coordinator.last_update_success = True
+
+    unread = GogLabelCountSensor(coordinator, "INBOX", "unread")
+    bills = GogLabelCountSensor(coordinator, "Bills", "total")
+
+    assert unread.native_value == 3
+    assert unread.state_class == SensorStateClass.MEASUREMENT
+    assert unread.unique_id == "test_entry_label_inbox_unread"
+    assert unread.entity_id == "sensor.me_example_com_inbox_unread"
+    assert unread.translation_placeholders == {"label": "INBOX"}
+    assert unread.available is True
+    assert bills.available is False
+    assert bills.native_value is None
+
+@pytest.mark.asyncio
+async def test_wrapper_get_label():
+    wrapper = GogWrapper("gog", "/tmp")
+    wrapper._run = AsyncMock(return_value=(0, b'{"id": "INBOX", "messagesUnread": 2}', b""))
+
+    assert await wrapper.get_label("INBOX") == {"id": "INBOX", "messagesUnread": 2}
+    wrapper._run.assert_called_once_with("gmail", "labels", "get", "INBOX", "--json")
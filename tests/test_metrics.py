@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import patch
+from custom_components.gogcli.metrics import GogMetrics, percentile, redact_args
+from custom_components.gogcli.utils import GogWrapper
+
+def test_percentile():
+    samples = [float(value) for value in range(1, 21)]
+
+    assert percentile(samples, 0.5) == 10.0
+    assert percentile(samples, 0.95) == 19.0
+    assert percentile([3.0], 0.95) == 3.0
+    assert percentile([], 0.5) is None
+
+def test_trace_args_are_redacted():
+    metrics = GogMetrics()
+    metrics.record_run(
+        "gmail messages search", 0.2, 0, 100,
+        ("gmail", "messages", "search", "from:boss@example.com", "--max", "5", "--json"),
+    )
+
+    assert metrics.traces[0]["args"] == [
+        "gmail", "messages", "search", "**REDACTED**", "--max", "**REDACTED**", "--json",
+    ]
+    assert redact_args("gmail thread get", ("gmail", "thread", "get", "t1")) == [
+        "gmail", "thread", "get", "**REDACTED**",
+    ]
+    assert redact_args("version", ("version",)) == ["version"]
+
+def test_metrics_per_command():
+    metrics = GogMetrics()
+    metrics.record_run("gmail thread get", 0.2, 0, 100)
+    metrics.record_run("gmail thread get", 0.4, 1, 0)
+    metrics.record_run("version", 0.1, None, 0)
+    metrics.record_parse("gmail thread get", 0.01, 100)
+
+    stats = metrics.as_dict()
+    assert stats["gmail thread get"]["calls"] == 2
+    assert stats["gmail thread get"]["failures"] == 1
+    assert stats["gmail thread get"]["last_exit_code"] == 1
+    assert stats["gmail thread get"]["p50"] == 0.2
+    assert stats["gmail thread get"]["p95"] == 0.4
+    assert stats["gmail thread get"]["stdout_bytes"] == 100
+    assert stats["version"]["last_exit_code"] is None
+    assert metrics.failed_calls == 2
+    assert metrics.bytes_parsed == 100
+
+def test_spawns_per_hour_is_rolling():
+    metrics = GogMetrics()
+    with patch("custom_components.gogcli.metrics.time.monotonic", return_value=1000):
+        metrics.record_run("version", 0.1, 0, 0)
+    with patch("custom_components.gogcli.metrics.time.monotonic", return_value=2000):
+        metrics.record_run("version", 0.1, 0, 0)
+
+    with patch("custom_components.gogcli.metrics.time.monotonic", return_value=4601):
+        assert metrics.spawns_per_hour == 1
+
+@pytest.mark.asyncio
+async def test_wrapper_records_calls(tmp_path):
+    gog = tmp_path / "gog"
+    gog.write_text("#!/bin/sh\necho '{\"id\": \"t1\", \"messages\": []}'\n")
+    gog.chmod(0o755)
+    wrapper = GogWrapper(str(gog), str(tmp_path))
+
+    await wrapper.get_thread("t1")
+
+    stats = wrapper.metrics.as_dict()["gmail thread get"]
+    assert stats["calls"] == 1
+    assert stats["last_exit_code"] == 0
+    assert stats["stdout_bytes"] == len(b'{"id": "t1", "messages": []}\n')
+    assert wrapper.metrics.bytes_parsed == stats["stdout_bytes"]
@@ -0,0 +1,73 @@
+import base64
+import json
+from custom_components.gogcli.models import GmailMessage, has_body, parse_message
+
+RAW = {
+    "id": "m1",
+    "threadId": "t1",
+    "historyId": "42",
+    "internalDate": "1700000000000",
+    "labelIds": ["INBOX", "UNREAD"],
+    "snippet": "snippet only",
+    "payload": {
+        "headers": [
+            {"name": "Subject", "value": "First"},
+            {"name": "Subject", "value": "Second"},
+        ],
+    },
+}
+
+def test_parse_message_precomputes_fields():
+    message = parse_message(RAW)
+
+    assert message.headers["Subject"] == "First"
+    assert message.internal_date == 1700000000000
+    assert message.body_text == "snippet only"
+    assert message.body_html is None
+    assert message.is_unread is True
+    assert message.starred is False
+    assert message.have_replied is False
+
+def test_with_labels_updates_flags():
+    message = parse_message(RAW).with_labels(["INBOX", "STARRED", "IMPORTANT"])
+
+    assert message.labels == ("INBOX", "STARRED", "IMPORTANT")
+    assert message.is_unread is False
+    assert message.starred is True
+    assert message.priority is True
+
+def test_with_reply_keeps_identity_when_unchanged():
+    message = parse_message(RAW)
+
+    assert message.with_reply(False) is message
+    assert message.with_reply(True).have_replied is True
+
+def test_body_uses_declared_charset():
+    raw = dict(RAW)
+    raw["payload"] = {
+        "mimeType": "text/plain",
+        "headers": [{"name": "Content-Type", "value": 'text/plain; charset="ISO-8859-1"'}],
+        "body": {"data": base64.urlsafe_b64encode("Déjà vu".encode("latin-1")).decode()},
+    }
+
+    assert parse_message(raw).body_text == "Déjà vu"
+
+def test_has_body():
+    assert has_body(RAW) is False
+    assert has_body({"payload": {"body": {"data": "SGk="}}}) is True
+    assert has_body({"payload": {"parts": [{"mimeType": "text/plain"}]}}) is True
+    assert has_body({"snippet": "Hi"}) is False
+
+def test_message_dict_round_trip():
+    message = parse_message({
+        "id": "m1",
+        "threadId": "t1",
+        "historyId": "100",
+        "internalDate": "1000",
+        "labelIds": ["INBOX", "STARRED"],
+        "payload": {"headers": [{"name": "Subject", "value": "Hi"}]},
+    })
+
+    data = json.loads(json.dumps(message.as_dict()))
+
+    assert GmailMessage.from_dict(data) == message
@@ -3,7 +3,16 @@ from unittest.mock import MagicMock
 from homeassistant.data_entry_flow import FlowResultType
 from homeassistant.util import slugify
 from custom_components.gogcli.config_flow import OptionsFlowHandler
-from custom_components.gogcli.const import CONF_POLLING_INTERVAL, CONF_ACCOUNT, DASHBOARD_CARD_YAML
+from custom_components.gogcli.const import (
+    CONF_ACCOUNT,
+    CONF_ADAPTIVE_POLLING,
+    CONF_COUNT_LABELS,
+    CONF_MAX_POLLING_INTERVAL,
+    CONF_MIN_POLLING_INTERVAL,
+    CONF_POLLING_INTERVAL,
+    CONF_SEARCHES,
+    DASHBOARD_CARD_YAML,
+)
 
 @pytest.mark.asyncio
 async def test_options_flow_init_menu():
@@ -49,3 +58,56 @@ async def test_options_flow_dashboard_yaml():
     
     expected_yaml = DASHBOARD_CARD_YAML.format(prefix=slugify(account), account=account)
     assert result["description_placeholders"]["card_yaml"] == expected_yaml
+
+@pytest.mark.asyncio
+async def test_options_flow_polling_rejects_min_above_max():
+    entry = MagicMock()
+    entry.options = {}
+    flow = OptionsFlowHandler(entry)
+    flow.hass = MagicMock()
+
+    result = await flow.async_step_polling({
+        CONF_POLLING_INTERVAL: 10,
+        CONF_ADAPTIVE_POLLING: True,
+        CONF_MIN_POLLING_INTERVAL: 30,
+        CONF_MAX_POLLING_INTERVAL: 10,
+    })
+
+    assert result["type"] == FlowResultType.FORM
+    assert result["errors"] == {"base": "min_above_max"}
+
+@pytest.mark.asyncio
+async def test_options_flow_labels():
+    entry = MagicMock()
+    entry.options = {}
+    flow = OptionsFlowHandler(entry)
+    flow.hass = MagicMock()
+
+    result = await flow.async_step_labels()
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "labels"
+
+    result = await flow.async_step_labels({CONF_COUNT_LABELS: "INBOX, Bills,, INBOX "})
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"] == {CONF_COUNT_LABELS: ["INBOX", "Bills"]}
+
+@pytest.mark.asyncio
+async def test_options_flow_saved_searches():
+    entry = MagicMock()
+    entry.options = {CONF_SEARCHES: [{"name": "Bills", "query": "label:bills", "limit": 5}]}
+    flow = OptionsFlowHandler(entry)
+    flow.hass = MagicMock()
+
+    result = await flow.async_step_searches()
+    assert result["type"] == FlowResultType.MENU
+    assert result["menu_options"] == ["add_search", "remove_search"]
+
+    result = await flow.async_step_add_search({"name": "bills", "query": "label:other", "limit": 3})
+    assert result["errors"] == {"base": "search_exists"}
+
+    result = await flow.async_step_add_search({"name": " Boss ", "query": "from:boss", "limit": 3})
+    assert result["type"] == FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_SEARCHES][1] == {"name": "Boss", "query": "from:boss", "limit": 3}
+
+    result = await flow.async_step_remove_search({CONF_SEARCHES: ["Bills"]})
+    assert result["data"][CONF_SEARCHES] == []
@@ -0,0 +1,167 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from custom_components.gogcli.breaker import GogCircuitBreaker
+from custom_components.gogcli.const import (
+    CONF_ACCOUNT,
+    CONF_CONFIG_DIR,
+    CONF_GOG_PATH,
+    CONF_SEARCHES,
+)
+from custom_components.gogcli.coordinator import GogGmailCoordinator
+from custom_components.gogcli.sensor import GogSearchSensor
+
+SEARCHES = [
+    {"name": "Boss", "query": "from:boss is:unread", "limit": 3},
+    {"name": "Bills", "query": "label:bills", "limit": 3},
+]
+
+def make_message(msg_id, history_id, labels=None):
+    return {
+        "id": msg_id,
+        "threadId": f"thread-{msg_id}",
+        "historyId": history_id,
+        "internalDate": history_id,
+        "labelIds": labels if labels is not None else ["INBOX"],
+        "payload": {
+            "headers": [{"name": "Subject", "value": f"Subject {msg_id}"}],
+            "mimeType": "text/plain",
+            "body": {"data": "Qm9keQ=="},
+        },
+    }
+
+MAILBOX = {
+    "1": make_message("1", "100"),
+    "2": make_message("2", "200"),
+    "7": make_message("7", "700", ["bills"]),
+    "8": make_message("8", "800", ["bills"]),
+}
+RESULTS = {
+    "label:INBOX": ["2", "1"],
+    "from:boss is:unread": ["7", "2"],
+    "label:bills": ["8", "7"],
+}
+
+async def search_messages(query, limit=10):
+    ids = RESULTS[query][:limit]
+    return [{"id": msg_id, "threadId": f"thread-{msg_id}"} for msg_id in ids]
+
+async def get_thread(thread_id, cache_key=None):
+    return {"id": thread_id, "messages": [msg for msg in MAILBOX.values() if msg["threadId"] == thread_id]}
+
+def downloads(coordinator):
+    """Return the threads downloaded in full, rather than checked for replies."""
+    return sorted(
+        call.args[0] for call in coordinator.wrapper.get_thread.call_args_list if "cache_key" not in call.kwargs
+    )
+
+@pytest.fixture
+def coordinator():
+    hass = MagicMock()
+    hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {CONF_ACCOUNT: "me@example.com", CONF_GOG_PATH: "gog", CONF_CONFIG_DIR: "/tmp"}
+    entry.options = {CONF_SEARCHES: SEARCHES}
+
+    coordinator = GogGmailCoordinator(hass, entry)
+    coordinator._thread_store = MagicMock()
+    coordinator._snapshot_store = MagicMock()
+    coordinator._thread_cache_loaded = True
+
+    wrapper = MagicMock()
+    wrapper.thread_cache = MagicMock(dirty=False)
+    wrapper.breaker = GogCircuitBreaker()
+    wrapper.search_messages = AsyncMock(side_effect=search_messages)
+    wrapper.list_history = AsyncMock(return_value={"history": [], "historyId": "900"})
+    wrapper.get_message = AsyncMock(side_effect=lambda msg_id: MAILBOX[msg_id])
+    wrapper.get_thread = AsyncMock(side_effect=get_thread)
+    coordinator.wrapper = wrapper
+    return coordinator
+
+async def refresh(coordinator):
+    coordinator.data = await coordinator._async_update_data()
+    return coordinator.data
+
+def ids(messages):
+    return [msg.id for msg in messages]
+
+@pytest.mark.asyncio
+async def test_shared_messages_are_fetched_once(coordinator):
+    await refresh(coordinator)
+
+    assert ids(coordinator.data) == ["2", "1"]
+    assert ids(coordinator.searches["Boss"]) == ["7", "2"]
+    assert ids(coordinator.searches["Bills"]) == ["8", "7"]
+    # 7 is in both searches and 2 is already held from the INBOX
+    assert downloads(coordinator) == ["thread-1", "thread-2", "thread-7", "thread-8"]
+    # One parse for the INBOX and one for all searches together
+    assert coordinator.hass.async_add_executor_job.call_count == 2
+    assert coordinator.searches["Boss"][1] is coordinator.data[0]
+    assert coordinator.get_message("8").headers["Subject"] == "Subject 8"
+
+@pytest.mark.asyncio
+async def test_idle_mailbox_skips_searches(coordinator):
+    await refresh(coordinator)
+    coordinator.wrapper.search_messages.reset_mock()
+
+    await refresh(coordinator)
+
+    coordinator.wrapper.search_messages.assert_not_called()
+    assert ids(coordinator.searches["Bills"]) == ["8", "7"]
+
+@pytest.mark.asyncio
+async def test_mailbox_change_reruns_searches_without_refetching(coordinator):
+    await refresh(coordinator)
+    coordinator.wrapper.get_thread.reset_mock()
+    coordinator.wrapper.search_messages.reset_mock()
+    coordinator.wrapper.list_history.return_value = {
+        "historyId": "950",
+        "history": [{"labelsAdded": [{"message": {"id": "7", "labelIds": ["bills", "STARRED"]}, "labelIds": ["STARRED"]}]}],
+    }
+
+    await refresh(coordinator)
+
+    assert coordinator.wrapper.search_messages.call_count == 2
+    assert coordinator.searches["Boss"][0].labels == ("bills",)
+    assert downloads(coordinator) == []
+
+@pytest.mark.asyncio
+async def test_failed_search_keeps_previous_results(coordinator):
+    await refresh(coordinator)
+    coordinator._mailbox_changed = True
+
+    async def failing(query, limit=10):
+        if query == "label:bills":
+            raise RuntimeError("quota")
+        return await search_messages(query, limit)
+    coordinator.wrapper.search_messages.side_effect = failing
+    coordinator.wrapper.list_history.return_value = {"historyId": "950", "history": [{}]}
+
+    await refresh(coordinator)
+
+    assert ids(coordinator.searches["Bills"]) == ["8", "7"]
+
+@pytest.mark.asyncio
+async def test_snapshot_restores_searches(coordinator):
+    await refresh(coordinator)
+    snapshot = json.loads(json.dumps(coordinator._snapshot_data()))
+
+    coordinator.searches = {}
+    coordinator._snapshot_store.async_load = AsyncMock(return_value=snapshot)
+    assert await coordinator.async_restore_snapshot() is True
+
+    assert ids(coordinator.searches["Boss"]) == ["7", "2"]
+
+@pytest.mark.asyncio
+async def test_search_sensor(coordinator):
+    await refresh(coordinator)
+
+    first = GogSearchSensor(coordinator, "Bills", 0)
+    third = GogSearchSensor(coordinator, "Bills", 2)
+
+    assert first.native_value == "Unknown - Subject 8"
+    assert first.unique_id == "test_entry_search_bills_0"
+    assert first.entity_id == "sensor.me_example_com_search_bills_1"
+    assert first.translation_placeholders == {"search": "Bills", "index": "1"}
+    assert third.native_value == "Empty"
@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from custom_components.gogcli.scheduler import GogScheduler, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_concurrency():
+    scheduler = GogScheduler(max_concurrent=2)
+    running = 0
+    peak = 0
+
+    async def job():
+        nonlocal running, peak
+        async with scheduler.slot():
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    await asyncio.gather(*[job() for _ in range(6)])
+
+    assert peak == 2
+    stats = scheduler.as_dict()
+    assert stats["total_runs"] == 6
+    assert stats["total_queued"] == 4
+    assert stats["max_queue_depth"] == 4
+    assert stats["active"] == 0
+    assert stats["queue_depth"] == 0
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_interactive_first():
+    scheduler = GogScheduler(max_concurrent=1)
+    order = []
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    async def job(name, priority):
+        async with scheduler.slot(priority):
+            order.append(name)
+
+    blocking = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    background = asyncio.create_task(job("background", PRIORITY_BACKGROUND))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(job("interactive", PRIORITY_INTERACTIVE))
+    await asyncio.sleep(0)
+
+    assert scheduler.queue_depth == 2
+    release.set()
+    await asyncio.gather(blocking, background, interactive)
+
+    assert order == ["interactive", "background"]
+
+@pytest.mark.asyncio
+async def test_scheduler_cancelled_waiter_leaves_queue():
+    scheduler = GogScheduler(max_concurrent=1)
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot():
+            await release.wait()
+
+    blocking = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+
+    async def waiter():
+        async with scheduler.slot():
+            pass
+
+    waiting = asyncio.create_task(waiter())
+    await asyncio.sleep(0)
+    assert scheduler.queue_depth == 1
+
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert scheduler.queue_depth == 0
+
+    release.set()
+    await blocking
+    assert scheduler.active == 0
+
+@pytest.mark.asyncio
+async def test_scheduler_waiter_cancelled_as_slot_is_released():
+    scheduler = GogScheduler(max_concurrent=1)
+    holder = scheduler.slot()
+    await holder.__aenter__()
+
+    async def waiter():
+        async with scheduler.slot():
+            pass
+
+    waiting = asyncio.create_task(waiter())
+    await asyncio.sleep(0)
+
+    # Released in the same tick, before the waiter sees its cancellation
+    waiting.cancel()
+    await holder.__aexit__(None, None, None)
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert scheduler.queue_depth == 0
+    assert scheduler.active == 0
+
+@pytest.mark.asyncio
+async def test_scheduler_raising_limit_starts_waiters():
+    scheduler = GogScheduler(max_concurrent=1)
+    release = asyncio.Event()
+
+    async def job():
+        async with scheduler.slot():
+            await release.wait()
+
+    tasks = [asyncio.create_task(job()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert scheduler.active == 1
+
+    scheduler.set_max_concurrent(3)
+    assert scheduler.active == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
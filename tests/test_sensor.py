@@ -3,19 +3,14 @@ from unittest.mock import MagicMock
 from homeassistant.const import STATE_UNKNOWN
 from custom_components.gogcli.sensor import GogGmailSensor
 from custom_components.gogcli.const import CONF_ACCOUNT
+from custom_components.gogcli.models import parse_message
 import base64
 
 def encode_body(text):
     return base64.urlsafe_b64encode(text.encode("utf-8")).decode("utf-8")
 
-@pytest.fixture
-def mock_coordinator():
-    coordinator = MagicMock()
-    coordinator.entry.entry_id = "test_entry"
-    coordinator.entry.data = {CONF_ACCOUNT: "test@gmail.com"}
-    
-    # Sample email data
-    email_1 = {
+def make_email():
+    return {
         "id": "123",
         "threadId": "thread-123",
         "labelIds": ["INBOX", "IMPORTANT", "STARRED"],
@@ -46,8 +41,17 @@ def mock_coordinator():
             ]
         }
     }
+
+@pytest.fixture
+def mock_coordinator():
+    coordinator = MagicMock()
+    coordinator.entry.entry_id = "test_entry"
+    coordinator.entry.data = {CONF_ACCOUNT: "test@gmail.com"}
     
-    coordinator.data = [email_1]
+    # Sample email data
+    email_1 = make_email()
+    coordinator.data = [parse_message(email_1, email_1["_thread"])]
+    coordinator.body_mode = "full"
     return coordinator
 
 def test_sensor_state_and_attributes(mock_coordinator):
@@ -65,6 +69,7 @@ def test_sensor_state_and_attributes(mock_coordinator):
     assert attrs["date_received"] == "Mon, 02 Feb 2026 12:00:00 +0000"
     assert attrs["body_text"] == "Hello world text"
     assert attrs["body_html"] == "<b>Hello world html</b>"
+    assert attrs["body_truncated"] is False
     assert attrs["priority"] is True
     assert attrs["starred"] is True
     assert "INBOX" in attrs["labels"]
@@ -75,13 +80,13 @@ def test_sensor_state_and_attributes(mock_coordinator):
 
 def test_sensor_with_attachment(mock_coordinator):
     # Add attachment to mock data
-    email_with_attachment = mock_coordinator.data[0].copy()
+    email_with_attachment = make_email()
     email_with_attachment["payload"]["parts"].append({
         "mimeType": "application/pdf",
         "filename": "document.pdf",
         "body": {"attachmentId": "att1"}
     })
-    mock_coordinator.data[0] = email_with_attachment
+    mock_coordinator.data[0] = parse_message(email_with_attachment, email_with_attachment["_thread"])
     
     sensor = GogGmailSensor(mock_coordinator, 0)
     attrs = sensor.extra_state_attributes
@@ -89,9 +94,11 @@ def test_sensor_with_attachment(mock_coordinator):
 
 def test_sensor_have_replied_false(mock_coordinator):
     # Update mock to remove reply
-    mock_coordinator.data[0]["_thread"]["messages"] = [
+    email = make_email()
+    email["_thread"]["messages"] = [
         {"id": "123", "labelIds": ["INBOX"]}
     ]
+    mock_coordinator.data[0] = parse_message(email, email["_thread"])
     sensor = GogGmailSensor(mock_coordinator, 0)
     assert sensor.extra_state_attributes["have_replied"] is False
 
@@ -101,3 +108,60 @@ def test_sensor_empty(mock_coordinator):
     
     assert sensor.native_value == "Empty"
     assert sensor.extra_state_attributes == {}
+
+def test_sensor_body_attributes_unrecorded(mock_coordinator):
+    sensor = GogGmailSensor(mock_coordinator, 0)
+
+    assert {"body_text", "body_html"} <= sensor._unrecorded_attributes
+
+def test_sensor_body_truncated(mock_coordinator):
+    mock_coordinator.body_mode = "truncated"
+    mock_coordinator.body_max_length = 5
+    sensor = GogGmailSensor(mock_coordinator, 0)
+
+    attrs = sensor.extra_state_attributes
+    assert attrs["body_text"] == "Hello…"
+    assert attrs["body_html"] is None
+    assert attrs["body_truncated"] is True
+
+def test_sensor_body_none(mock_coordinator):
+    mock_coordinator.body_mode = "none"
+    sensor = GogGmailSensor(mock_coordinator, 0)
+
+    attrs = sensor.extra_state_attributes
+    assert attrs["body_text"] is None
+    assert attrs["body_html"] is None
+    assert attrs["subject"] == "Test Subject"
+
+def test_sensor_skips_unchanged_writes(mock_coordinator):
+    sensor = GogGmailSensor(mock_coordinator, 0)
+    sensor.async_write_ha_state = MagicMock()
+
+    sensor._handle_coordinator_update()
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    # A label change alters the attributes
+    mock_coordinator.data = [mock_coordinator.data[0].with_labels(["INBOX"])]
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+
+    # So does the reply state
+    mock_coordinator.data = [mock_coordinator.data[0].with_reply(False)]
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 3
+
+    # A new list with the same message is not a change
+    mock_coordinator.data = list(mock_coordinator.data)
+    sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 3
+
+def test_sensor_writes_when_it_becomes_empty(mock_coordinator):
+    sensor = GogGmailSensor(mock_coordinator, 0)
+    sensor.async_write_ha_state = MagicMock()
+    sensor._handle_coordinator_update()
+
+    mock_coordinator.data = []
+    sensor._handle_coordinator_update()
+
+    assert sensor.async_write_ha_state.call_count == 2
@@ -1,8 +1,10 @@
+import asyncio
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 from homeassistant.core import ServiceCall
 from homeassistant.exceptions import ServiceValidationError
-from custom_components.gogcli import async_setup_entry, DOMAIN
+from custom_components.gogcli import async_setup_entry, setup_services, DOMAIN
+from custom_components.gogcli.scheduler import PRIORITY_INTERACTIVE
 
 @pytest.mark.asyncio
 async def test_services_registration_and_calls():
@@ -21,19 +23,21 @@ async def test_services_registration_and_calls():
     
     # Mock coordinator setup
     with patch("custom_components.gogcli.GogGmailCoordinator") as MockCoordinator, \
-         patch("custom_components.gogcli.get_binary_path", return_value="/mock/gog"), \
-         patch("custom_components.gogcli.check_binary", return_value="1.0.0"):
+         patch("custom_components.gogcli.utils.GogBinaryManager.async_ensure_binary", return_value="/mock/gog"):
         
         coordinator_instance = MockCoordinator.return_value
         coordinator_instance.async_config_entry_first_refresh = AsyncMock()
-        coordinator_instance.async_request_refresh = AsyncMock()
+        coordinator_instance.async_restore_snapshot = AsyncMock(return_value=False)
+        coordinator_instance.async_refresh_with_result = AsyncMock(
+            return_value={"success": True, "duration": 0.5, "new_messages": 1, "error": None}
+        )
         coordinator_instance.wrapper = MagicMock()
         coordinator_instance.wrapper.get_thread = AsyncMock(return_value={"id": "thread-123", "messages": []})
         
         await async_setup_entry(hass, entry)
         
         # Verify service registration
-        assert hass.services.async_register.call_count == 2 # update_gmail, get_thread
+        assert hass.services.async_register.call_count == 3 # update_gmail, get_thread, get_message_body
         
         # Extract handlers
         update_handler = None
@@ -50,27 +54,99 @@ async def test_services_registration_and_calls():
         # Test update_gmail (all)
         call_update_all = ServiceCall(hass, DOMAIN, "update_gmail", {})
         await update_handler(call_update_all)
-        coordinator_instance.async_request_refresh.assert_called_once()
+        coordinator_instance.async_refresh_with_result.assert_called_once()
         
         # Test update_gmail (specific)
-        coordinator_instance.async_request_refresh.reset_mock()
+        coordinator_instance.async_refresh_with_result.reset_mock()
         call_update_specific = ServiceCall(hass, DOMAIN, "update_gmail", {"config_entry_ids": ["test_entry"]})
         await update_handler(call_update_specific)
-        coordinator_instance.async_request_refresh.assert_called_once()
+        coordinator_instance.async_refresh_with_result.assert_called_once()
 
         # Test update_gmail (wrong entry)
-        coordinator_instance.async_request_refresh.reset_mock()
+        coordinator_instance.async_refresh_with_result.reset_mock()
         call_update_wrong = ServiceCall(hass, DOMAIN, "update_gmail", {"config_entry_ids": ["wrong_entry"]})
         await update_handler(call_update_wrong)
-        coordinator_instance.async_request_refresh.assert_not_called()
+        coordinator_instance.async_refresh_with_result.assert_not_called()
 
         # Test get_thread (success)
         call_thread = ServiceCall(hass, DOMAIN, "get_thread", {"thread_id": "t1", "config_entry_id": "test_entry"})
         response = await get_thread_handler(call_thread)
         assert response == {"id": "thread-123", "messages": []}
-        coordinator_instance.wrapper.get_thread.assert_called_with("t1")
+        coordinator_instance.wrapper.get_thread.assert_called_with("t1", priority=PRIORITY_INTERACTIVE)
 
         # Test get_thread (missing entry)
         call_thread_missing = ServiceCall(hass, DOMAIN, "get_thread", {"thread_id": "t1", "config_entry_id": "wrong"})
         with pytest.raises(ServiceValidationError):
-            await get_thread_handler(call_thread_missing)
\ No newline at end of file
+            await get_thread_handler(call_thread_missing)
+@pytest.mark.asyncio
+async def test_get_message_body_service():
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    hass.services.has_service.return_value = False
+    hass.services.async_register = MagicMock()
+    
+    setup_services(hass)
+    handlers = {args[0][1]: args[0][2] for args in hass.services.async_register.call_args_list}
+    handler = handlers["get_message_body"]
+
+    coordinator = MagicMock()
+    coordinator.get_message.side_effect = lambda msg_id: {
+        "m1": MagicMock(id="m1", thread_id="t1", body_text="full text", body_html="<p>full</p>"),
+    }.get(msg_id)
+    hass.data[DOMAIN]["test_entry"] = coordinator
+
+    response = await handler(ServiceCall(hass, DOMAIN, "get_message_body", {"config_entry_id": "test_entry", "message_id": "m1"}))
+    assert response == {"message_id": "m1", "thread_id": "t1", "body_text": "full text", "body_html": "<p>full</p>"}
+
+    with pytest.raises(ServiceValidationError):
+        await handler(ServiceCall(hass, DOMAIN, "get_message_body", {"config_entry_id": "test_entry", "message_id": "gone"}))
+
+    with pytest.raises(ServiceValidationError):
+        await handler(ServiceCall(hass, DOMAIN, "get_message_body", {"config_entry_id": "wrong", "message_id": "m1"}))
+
+@pytest.mark.asyncio
+async def test_update_gmail_runs_accounts_concurrently():
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    hass.services.has_service.return_value = False
+    hass.services.async_register = MagicMock()
+
+    setup_services(hass)
+    handlers = {args[0][1]: args[0][2] for args in hass.services.async_register.call_args_list}
+    handler = handlers["update_gmail"]
+
+    running = 0
+    peak = 0
+
+    def make_coordinator(result):
+        async def refresh(max_age=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return result
+        coordinator = MagicMock()
+        coordinator.async_refresh_with_result = refresh
+        return coordinator
+
+    ok = {"success": True, "duration": 0.01, "new_messages": 2, "error": None}
+    failed = {"success": False, "duration": 0.01, "new_messages": 0, "error": "boom"}
+    for index in range(4):
+        hass.data[DOMAIN][f"entry_{index}"] = make_coordinator(ok if index else failed)
+
+    response = await handler(ServiceCall(hass, DOMAIN, "update_gmail", {"max_parallel": 2}, return_response=True))
+
+    assert peak == 2
+    assert response["accounts"]["entry_0"] == failed
+    assert response["accounts"]["entry_3"] == ok
+    assert len(response["accounts"]) == 4
+
+    # max_age is passed on to each account
+    coordinator = hass.data[DOMAIN]["entry_1"]
+    coordinator.async_refresh_with_result = AsyncMock(return_value=ok)
+    await handler(ServiceCall(hass, DOMAIN, "update_gmail", {"config_entry_ids": ["entry_1"], "max_age": 30}))
+    coordinator.async_refresh_with_result.assert_called_once_with(30)
+
+    # Without a response variable nothing is returned
+    assert await handler(ServiceCall(hass, DOMAIN, "update_gmail", {})) is None
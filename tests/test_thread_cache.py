@@ -0,0 +1,91 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from custom_components.gogcli.utils import GogWrapper, ThreadCache
+
+THREAD = {
+    "id": "thread-1",
+    "historyId": "900",
+    "messages": [
+        {"id": "m1", "labelIds": ["INBOX"], "payload": {"body": {"data": "aGVsbG8="}}},
+        {"id": "m2", "labelIds": ["SENT"], "payload": {"body": {"data": "aGVsbG8="}}},
+    ],
+}
+
+def test_thread_cache_key_and_summary():
+    cache = ThreadCache()
+    summary = cache.set("thread-1", "100", THREAD)
+
+    assert summary["messages"] == [
+        {"id": "m1", "labelIds": ["INBOX"]},
+        {"id": "m2", "labelIds": ["SENT"]},
+    ]
+    assert cache.get("thread-1", "100") == summary
+    # A new historyId means the message changed
+    assert cache.get("thread-1", "101") is None
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+def test_thread_cache_lru_bound():
+    cache = ThreadCache(max_size=2)
+    cache.set("a", "1", {})
+    cache.set("b", "1", {})
+    cache.get("a", "1")
+    cache.set("c", "1", {})
+
+    assert len(cache) == 2
+    assert cache.get("b", "1") is None
+    assert cache.get("a", "1") is not None
+
+def test_thread_cache_expiry():
+    cache = ThreadCache(ttl=60)
+    with patch("custom_components.gogcli.utils.time.time", return_value=1000):
+        cache.set("a", "1", {})
+    with patch("custom_components.gogcli.utils.time.time", return_value=1061):
+        assert cache.get("a", "1") is None
+
+def test_thread_cache_round_trip():
+    cache = ThreadCache()
+    cache.set("thread-1", "100", THREAD)
+    assert cache.dirty is True
+
+    data = json.loads(json.dumps(cache.as_dict()))
+    assert cache.dirty is False
+
+    restored = ThreadCache()
+    restored.load(data)
+    assert restored.get("thread-1", "100") == cache.get("thread-1", "100")
+
+@pytest.mark.asyncio
+async def test_get_thread_uses_cache():
+    wrapper = GogWrapper("gog", "/tmp")
+    wrapper._run = AsyncMock(return_value=(0, json.dumps(THREAD).encode(), b""))
+
+    first = await wrapper.get_thread("thread-1", cache_key="100")
+    second = await wrapper.get_thread("thread-1", cache_key="100")
+
+    assert first == second
+    assert wrapper._run.call_count == 1
+
+    await wrapper.get_thread("thread-1", cache_key="101")
+    assert wrapper._run.call_count == 2
+
+@pytest.mark.asyncio
+async def test_get_thread_without_key_bypasses_cache():
+    wrapper = GogWrapper("gog", "/tmp")
+    wrapper._run = AsyncMock(return_value=(0, json.dumps(THREAD).encode(), b""))
+
+    thread = await wrapper.get_thread("thread-1")
+
+    assert thread == THREAD
+    assert len(wrapper.thread_cache) == 0
+
+def test_thread_cache_clear():
+    cache = ThreadCache()
+    cache.set("a", "1", {})
+    cache.as_dict()
+
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.dirty is True
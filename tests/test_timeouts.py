@@ -0,0 +1,69 @@
+import asyncio
+import os
+import pytest
+from custom_components.gogcli.utils import GogWrapper, GogTimeoutError, command_name
+
+HANGING_SCRIPT = """#!/bin/sh
+sleep 30 &
+echo $! > "{pid_file}"
+wait
+"""
+
+def make_hanging_gog(tmp_path):
+    pid_file = tmp_path / "child.pid"
+    script = tmp_path / "gog"
+    script.write_text(HANGING_SCRIPT.format(pid_file=pid_file))
+    script.chmod(0o755)
+    return str(script), pid_file
+
+async def read_child_pid(pid_file):
+    for _ in range(100):
+        if pid_file.exists() and pid_file.read_text().strip():
+            return int(pid_file.read_text())
+        await asyncio.sleep(0.01)
+    raise AssertionError("child never started")
+
+async def assert_dead(pid):
+    for _ in range(100):
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                if f.read().split()[2] == "Z":
+                    return
+        except FileNotFoundError:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"process {pid} still running")
+
+def test_command_name():
+    assert command_name(("gmail", "messages", "search", "label:INBOX", "--json")) == "gmail messages search"
+    assert command_name(("gmail", "thread", "get", "t1", "--json")) == "gmail thread get"
+    assert command_name(("gmail", "get", "m1", "--json")) == "gmail get"
+    assert command_name(("auth", "list", "--json")) == "auth list"
+    assert command_name(("version",)) == "version"
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+async def test_run_timeout_kills_process_group(tmp_path):
+    gog, pid_file = make_hanging_gog(tmp_path)
+    wrapper = GogWrapper(gog, str(tmp_path), timeouts={"gmail thread get": 0.5})
+
+    with pytest.raises(GogTimeoutError):
+        await wrapper.get_thread("t1")
+
+    await assert_dead(await read_child_pid(pid_file))
+    assert wrapper.timed_out["gmail thread get"] == 1
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+async def test_run_cancellation_kills_process_group(tmp_path):
+    gog, pid_file = make_hanging_gog(tmp_path)
+    wrapper = GogWrapper(gog, str(tmp_path))
+
+    task = asyncio.create_task(wrapper.get_thread("t1"))
+    child_pid = await read_child_pid(pid_file)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    await assert_dead(child_pid)
+    assert not wrapper.timed_out
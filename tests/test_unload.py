@@ -1,6 +1,8 @@
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
-from custom_components.gogcli import async_setup_entry, async_unload_entry, DOMAIN
+from custom_components.gogcli import async_setup_entry, async_unload_entry, async_remove_entry, async_update_options, DOMAIN
+from custom_components.gogcli.const import CONF_COUNT_LABELS, CONF_MAX_PROCESSES, DATA_SCHEDULER
+from custom_components.gogcli.scheduler import GogScheduler
 
 @pytest.mark.asyncio
 async def test_unload_entry():
@@ -16,11 +18,11 @@ async def test_unload_entry():
     
     # Setup
     with patch("custom_components.gogcli.GogGmailCoordinator") as MockCoordinator, \
-         patch("custom_components.gogcli.get_binary_path", return_value="/mock/gog"), \
-         patch("custom_components.gogcli.check_binary", return_value="1.0.0"):
+         patch("custom_components.gogcli.utils.GogBinaryManager.async_ensure_binary", return_value="/mock/gog"):
         
         coordinator = MockCoordinator.return_value
         coordinator.async_config_entry_first_refresh = AsyncMock()
+        coordinator.async_restore_snapshot = AsyncMock(return_value=False)
         await async_setup_entry(hass, entry)
     
     assert entry.entry_id in hass.data[DOMAIN]
@@ -31,3 +33,89 @@ async def test_unload_entry():
     assert result is True
     assert entry.entry_id not in hass.data[DOMAIN]
     hass.config_entries.async_unload_platforms.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_unload_recomputes_process_limit():
+    hass = MagicMock()
+    scheduler = GogScheduler(max_concurrent=1)
+    remaining = MagicMock(entry_id="entry_a", options={CONF_MAX_PROCESSES: 6})
+    removed = MagicMock(entry_id="entry_b", options={CONF_MAX_PROCESSES: 1})
+    hass.data = {DOMAIN: {DATA_SCHEDULER: scheduler, "entry_a": MagicMock(), "entry_b": MagicMock()}}
+    hass.config_entries.async_entries.return_value = [remaining, removed]
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+
+    await async_unload_entry(hass, removed)
+
+    assert scheduler.max_concurrent == 6
+
+@pytest.mark.asyncio
+async def test_remove_entry_deletes_stored_data():
+    hass = MagicMock()
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+
+    with patch("custom_components.gogcli.Store") as MockStore:
+        MockStore.return_value.async_remove = AsyncMock()
+        await async_remove_entry(hass, entry)
+
+    keys = [call[0][2] for call in MockStore.call_args_list]
+    assert keys == ["gogcli/test_entry.threads", "gogcli/test_entry.snapshot"]
+    assert MockStore.return_value.async_remove.call_count == 2
+
+@pytest.mark.asyncio
+async def test_setup_with_snapshot_refreshes_in_background():
+    hass = MagicMock()
+    hass.data = {DOMAIN: {}}
+    hass.config_entries.async_forward_entry_setups = AsyncMock()
+    hass.async_add_executor_job = AsyncMock()
+
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {"gog_path": "gog", "config_dir": "/tmp"}
+
+    with patch("custom_components.gogcli.GogGmailCoordinator") as MockCoordinator, \
+         patch("custom_components.gogcli.utils.GogBinaryManager.async_ensure_binary", return_value="/mock/gog"):
+
+        coordinator = MockCoordinator.return_value
+        coordinator.async_config_entry_first_refresh = AsyncMock()
+        coordinator.async_restore_snapshot = AsyncMock(return_value=True)
+        coordinator.async_refresh = MagicMock()
+        await async_setup_entry(hass, entry)
+
+    coordinator.async_config_entry_first_refresh.assert_not_called()
+    hass.config_entries.async_forward_entry_setups.assert_called_once()
+    tasks = [call[0][1] for call in entry.async_create_background_task.call_args_list]
+    assert tasks == [
+        coordinator.async_refresh.return_value,
+        coordinator.label_coordinator.async_refresh.return_value,
+    ]
+
+@pytest.mark.asyncio
+async def test_options_update_applies_without_reload():
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.label_coordinator.labels = ["INBOX"]
+    coordinator.saved_searches = []
+    hass.data = {DOMAIN: {DATA_SCHEDULER: GogScheduler(4), "test_entry": coordinator}}
+    entry = MagicMock(entry_id="test_entry", options={CONF_MAX_PROCESSES: 2})
+    hass.config_entries.async_entries.return_value = [entry]
+
+    await async_update_options(hass, entry)
+
+    coordinator.async_apply_options.assert_called_once_with(entry.options)
+    hass.config_entries.async_reload.assert_not_called()
+    hass.config_entries.async_schedule_reload.assert_not_called()
+    assert hass.data[DOMAIN][DATA_SCHEDULER].max_concurrent == 2
+
+@pytest.mark.asyncio
+async def test_label_change_reloads_entry():
+    hass = MagicMock()
+    coordinator = MagicMock()
+    coordinator.label_coordinator.labels = ["INBOX"]
+    hass.data = {DOMAIN: {DATA_SCHEDULER: GogScheduler(4), "test_entry": coordinator}}
+    entry = MagicMock(entry_id="test_entry", options={CONF_COUNT_LABELS: ["INBOX", "Bills"]})
+
+    await async_update_options(hass, entry)
+
+    hass.config_entries.async_schedule_reload.assert_called_once_with("test_entry")
+    coordinator.async_apply_options.assert_not_called()
@@ -1,62 +1,230 @@
+import asyncio
 import pytest
-from unittest.mock import MagicMock, patch, ANY
+from unittest.mock import MagicMock, patch
 from aioresponses import aioresponses
+import hashlib
 import tarfile
 import io
 import os
-from custom_components.gogcli.utils import install_binary, GITHUB_RELEASE_URL, _get_system_info
+import zipfile
+from custom_components.gogcli.utils import (
+    GogBinaryManager,
+    get_binary_manager,
+    install_binary,
+    ALLOW_UNVERIFIED_NAME,
+    CHECKSUMS_NAME,
+    GITHUB_CHECKSUMS_URL,
+    GITHUB_RELEASE_URL,
+    _extract_binary_sync,
+    _get_system_info,
+)
 
-@pytest.mark.asyncio
-async def test_install_binary_tar_gz():
+def make_tar_gz(content=b"fake-binary-content", name="gogcli"):
+    tar_stream = io.BytesIO()
+    with tarfile.open(fileobj=tar_stream, mode="w:gz") as tar:
+        tarinfo = tarfile.TarInfo(name=name)
+        tarinfo.size = len(content)
+        tar.addfile(tarinfo, io.BytesIO(content))
+    return tar_stream.getvalue()
+
+def make_hass(tmp_path):
     hass = MagicMock()
-    hass.config.path.return_value = "/mock/path/custom_components/gogcli/bin/gogcli"
-    
+    hass.config.path.side_effect = lambda path: str(tmp_path / path)
+
     # Mock async_add_executor_job to run the function synchronously
     async def mock_exec_job(func, *args):
         return func(*args)
     hass.async_add_executor_job.side_effect = mock_exec_job
-    
-    # Create a mock tar.gz content
-    file_content = b"fake-binary-content"
-    tar_stream = io.BytesIO()
-    with tarfile.open(fileobj=tar_stream, mode="w:gz") as tar:
-        tarinfo = tarfile.TarInfo(name="gogcli")
-        tarinfo.size = len(file_content)
-        tar.addfile(tarinfo, io.BytesIO(file_content))
-    tar_bytes = tar_stream.getvalue()
+    return hass
 
+def release_names():
     os_name, arch, ext = _get_system_info()
-    expected_url = GITHUB_RELEASE_URL.format(version="0.9.0", os=os_name, arch=arch, ext=ext)
+    url = GITHUB_RELEASE_URL.format(version="0.9.0", os=os_name, arch=arch, ext=ext)
+    return url, url.rsplit("/", 1)[1], ext
+
+@pytest.mark.asyncio
+async def test_install_binary_verifies_and_caches(tmp_path):
+    hass = make_hass(tmp_path)
+    url, archive_name, ext = release_names()
+    if ext != "tar.gz":
+        pytest.skip("tar.gz releases only")
+    archive = make_tar_gz()
+    checksums = f"{hashlib.sha256(archive).hexdigest()}  {archive_name}\n"
 
     with aioresponses() as m:
-        m.get(expected_url, status=200, body=tar_bytes)
-        
-        with patch("builtins.open", new_callable=MagicMock) as mock_open:
-            mock_file = MagicMock()
-            mock_open.return_value.__enter__.return_value = mock_file
-            
-            with patch("os.makedirs") as mock_makedirs, \
-                 patch("os.chmod") as mock_chmod, \
-                 patch("os.stat") as mock_stat:
-                
-                path = await install_binary(hass)
-                
-                assert path == "/mock/path/custom_components/gogcli/bin/gogcli"
-                mock_makedirs.assert_called_with("/mock/path/custom_components/gogcli/bin", exist_ok=True)
-                
-                # Verify that the sync function was called and did the writing
-                mock_open.assert_called_with("/mock/path/custom_components/gogcli/bin/gogcli", "wb")
-                mock_file.write.assert_called_with(file_content)
-                mock_chmod.assert_called()
-
-@pytest.mark.asyncio
-async def test_install_binary_download_fail():
-    hass = MagicMock()
-    os_name, arch, ext = _get_system_info()
-    expected_url = GITHUB_RELEASE_URL.format(version="0.9.0", os=os_name, arch=arch, ext=ext)
+        m.get(GITHUB_CHECKSUMS_URL.format(version="0.9.0"), status=200, body=checksums)
+        m.get(url, status=200, body=archive)
+        path = await install_binary(hass)
+
+    assert path == str(tmp_path / "custom_components/gogcli/bin/gog")
+    assert open(path, "rb").read() == b"fake-binary-content"
+    assert os.access(path, os.X_OK)
+    assert not os.path.exists(path + ".new")
+    assert (tmp_path / ".storage/gogcli/archives" / archive_name).read_bytes() == archive
+
+    # A reinstall uses the cached archive without any network access
+    os.remove(path)
+    with aioresponses():
+        await install_binary(hass)
+    assert open(path, "rb").read() == b"fake-binary-content"
+
+@pytest.mark.asyncio
+async def test_install_binary_checksum_mismatch(tmp_path):
+    hass = make_hass(tmp_path)
+    url, archive_name, ext = release_names()
+    checksums = f"{'0' * 64}  {archive_name}\n"
+
+    with aioresponses() as m:
+        m.get(GITHUB_CHECKSUMS_URL.format(version="0.9.0"), status=200, body=checksums)
+        m.get(url, status=200, body=make_tar_gz())
+        with pytest.raises(RuntimeError, match="Checksum mismatch"):
+            await install_binary(hass)
+
+    assert not (tmp_path / "custom_components/gogcli/bin/gog").exists()
+    assert not (tmp_path / ".storage/gogcli/archives" / archive_name).exists()
+
+@pytest.mark.asyncio
+async def test_install_binary_from_local_archive(tmp_path):
+    hass = make_hass(tmp_path)
+    _, archive_name, ext = release_names()
+    if ext != "tar.gz":
+        pytest.skip("tar.gz releases only")
+    archive_dir = tmp_path / ".storage/gogcli/archives"
+    archive_dir.mkdir(parents=True)
+    archive = make_tar_gz(b"offline")
+    checksums_name = CHECKSUMS_NAME.format(version="0.9.0")
+    (archive_dir / archive_name).write_bytes(archive)
+    (archive_dir / checksums_name).write_text(f"{hashlib.sha256(archive).hexdigest()}  {archive_name}\n")
+    (archive_dir / "gogcli_0.8.0_linux_amd64.tar.gz").write_bytes(b"old")
+
+    with aioresponses():
+        path = await install_binary(hass)
+
+    assert open(path, "rb").read() == b"offline"
+    assert sorted(os.listdir(archive_dir)) == sorted([archive_name, checksums_name])
+
+@pytest.mark.asyncio
+async def test_install_binary_local_archive_needs_checksum_or_opt_in(tmp_path):
+    hass = make_hass(tmp_path)
+    _, archive_name, ext = release_names()
+    if ext != "tar.gz":
+        pytest.skip("tar.gz releases only")
+    archive_dir = tmp_path / ".storage/gogcli/archives"
+    archive_dir.mkdir(parents=True)
+    (archive_dir / archive_name).write_bytes(make_tar_gz(b"offline"))
+
+    with aioresponses():
+        with pytest.raises(RuntimeError, match="No checksum found"):
+            await install_binary(hass)
+    assert not (tmp_path / "custom_components/gogcli/bin/gog").exists()
+
+    (archive_dir / ALLOW_UNVERIFIED_NAME).touch()
+    with aioresponses():
+        path = await install_binary(hass)
+    assert open(path, "rb").read() == b"offline"
+
+@pytest.mark.asyncio
+async def test_install_binary_download_needs_checksum(tmp_path):
+    hass = make_hass(tmp_path)
+    url, archive_name, _ = release_names()
+    archive_dir = tmp_path / ".storage/gogcli/archives"
+    archive_dir.mkdir(parents=True)
+    # The opt-in only covers archives the user placed
+    (archive_dir / ALLOW_UNVERIFIED_NAME).touch()
 
     with aioresponses() as m:
-        m.get(expected_url, status=404)
-        
+        m.get(GITHUB_CHECKSUMS_URL.format(version="0.9.0"), status=404)
+        with pytest.raises(RuntimeError, match="404"):
+            await install_binary(hass)
+        assert len(m.requests) == 1
+
+    with aioresponses() as m:
+        m.get(GITHUB_CHECKSUMS_URL.format(version="0.9.0"), status=200, body=f"{'0' * 64}  other.tar.gz\n")
+        m.get(url, status=200, body=make_tar_gz())
+        with pytest.raises(RuntimeError, match="No checksum found"):
+            await install_binary(hass)
+
+    assert not (archive_dir / archive_name).exists()
+    assert not (tmp_path / "custom_components/gogcli/bin/gog").exists()
+
+@pytest.mark.asyncio
+async def test_install_binary_download_fail(tmp_path):
+    hass = make_hass(tmp_path)
+    url, archive_name, _ = release_names()
+
+    with aioresponses() as m:
+        m.get(GITHUB_CHECKSUMS_URL.format(version="0.9.0"), status=404)
+        m.get(url, status=404)
+
         with pytest.raises(RuntimeError, match="Failed to download gogcli: 404"):
             await install_binary(hass)
+
+    assert os.listdir(tmp_path / ".storage/gogcli/archives") == []
+
+def test_extract_binary_from_zip(tmp_path):
+    archive = tmp_path / "gogcli.zip"
+    with zipfile.ZipFile(archive, "w") as zip_ref:
+        zip_ref.writestr("README.md", "docs")
+        zip_ref.writestr("gogcli.exe", "windows-binary")
+    target = tmp_path / "gog"
+    target.write_text("old")
+
+    _extract_binary_sync(str(archive), "zip", str(target))
+
+    assert target.read_text() == "windows-binary"
+
+def test_extract_binary_missing_from_archive(tmp_path):
+    archive = tmp_path / "gogcli.tar.gz"
+    archive.write_bytes(make_tar_gz(name="README.md"))
+    target = tmp_path / "gog"
+
+    with pytest.raises(RuntimeError, match="Could not find gogcli binary"):
+        _extract_binary_sync(str(archive), "tar.gz", str(target))
+
+    assert not target.exists()
+    assert not (tmp_path / "gog.new").exists()
+
+@pytest.mark.asyncio
+async def test_binary_manager_installs_once(tmp_path):
+    hass = MagicMock()
+    hass.data = {}
+    gog = tmp_path / "gog"
+
+    async def fake_install(hass):
+        await asyncio.sleep(0.01)
+        gog.write_text("binary")
+        return str(gog)
+
+    async def fake_check(path):
+        return "1.0.0" if os.path.exists(path) else None
+
+    with patch("custom_components.gogcli.utils.get_binary_path", return_value=str(gog)), \
+         patch("custom_components.gogcli.utils.install_binary", side_effect=fake_install) as mock_install, \
+         patch("custom_components.gogcli.utils.check_binary", side_effect=fake_check) as mock_check:
+        manager = get_binary_manager(hass)
+        paths = await asyncio.gather(*[manager.async_ensure_binary() for _ in range(3)])
+
+    assert paths == [str(gog)] * 3
+    mock_install.assert_called_once()
+    # The fresh binary is checked once, then served from the cache
+    assert mock_check.call_count == 1
+    assert get_binary_manager(hass) is manager
+
+@pytest.mark.asyncio
+async def test_binary_manager_caches_version_by_file(tmp_path):
+    gog = tmp_path / "gog"
+    gog.write_text("v1")
+    manager = GogBinaryManager(MagicMock())
+
+    with patch("custom_components.gogcli.utils.check_binary", return_value="1.0.0") as mock_check:
+        assert await manager.async_get_version(str(gog)) == "1.0.0"
+        assert await manager.async_get_version(str(gog)) == "1.0.0"
+        assert mock_check.call_count == 1
+
+        gog.write_text("v2 is longer")
+        await manager.async_get_version(str(gog))
+        assert mock_check.call_count == 2
+
+    with patch("custom_components.gogcli.utils.check_binary", return_value=None) as mock_check:
+        assert await manager.async_get_version(str(tmp_path / "missing")) is None
+        mock_check.assert_not_called()
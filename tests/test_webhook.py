@@ -0,0 +1,77 @@
+import base64
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from custom_components.gogcli.webhook import async_register_webhook, parse_hint
+
+def pubsub(data):
+    return {"message": {"data": base64.b64encode(json.dumps(data).encode()).decode()}}
+
+def test_parse_hint():
+    assert parse_hint({"history_id": 500}) == ("500", None)
+    assert parse_hint({"message_id": "abc"}) == (None, "abc")
+    assert parse_hint(pubsub({"emailAddress": "me@example.com", "historyId": 42})) == ("42", None)
+    assert parse_hint({"message": {"data": "not base64!"}}) == (None, None)
+    assert parse_hint(None) == (None, None)
+    assert parse_hint(["history_id"]) == (None, None)
+
+@pytest.fixture
+def registered():
+    hass = MagicMock()
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    coordinator = MagicMock(webhook_calls=0, webhook_skipped=0)
+    coordinator.async_request_refresh = MagicMock()
+
+    with patch("custom_components.gogcli.webhook.webhook.async_register") as register:
+        async_register_webhook(hass, entry, coordinator, "hook-id")
+
+    assert register.call_args.args[3] == "hook-id"
+    handler = register.call_args.args[4]
+    return hass, entry, coordinator, handler
+
+def request(body):
+    return MagicMock(read=AsyncMock(return_value=body))
+
+@pytest.mark.asyncio
+async def test_webhook_triggers_refresh(registered):
+    hass, entry, coordinator, handler = registered
+    coordinator.has_seen.return_value = False
+
+    await handler(hass, "hook-id", request(b'{"history_id": "900"}'))
+
+    coordinator.has_seen.assert_called_once_with("900", None)
+    assert entry.async_create_background_task.call_count == 2
+    coordinator.async_request_refresh.assert_called_once()
+    coordinator.label_coordinator.async_request_refresh.assert_called_once()
+    assert coordinator.webhook_calls == 1
+
+@pytest.mark.asyncio
+async def test_webhook_skips_known_mail(registered):
+    hass, entry, coordinator, handler = registered
+    coordinator.has_seen.return_value = True
+
+    await handler(hass, "hook-id", request(b'{"message_id": "m1"}'))
+
+    entry.async_create_background_task.assert_not_called()
+    assert coordinator.webhook_skipped == 1
+
+@pytest.mark.asyncio
+async def test_webhook_without_payload_refreshes(registered):
+    hass, entry, coordinator, handler = registered
+    coordinator.has_seen.return_value = False
+
+    await handler(hass, "hook-id", request(b""))
+    await handler(hass, "hook-id", request(b"not json"))
+
+    assert coordinator.has_seen.call_args_list[0].args == (None, None)
+    assert coordinator.async_request_refresh.call_count == 2
+
+def test_webhook_unregistered_on_unload(registered):
+    hass, entry, coordinator, handler = registered
+    unload = entry.async_on_unload.call_args.args[0]
+
+    with patch("custom_components.gogcli.webhook.webhook.async_unregister") as unregister:
+        unload()
+
+    unregister.assert_called_once_with(hass, "hook-id")
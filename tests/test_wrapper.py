@@ -0,0 +1,30 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import ANY, AsyncMock, patch
+from custom_components.gogcli.utils import GogWrapper
+
+@pytest.mark.asyncio
+async def test_large_output_is_decoded_in_executor():
+    big_thread = {"id": "thread-1", "messages": [{"id": "m1", "snippet": "x" * 100_000}]}
+    wrapper = GogWrapper("gog", "/tmp")
+    wrapper._run = AsyncMock(return_value=(0, json.dumps(big_thread).encode(), b""))
+
+    loop = asyncio.get_running_loop()
+    with patch.object(loop, "run_in_executor", wraps=loop.run_in_executor) as run_in_executor:
+        thread = await wrapper.get_thread("thread-1")
+
+    assert thread == big_thread
+    run_in_executor.assert_called_once_with(None, json.loads, ANY)
+
+@pytest.mark.asyncio
+async def test_small_output_is_decoded_inline():
+    wrapper = GogWrapper("gog", "/tmp")
+    wrapper._run = AsyncMock(return_value=(0, b'{"id": "thread-1"}', b""))
+
+    loop = asyncio.get_running_loop()
+    with patch.object(loop, "run_in_executor", wraps=loop.run_in_executor) as run_in_executor:
+        thread = await wrapper.get_thread("thread-1")
+
+    assert thread == {"id": "thread-1"}
+    run_in_executor.assert_not_called()
@@ -1,6 +1,8 @@
 import pytest
+import os
 from unittest.mock import MagicMock, AsyncMock, patch
 from custom_components.gogcli import async_setup_entry, DOMAIN
+from custom_components.gogcli.utils import GogConfigSync, sync_config, _get_config_path
 from custom_components.gogcli.const import CONF_CONFIG_DIR
 
 @pytest.mark.asyncio
@@ -17,16 +19,70 @@ async def test_yaml_sync_on_setup():
     entry.async_on_unload = MagicMock()
     
     with patch("custom_components.gogcli.GogGmailCoordinator") as MockCoordinator, \
-         patch("custom_components.gogcli.sync_config") as mock_sync_config, \
-         patch("custom_components.gogcli.get_binary_path", return_value="/mock/gog"), \
-         patch("custom_components.gogcli.check_binary", return_value="1.0.0"), \
+         patch("custom_components.gogcli.utils.sync_config") as mock_sync_config, \
+         patch("custom_components.gogcli.utils.async_track_time_interval"), \
+         patch("custom_components.gogcli.utils.GogBinaryManager.async_ensure_binary", return_value="/mock/gog"), \
          patch("custom_components.gogcli.setup_services"): # Avoid re-registering services
         
         coordinator = MockCoordinator.return_value
         coordinator.async_config_entry_first_refresh = AsyncMock()
+        coordinator.async_restore_snapshot = AsyncMock(return_value=False)
         
         await async_setup_entry(hass, entry)
         
         # Verify sync_config was called via executor
         hass.async_add_executor_job.assert_called_with(mock_sync_config, hass, "/mock/config/dir")
 
+
+def make_hass(tmp_path):
+    hass = MagicMock()
+    hass.config.path.side_effect = lambda path: str(tmp_path / path)
+
+    async def mock_exec_job(func, *args):
+        return func(*args)
+    hass.async_add_executor_job.side_effect = mock_exec_job
+    return hass
+
+def test_sync_config_writes_only_changes(tmp_path):
+    hass = make_hass(tmp_path)
+    (tmp_path / "gogcli.yaml").write_text('default_timezone: "Europe/Paris"\n')
+    config_json = _get_config_path(str(tmp_path / "gog"))
+
+    assert sync_config(hass, str(tmp_path / "gog")) is True
+    assert '"Europe/Paris"' in open(config_json).read()
+    mtime = os.stat(config_json).st_mtime_ns
+
+    assert sync_config(hass, str(tmp_path / "gog")) is False
+    assert os.stat(config_json).st_mtime_ns == mtime
+
+    (tmp_path / "gogcli.yaml").write_text('default_timezone: "UTC"\n')
+    with patch("custom_components.gogcli.utils.os.replace", wraps=os.replace) as mock_replace:
+        assert sync_config(hass, str(tmp_path / "gog")) is True
+    # Written to a temporary file, then swapped in
+    mock_replace.assert_called_once_with(config_json + ".tmp", config_json)
+    assert '"UTC"' in open(config_json).read()
+
+@pytest.mark.asyncio
+async def test_config_sync_runs_once_per_dir_and_watches(tmp_path):
+    hass = make_hass(tmp_path)
+    (tmp_path / "gogcli.yaml").write_text("a: 1\n")
+
+    with patch("custom_components.gogcli.utils.sync_config") as mock_sync, \
+         patch("custom_components.gogcli.utils.async_track_time_interval") as mock_track:
+        config_sync = GogConfigSync(hass)
+        await config_sync.async_add_config_dir("/dir")
+        await config_sync.async_add_config_dir("/dir")
+        assert mock_sync.call_count == 1
+        mock_track.assert_called_once()
+
+        # Unchanged YAML, nothing to do
+        await config_sync._async_check()
+        assert mock_sync.call_count == 1
+
+        (tmp_path / "gogcli.yaml").write_text("a: 22\n")
+        await config_sync._async_check()
+        mock_sync.assert_called_with(hass, "/dir")
+        assert mock_sync.call_count == 2
+
+        config_sync.async_stop()
+        mock_track.return_value.assert_called_once()